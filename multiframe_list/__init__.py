@@ -1,6 +1,17 @@
-from multiframe_list.multiframe_list import (
-	MultiframeList, SELECTION_TYPE, END, ALL, WEIGHT
+from multiframe_list.model import SELECTION_TYPE, END, ALL, ColumnModel, TableModel
+
+__all__ = (
+	"MultiframeList", "SELECTION_TYPE", "END", "ALL", "WEIGHT", "run_demo",
+	"ColumnModel", "TableModel",
 )
-from multiframe_list.demo import run_demo
 
-__all__ = ("MultiframeList", "SELECTION_TYPE", "END", "ALL", "WEIGHT", "run_demo")
+# The widget and demo import tkinter, so they are only imported once
+# accessed. This way, the model can be used without tkinter.
+def __getattr__(name):
+	if name in ("MultiframeList", "WEIGHT"):
+		from multiframe_list import multiframe_list
+		return getattr(multiframe_list, name)
+	if name == "run_demo":
+		from multiframe_list.demo import run_demo
+		return run_demo
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,243 @@
+"""
+Headless benchmark of the MultiframeList's most expensive operations.
+Measures the time each operation takes as well as the amount of Tcl
+commands it causes, counted through the MultiframeList's `instrument`
+option, for a range of row and column counts, and writes the results as
+JSON so they can be compared between releases.
+
+If no display is available, a virtual X server (Xvfb) is started for the
+duration of the benchmark.
+Run `python -m multiframe_list.benchmark --help` for options.
+"""
+
+import argparse
+from collections import Counter
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tkinter as tk
+
+from multiframe_list.multiframe_list import MultiframeList, __version__
+
+# Amount of rows inserted one by one in the `insert_row` scenario
+INSERT_ROW_AMOUNT = 1000
+# Amount of scrolling steps in the `scroll` scenario
+SCROLL_STEPS = 200
+# Amount of frames added and removed in the `add_remove_frames` scenario
+FRAME_AMOUNT = 5
+
+def _make_data(rows, columns):
+	return {
+		f"col{c}": [(i * 7919 + c * 104729) % (rows + 1) for i in range(rows)]
+		for c in range(columns)
+	}
+
+def _copy_data(data):
+	"""
+	Returns a copy of the data whose lists can be modified by the
+	MultiframeList, which stores and modifies the lists it is given.
+	"""
+	return {k: v.copy() for k, v in data.items()}
+
+def _fill(mfl, data):
+	mfl.set_data(data)
+
+def _scroll(mfl, data):
+	for i in range(SCROLL_STEPS):
+		mfl._scrollallbar("scroll", 1 if i % 4 else 10, "units" if i % 4 else "pages")
+		mfl.update_idletasks()
+
+def _add_remove_frames(mfl, data):
+	mfl.add_frames(FRAME_AMOUNT)
+	mfl.remove_frames(FRAME_AMOUNT)
+
+# Scenario name, setup and timed action. Both are called with the
+# MultiframeList and their own copy of the data generated for it.
+SCENARIOS = (
+	("set_data", None, lambda mfl, data: mfl.set_data(data)),
+	("insert_row", _fill, lambda mfl, data: [
+		mfl.insert_row({c: i for c in data}) for i in range(INSERT_ROW_AMOUNT)
+	]),
+	("insert_rows", None, lambda mfl, data: mfl.insert_rows(data)),
+	("remove_rows_scattered", _fill, lambda mfl, data: mfl.remove_rows(range(0, mfl.length, 3))),
+	("sort", _fill, lambda mfl, data: mfl.sort(None, mfl.columns["col0"])),
+	("sort_reverse", lambda mfl, data: (_fill(mfl, data), mfl.sort(None, mfl.columns["col0"])),
+		lambda mfl, data: mfl.sort(None, mfl.columns["col0"])),
+	("format", _fill, lambda mfl, data: mfl.format()),
+	("select_scattered", _fill, lambda mfl, data: mfl.set_selection(range(0, mfl.length, 2))),
+	("select_all", _fill, lambda mfl, data: mfl.set_selection(range(mfl.length))),
+	("scroll", _fill, _scroll),
+	("add_remove_frames", _fill, _add_remove_frames),
+)
+
+def _run_scenario(root, scenario, data, columns, virtual):
+	"""
+	Runs a scenario on a new MultiframeList and returns the seconds its
+	action took and the Tcl commands it caused.
+	"""
+	_, setup, action = scenario
+	mfl = MultiframeList(
+		root,
+		inicolumns = [
+			{"col_id": f"col{c}", "sort": True, "formatter": (lambda v: f"#{v}") if c == 0 else None}
+			for c in range(columns)
+		],
+		virtual = virtual,
+		instrument = True,
+	)
+	mfl.pack(expand = 1, fill = tk.BOTH)
+	root.update()
+	if setup is not None:
+		setup(mfl, _copy_data(data))
+	root.update()
+	action_data = _copy_data(data)
+	mfl.reset_tk_stats()
+	start = time.perf_counter()
+	action(mfl, action_data)
+	mfl.update_idletasks()
+	elapsed = time.perf_counter() - start
+	# Calls of nested operations only count towards the outermost one, so
+	# the entries can simply be added up
+	counts = Counter()
+	for entry in mfl.get_tk_stats().values():
+		counts.update(entry["commands"])
+	mfl.destroy()
+	root.update()
+	return elapsed, dict(counts)
+
+def run_benchmark(rows = (1000, 100000, 1000000), columns = (1, 5), modes = (False,),
+		scenarios = None, repeat = 3, log = None):
+	"""
+	Runs the benchmark scenarios (all, if None) for each combination of
+	row count, column count and virtual mode and returns the results as
+	a JSON-compatible dict. Each scenario is repeated `repeat` times.
+	`log` is called with a progress message before each scenario.
+	Requires a display to be available.
+	"""
+	root = tk.Tk()
+	root.geometry("800x600")
+	selected = [s for s in SCENARIOS if scenarios is None or s[0] in scenarios]
+
+	results = []
+	for row_amount in rows:
+		for col_amount in columns:
+			data = _make_data(row_amount, col_amount)
+			for virtual in modes:
+				for scenario in selected:
+					if log is not None:
+						log(f"{scenario[0]}: {row_amount} rows, {col_amount} columns, virtual={virtual}")
+					times = []
+					counts = None
+					for _ in range(repeat):
+						elapsed, run_counts = _run_scenario(
+							root, scenario, data, col_amount, virtual
+						)
+						times.append(elapsed)
+						if counts is None:
+							counts = run_counts
+					results.append({
+						"scenario": scenario[0],
+						"rows": row_amount,
+						"columns": col_amount,
+						"virtual": virtual,
+						"seconds": times,
+						"min": min(times),
+						"median": statistics.median(times),
+						"tk_calls": sum(counts.values()),
+						"tk_commands": counts,
+					})
+	root.destroy()
+
+	return {
+		"meta": {
+			"multiframe_list": __version__,
+			"python": platform.python_version(),
+			"tk": str(tk.TkVersion),
+			"platform": platform.platform(),
+			"time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+		},
+		"results": results,
+	}
+
+def _start_xvfb():
+	"""
+	Starts Xvfb on the first free display number and points `DISPLAY` to
+	it. Returns the process.
+	"""
+	xvfb = shutil.which("Xvfb")
+	if xvfb is None:
+		raise SystemExit("No display available and Xvfb could not be found.")
+	display = 99
+	while os.path.exists(f"/tmp/.X11-unix/X{display}") or os.path.exists(f"/tmp/.X{display}-lock"):
+		display += 1
+	proc = subprocess.Popen(
+		[xvfb, f":{display}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+		stdout = subprocess.DEVNULL,
+		stderr = subprocess.DEVNULL,
+	)
+	for _ in range(100):
+		if os.path.exists(f"/tmp/.X11-unix/X{display}"):
+			break
+		if proc.poll() is not None:
+			raise SystemExit(f"Xvfb exited with code {proc.returncode}.")
+		time.sleep(0.05)
+	os.environ["DISPLAY"] = f":{display}"
+	return proc
+
+def _int_list(s):
+	return [int(x) for x in s.split(",")]
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(
+		prog = "python -m multiframe_list.benchmark",
+		description = "Benchmark the MultiframeList and write the results as JSON.",
+	)
+	parser.add_argument("--rows", type = _int_list, default = [1000, 100000, 1000000],
+		help = "Comma-separated row counts. (Default: 1000,100000,1000000)")
+	parser.add_argument("--columns", type = _int_list, default = [1, 5],
+		help = "Comma-separated column counts. (Default: 1,5)")
+	parser.add_argument("--virtual", choices = ("no", "yes", "both"), default = "no",
+		help = "Whether to benchmark in virtual mode. (Default: no)")
+	parser.add_argument("--scenario", action = "append", dest = "scenarios",
+		choices = [s[0] for s in SCENARIOS],
+		help = "Only run this scenario, may be given multiple times.")
+	parser.add_argument("--repeat", type = int, default = 3,
+		help = "Times each scenario is run. (Default: 3)")
+	parser.add_argument("--output", "-o", default = None,
+		help = "File to write the JSON results to instead of stdout.")
+	parser.add_argument("--xvfb", choices = ("auto", "always", "never"), default = "auto",
+		help = "Whether to start a virtual X server; auto starts one if DISPLAY is unset.")
+	args = parser.parse_args(argv)
+
+	xvfb = None
+	if args.xvfb == "always" or (args.xvfb == "auto" and os.name == "posix" and \
+			sys.platform != "darwin" and not os.environ.get("DISPLAY")):
+		xvfb = _start_xvfb()
+	try:
+		results = run_benchmark(
+			rows = args.rows,
+			columns = args.columns,
+			modes = {"no": (False,), "yes": (True,), "both": (False, True)}[args.virtual],
+			scenarios = args.scenarios,
+			repeat = args.repeat,
+			log = lambda msg: print(msg, file = sys.stderr),
+		)
+	finally:
+		if xvfb is not None:
+			xvfb.terminate()
+			xvfb.wait()
+
+	if args.output is None:
+		json.dump(results, sys.stdout, indent = 1)
+		sys.stdout.write("\n")
+	else:
+		with open(args.output, "w") as h:
+			json.dump(results, h, indent = 1)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,1965 @@
+"""
+The Tk-independent data model behind the MultiframeList: Columns storing
+their elements along with sort keys, indices and aggregates derived from
+them, and a table of such columns holding the selection and active cell.
+This module does not import tkinter, so it can be used and tested without
+a display.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from collections.abc import MutableSet
+from difflib import SequenceMatcher
+from enum import IntEnum
+from heapq import merge
+from itertools import compress
+
+BLANK = ""
+# Amount of elements above which a column merges or rebuilds its sorted
+# elements used for aggregates instead of updating them one by one
+_AGG_BULK = 64
+
+ALL = "all"
+END = "end"
+
+AGGREGATES = ("sum", "count", "min", "max")
+
+class SELECTION_TYPE(IntEnum):
+	SINGLE = 0
+	MULTIPLE = 1
+
+# Marks format cache keys of elements that are cached by their identity
+_UNHASHABLE = object()
+
+def _find_consecutive_sequences(lst):
+	"""
+	Given a **descendedly sorted list**, returns a list of ranges
+	of all consecutively descending ranges of numbers in the
+	given list. Duplicate numbers following one another are treated
+	as a single number.
+	Example: `[6, 5, 5, 4, 2, 1]` -> `[range(4, 7), range(1, 3)]`
+	"""
+	if not lst:
+		return []
+	last_start = lst[0]
+	last = None
+	res = []
+	for x in lst:
+		if last is not None and last != x and last != x + 1:
+			res.append(range(last, last_start + 1))
+			last_start = x
+		last = x
+	res.append(range(last, last_start + 1))
+	return res
+
+def _intersect_ranges(a, b):
+	"""
+	Given two ascendedly sorted lists of disjoint ranges with a step of 1,
+	returns such a list of ranges covering all numbers that are in a range
+	of both.
+	Example: `[range(0, 5), range(8, 9)]`, `[range(2, 8)]` -> `[range(2, 5)]`
+	"""
+	res = []
+	i = j = 0
+	while i < len(a) and j < len(b):
+		start = max(a[i].start, b[j].start)
+		stop = min(a[i].stop, b[j].stop)
+		if start < stop:
+			res.append(range(start, stop))
+		if a[i].stop < b[j].stop:
+			i += 1
+		else:
+			j += 1
+	return res
+
+def _position_after_removal(removed, idx):
+	"""
+	Returns the position `idx` ends up at after the positions in the
+	ascendedly sorted list of disjoint ranges `removed` are removed. If
+	`idx` is removed itself, that is the position of the next one.
+	"""
+	res = idx
+	for rng in removed:
+		if rng.start >= idx:
+			break
+		res -= min(rng.stop, idx) - rng.start
+	return res
+
+def _ranges_after_insertion(ranges, points):
+	"""
+	Given an ascendedly sorted list of disjoint ranges with a step of 1,
+	returns such a list of ranges covering the positions the numbers end
+	up at after a new position is inserted before each position in the
+	ascendedly sorted list `points`, which may contain duplicates.
+	Example: `[range(2, 6)]`, `[0, 4, 4]` -> `[range(3, 5), range(7, 9)]`
+	"""
+	res = []
+	for rng in ranges:
+		# Points before or at the start shift the range, ones inside split it
+		k = bisect_right(points, rng.start)
+		end = bisect_left(points, rng.stop, k)
+		start = rng.start
+		while k < end:
+			point = points[k]
+			res.append(range(start + k, point + k))
+			start = point
+			k = bisect_right(points, point, k, end)
+		res.append(range(start + k, rng.stop + k))
+	return res
+
+def _ranges_after_removal(ranges, removed):
+	"""
+	Given two ascendedly sorted lists of disjoint ranges with a step of 1,
+	returns such a list of ranges covering the positions the numbers in
+	`ranges` end up at after all positions in `removed` are removed.
+	Removed numbers are dropped.
+	Example: `[range(0, 3), range(6, 9)]`, `[range(2, 7)]` ->
+		`[range(0, 2), range(2, 4)]`
+	"""
+	res = []
+	j = 0
+	removed_before = 0
+	for rng in _subtract_ranges(ranges, removed):
+		while j < len(removed) and removed[j].stop <= rng.start:
+			removed_before += len(removed[j])
+			j += 1
+		res.append(range(rng.start - removed_before, rng.stop - removed_before))
+	return res
+
+def _sort_permutation(keys, sortkey, reverse):
+	"""
+	Returns a list of indices that sorts `keys`, first running them
+	through `sortkey` if it is not None. Defined on module level so it
+	can be sent to process pools.
+	"""
+	if sortkey is not None:
+		keys = [sortkey(x) for x in keys]
+	return sorted(range(len(keys)), key = keys.__getitem__, reverse = reverse)
+
+def _subtract_ranges(a, b):
+	"""
+	Given two ascendedly sorted lists of disjoint ranges with a step of 1,
+	returns such a list of ranges covering all numbers that are in a range
+	of `a`, but none of `b`.
+	Example: `[range(0, 5), range(8, 9)]`, `[range(2, 3)]` ->
+		`[range(0, 2), range(3, 5), range(8, 9)]`
+	"""
+	res = []
+	bi = 0
+	for rng in a:
+		while bi < len(b) and b[bi].stop <= rng.start:
+			bi += 1
+		cur = rng.start
+		j = bi
+		while j < len(b) and b[j].start < rng.stop:
+			if b[j].start > cur:
+				res.append(range(cur, b[j].start))
+			cur = max(cur, b[j].stop)
+			j += 1
+		if cur < rng.stop:
+			res.append(range(cur, rng.stop))
+	return res
+
+class _IntervalSet(MutableSet):
+	"""
+	A set of integers that is stored as sorted, disjoint and non-adjacent
+	intervals, so that large consecutive runs of numbers take up constant
+	space. Lookups locate intervals via binary search, modifications then
+	splice the lists of interval bounds, which takes time linear in the
+	amount of intervals. Sets of many scattered numbers should therefore
+	be built at once via the constructor or `from_sorted` instead of
+	adding the numbers one by one.
+	Supports the interface of the builtin `set` for ints, as well as
+	adding and removing entire ranges at once. Set operations work on the
+	intervals, so they take time linear in their amount, not in the
+	amount of numbers.
+	"""
+
+	def __init__(self, iterable = ()):
+		self._starts = []
+		self._stops = []
+		self._len = 0
+		self.extend_sorted(sorted(iterable))
+
+	def __contains__(self, x):
+		if not isinstance(x, int):
+			return False
+		i = bisect_right(self._starts, x) - 1
+		return i >= 0 and x < self._stops[i]
+
+	def __iter__(self):
+		for start, stop in zip(self._starts, self._stops):
+			yield from range(start, stop)
+
+	def __len__(self):
+		return self._len
+
+	def __repr__(self):
+		return f"{type(self).__name__}({self.ranges()!r})"
+
+	@classmethod
+	def _coerce(cls, other):
+		"""
+		Returns the ints of the iterable `other` as an interval set, or
+		`other` itself if it already is one, and whether it contained
+		anything besides ints.
+		"""
+		if isinstance(other, cls):
+			return other, False
+		other = list(other)
+		ints = [x for x in other if isinstance(x, int)]
+		return cls(ints), len(ints) != len(other)
+
+	def add(self, x):
+		self.add_range(x, x + 1)
+
+	def add_range(self, start, stop):
+		"""
+		Adds all numbers from `start` to `stop` (end-exclusive).
+		"""
+		if stop <= start:
+			return
+		# Intervals overlapping or adjacent to the new one are merged into it
+		lo = bisect_left(self._stops, start)
+		hi = bisect_right(self._starts, stop)
+		if lo < hi:
+			start = min(start, self._starts[lo])
+			stop = max(stop, self._stops[hi - 1])
+			self._len -= sum(self._stops[i] - self._starts[i] for i in range(lo, hi))
+		self._starts[lo:hi] = (start,)
+		self._stops[lo:hi] = (stop,)
+		self._len += stop - start
+
+	def clear(self):
+		self._starts.clear()
+		self._stops.clear()
+		self._len = 0
+
+	def copy(self):
+		new = type(self)()
+		new._starts = self._starts.copy()
+		new._stops = self._stops.copy()
+		new._len = self._len
+		return new
+
+	def difference(self, *others):
+		"""
+		Returns a new set of the numbers that are in this set, but none of
+		the iterables `others`.
+		"""
+		res = self.ranges()
+		for other in others:
+			res = _subtract_ranges(res, self._coerce(other)[0].ranges())
+		return self.from_sorted(res)
+
+	def discard(self, x):
+		self.remove_range(x, x + 1)
+
+	def extend_sorted(self, items):
+		"""
+		Adds the ints and/or ranges (with a step of 1) of the iterable
+		`items` in a single pass. They must be ordered by their (start)
+		value and may not start before the start of the set's last
+		interval.
+		"""
+		starts = self._starts
+		stops = self._stops
+		for x in items:
+			if isinstance(x, range):
+				start, stop = x.start, x.stop
+				if stop <= start:
+					continue
+			else:
+				start, stop = x, x + 1
+			if stops and start <= stops[-1]:
+				if stop > stops[-1]:
+					self._len += stop - stops[-1]
+					stops[-1] = stop
+			else:
+				starts.append(start)
+				stops.append(stop)
+				self._len += stop - start
+
+	@classmethod
+	def from_sorted(cls, items):
+		"""
+		Creates a set from an iterable of ints and/or ranges (with a step
+		of 1) that is ordered by their (start) value in linear time.
+		Duplicates, overlaps and empty ranges are allowed.
+		"""
+		new = cls()
+		new.extend_sorted(items)
+		return new
+
+	def intersection(self, *others):
+		"""
+		Returns a new set of the numbers that are in this set and all of
+		the iterables `others`.
+		"""
+		res = self.ranges()
+		for other in others:
+			res = _intersect_ranges(res, self._coerce(other)[0].ranges())
+		return self.from_sorted(res)
+
+	def issubset(self, other):
+		return not self.difference(other)
+
+	def issuperset(self, other):
+		other, non_ints = self._coerce(other)
+		return not non_ints and not other.difference(self)
+
+	def ranges(self, start = None, stop = None):
+		"""
+		Returns a list of ranges making up the set in ascending order.
+		If `start` and `stop` are given, only the parts of the set between
+		them (end-exclusive) are returned.
+		"""
+		if start is None or stop is None:
+			return [range(a, b) for a, b in zip(self._starts, self._stops)]
+		lo = bisect_right(self._stops, start)
+		hi = bisect_left(self._starts, stop)
+		return [
+			range(max(self._starts[i], start), min(self._stops[i], stop))
+			for i in range(lo, hi)
+		]
+
+	def remove_range(self, start, stop):
+		"""
+		Removes all numbers from `start` to `stop` (end-exclusive).
+		"""
+		if stop <= start:
+			return
+		lo = bisect_right(self._stops, start)
+		hi = bisect_left(self._starts, stop)
+		if lo >= hi:
+			return
+		new_starts = []
+		new_stops = []
+		if self._starts[lo] < start:
+			new_starts.append(self._starts[lo])
+			new_stops.append(start)
+		if self._stops[hi - 1] > stop:
+			new_starts.append(stop)
+			new_stops.append(self._stops[hi - 1])
+		self._len -= sum(self._stops[i] - self._starts[i] for i in range(lo, hi))
+		self._len += sum(b - a for a, b in zip(new_starts, new_stops))
+		self._starts[lo:hi] = new_starts
+		self._stops[lo:hi] = new_stops
+
+	def symmetric_difference(self, other):
+		"""
+		Returns a new set of the numbers that are in either this set or the
+		iterable `other`, but not both.
+		"""
+		other, non_ints = self._coerce(other)
+		if non_ints:
+			raise TypeError(f"{type(self).__name__} can only hold ints.")
+		return self.union(other).difference(self.intersection(other))
+
+	def toggle(self, x):
+		"""
+		Removes `x` if it is in the set, otherwise adds it.
+		"""
+		if x in self:
+			self.discard(x)
+		else:
+			self.add(x)
+
+	def union(self, *others):
+		"""
+		Returns a new set of the numbers that are in this set or any of the
+		iterables `others`, which may only contain ints.
+		"""
+		range_lists = [self.ranges()]
+		for other in others:
+			other, non_ints = self._coerce(other)
+			if non_ints:
+				raise TypeError(f"{type(self).__name__} can only hold ints.")
+			range_lists.append(other.ranges())
+		return self.from_sorted(merge(*range_lists, key = lambda rng: rng.start))
+
+
+class _FormatCache():
+	"""
+	Bounded cache of formatter results that discards the least recently
+	used ones once full. Hashable elements are looked up by their type and
+	value, unhashable ones by their identity.
+	"""
+
+	def __init__(self, maxsize):
+		self.maxsize = maxsize
+		# The formatter the cached results were produced by
+		self.formatter = None
+		self.hits = 0
+		self.misses = 0
+		# Maps keys to the element if it is cached by identity, else None,
+		# and its formatted result
+		self._entries = OrderedDict()
+
+	def clear(self):
+		self._entries.clear()
+
+	def format(self, formatter, elems, batch = False):
+		"""
+		Returns a list of the elements ran through `formatter`, using and
+		storing cached results. The cache is cleared if it was filled by
+		another formatter.
+		If `batch` is True, `formatter` is a batch formatter and called once
+		with a list of all elements that were not found in the cache.
+		"""
+		if formatter is not self.formatter:
+			self._entries.clear()
+			self.formatter = formatter
+		if batch:
+			return self._format_batch(formatter, elems)
+		entries = self._entries
+		res = []
+		for x in elems:
+			try:
+				key = (type(x), x)
+				entry = entries.get(key)
+			except TypeError:
+				key = (_UNHASHABLE, id(x))
+				entry = entries.get(key)
+				if entry is not None and entry[0] is not x:
+					entry = None
+			if entry is not None:
+				self.hits += 1
+				entries.move_to_end(key)
+				res.append(entry[1])
+				continue
+			self.misses += 1
+			out = formatter(x)
+			# Keeping unhashable elements alive prevents their id from
+			# being reused while cached
+			entries[key] = (x if key[0] is _UNHASHABLE else None, out)
+			if len(entries) > self.maxsize:
+				entries.popitem(last = False)
+			res.append(out)
+		return res
+
+	def _format_batch(self, formatter, elems):
+		entries = self._entries
+		res = []
+		missing = []
+		missing_keys = []
+		for x in elems:
+			try:
+				key = (type(x), x)
+				entry = entries.get(key)
+			except TypeError:
+				key = (_UNHASHABLE, id(x))
+				entry = entries.get(key)
+				if entry is not None and entry[0] is not x:
+					entry = None
+			if entry is not None:
+				self.hits += 1
+				entries.move_to_end(key)
+				res.append(entry[1])
+				continue
+			self.misses += 1
+			missing.append(len(res))
+			missing_keys.append(key)
+			res.append(x)
+		if not missing:
+			return res
+		outs = list(formatter([res[i] for i in missing]))
+		if len(outs) != len(missing):
+			raise ValueError(
+				f"Batch formatter returned {len(outs)} results for {len(missing)} elements."
+			)
+		for i, key, out in zip(missing, missing_keys, outs):
+			entries[key] = (res[i] if key[0] is _UNHASHABLE else None, out)
+			res[i] = out
+		while len(entries) > self.maxsize:
+			entries.popitem(last = False)
+		return res
+
+	def stats(self):
+		return {
+			"hits": self.hits, "misses": self.misses,
+			"size": len(self._entries), "maxsize": self.maxsize,
+		}
+
+
+class ColumnModel():
+	"""
+	Stores the data of a column of a `TableModel` along with everything
+	derived from it: The elements ran through the sortkey, an index
+	mapping elements to their rows and the aggregates.
+	Modifications of the data are reported to the callbacks registered
+	via `subscribe`, see there.
+	Required args:
+
+	table: The TableModel the column belongs to.
+
+	Optional args:
+
+	col_id: The identifying name of the column. If not specified, is set to
+		an integer that is not in use by another column of the table.
+	sortkey, formatter, batch_formatter, fallback_type, aggregates, format_cache:
+		See `_Column`.
+	"""
+
+	class Config():
+		__slots__ = (
+			"sortkey", "formatter", "batch_formatter", "fallback_type", "aggregates",
+			"format_cache",
+		)
+		def __init__(
+			self, sortkey = None, formatter = None, batch_formatter = None, fallback_type = None,
+			aggregates = (), format_cache = None,
+		):
+			self.sortkey = sortkey
+			self.formatter = formatter
+			self.batch_formatter = batch_formatter
+			self.fallback_type = fallback_type
+			self.aggregates = tuple(aggregates)
+			self.format_cache = format_cache
+
+	def __init__(self, table, col_id = None, **kwargs):
+		self.table = table
+
+		if col_id is None:
+			self.col_id = table._generate_col_id()
+		else:
+			if col_id in table.columns:
+				raise ValueError(f"Column id {col_id!r} is already in use!")
+			self.col_id = col_id
+
+		self._cnfcmd = {
+			"sortkey": self._invalidate_sortkeys, "formatter": self._cnf_formatter,
+			"batch_formatter": self._cnf_formatter,
+			"fallback_type": lambda: False, "aggregates": self._cnf_aggregates,
+			"format_cache": self._cnf_format_cache,
+		}
+		# Callbacks notified of data changes
+		self._subscribers = []
+
+		self.data = [BLANK for _ in range(table.length)]
+		# Cached result of running all elements through the sortkey
+		self._sortkeys = None
+		# Whether the data is currently sorted by this column in reverse
+		# order, None if it is not known to be sorted by this column.
+		self._sorted_reverse = None
+		# Dict mapping elements to their index, built for keyed access
+		# when needed
+		self._key_index = None
+		# Aggregates the following values were computed for
+		self._agg_names = ()
+		# Sum and amount of all aggregated elements
+		self._agg_sum = 0
+		self._agg_count = 0
+		# The aggregated elements in ascending order, if min or max is needed
+		self._agg_sorted = None
+		# Cache of formatted elements, if enabled
+		self._format_cache = None
+
+		self.cnf = self.Config(**kwargs)
+		self._cnf_aggregates()
+		self._cnf_format_cache()
+
+	def __len__(self):
+		return len(self.data)
+
+	def _apply_fallback_type(self):
+		"""
+		Converts all elements to the column's fallback type.
+		"""
+		self.data_set([self.cnf.fallback_type(x) for x in self.data])
+		self._notify("format")
+
+	def _cnf_aggregates(self):
+		if self.cnf.aggregates == self._agg_names:
+			return
+		for name in self.cnf.aggregates:
+			if name not in AGGREGATES:
+				raise ValueError(f"Unknown aggregate {name!r}.")
+		self._rebuild_aggregates()
+
+	def _cnf_format_cache(self):
+		size = self.cnf.format_cache
+		if size is None:
+			self._format_cache = None
+		elif self._format_cache is None or self._format_cache.maxsize != size:
+			if size < 1:
+				raise ValueError("Format cache size must be at least 1.")
+			self._format_cache = _FormatCache(size)
+
+	def _cnf_formatter(self):
+		self._notify("format")
+
+	def _check_keys(self, elems, replaced = ()):
+		"""
+		If the key index is built, raises a ValueError if the elements of
+		`elems` are not unique among themselves and among the column's
+		elements, except for the ones at the indices in `replaced`, which
+		are about to be overwritten.
+		"""
+		index = self._key_index
+		if index is None:
+			return
+		replaced = set(replaced)
+		seen = set()
+		for elem in elems:
+			idx = index.get(elem)
+			if elem in seen or (idx is not None and idx not in replaced):
+				raise ValueError(f"Duplicate key {elem!r} in column {self.col_id!r}.")
+			seen.add(elem)
+
+	def _get_sortkeys(self):
+		"""
+		Returns the elements ran through the sortkey, caching the result
+		until the column's data changes. If no sortkey is set, returns
+		the data itself.
+		"""
+		if self.cnf.sortkey is None:
+			return self.data
+		if self._sortkeys is None:
+			self._sortkeys = [self.cnf.sortkey(x) for x in self.data]
+		return self._sortkeys
+
+	def _invalidate_indices(self):
+		"""
+		Drops the key index, which has to be rebuilt once needed again.
+		"""
+		self._key_index = None
+
+	def _reindex(self, start):
+		"""
+		Updates the key index, if it is built, for the elements from
+		`start` onwards, which have moved.
+		"""
+		index = self._key_index
+		if index is None:
+			return
+		data = self.data
+		for i in range(start, len(data)):
+			index[data[i]] = i
+
+	def _invalidate_sortkeys(self):
+		"""
+		Drops the cached sort keys and forgets about the column's data
+		being sorted.
+		"""
+		self._sortkeys = None
+		self._sorted_reverse = None
+
+	def _notify(self, change, *args):
+		for callback in self._subscribers:
+			callback(change, *args)
+
+	def _rebuild_aggregates(self, data = None):
+		"""
+		Computes all configured aggregates from scratch for `data`, which
+		defaults to the column's data. If this raises, e. g. because an
+		element can not be added, the aggregates are left unchanged.
+		"""
+		aggs = self.cnf.aggregates
+		elems = [x for x in (self.data if data is None else data) if x is not None and x != BLANK]
+		agg_sum = sum(elems) if "sum" in aggs else 0
+		agg_sorted = sorted(elems) if "min" in aggs or "max" in aggs else None
+		self._agg_names = aggs
+		self._agg_count = len(elems)
+		self._agg_sum = agg_sum
+		self._agg_sorted = agg_sorted
+		if aggs:
+			self.table._notify("aggregates", self)
+
+	def _update_aggregates(self, added = (), removed = ()):
+		"""
+		Updates the aggregates after the elements in `removed` were removed
+		from and the elements in `added` were added to the column's data.
+		If removing many elements, the aggregates are rebuilt from the
+		column's data, so it must have been modified already in that case.
+		If this raises, e. g. because an added element can not be compared
+		to the others, the aggregates are left unchanged.
+		"""
+		if not self._agg_names:
+			return
+		added = [x for x in added if x is not None and x != BLANK]
+		removed = [x for x in removed if x is not None and x != BLANK]
+		if not added and not removed:
+			return
+		if len(removed) > _AGG_BULK:
+			self._rebuild_aggregates()
+			return
+		agg_sum = self._agg_sum
+		if "sum" in self._agg_names:
+			agg_sum += sum(added) - sum(removed)
+		srt = self._agg_sorted
+		if srt is not None:
+			if len(added) > _AGG_BULK:
+				# Sorting will find and merge the two ascending runs
+				srt = sorted(srt + added)
+			else:
+				inserted = 0
+				try:
+					for x in added:
+						insort(srt, x)
+						inserted += 1
+				except TypeError:
+					for x in added[:inserted]:
+						del srt[bisect_left(srt, x)]
+					raise
+			for x in removed:
+				del srt[bisect_left(srt, x)]
+			self._agg_sorted = srt
+		self._agg_count += len(added) - len(removed)
+		self._agg_sum = agg_sum
+		self.table._notify("aggregates", self)
+
+	def config(self, **kw):
+		if not kw:
+			return {s: getattr(self.cnf, s) for s in self.cnf.__slots__}
+		for k, v in kw.items():
+			if not k in self.Config.__slots__:
+				raise ValueError(
+					f"Unkown configuration arg {k!r}, must be one of "
+					f"{', '.join(self.Config.__slots__)}."
+				)
+			setattr(self.cnf, k, v)
+			self._cnfcmd[k]()
+
+	def data_clear(self):
+		"""Clears self.data."""
+		self.data.clear()
+		self._invalidate_sortkeys()
+		if self._key_index is not None:
+			self._key_index.clear()
+		self._rebuild_aggregates()
+		self._notify("clear")
+
+	def data_insert(self, elem, index = None):
+		"""
+		Inserts elem to self.data at index. If index is not specified, elem
+		will be appended instead.
+		"""
+		# Done first so the data is left untouched if elem is a duplicate key
+		# or can't be aggregated
+		self._check_keys((elem,))
+		self._update_aggregates((elem,))
+		if index is not None:
+			self.data.insert(index, elem)
+			self._reindex(index)
+		else:
+			if self._key_index is not None:
+				self._key_index[elem] = len(self.data)
+			self.data.append(elem)
+		self._invalidate_sortkeys()
+		self._notify("insert", index, (elem,))
+
+	def data_insert_many(self, elems, index = None):
+		"""
+		Inserts all elements of the list `elems` to self.data at index. If
+		index is not specified, the elements will be appended instead.
+		"""
+		self._check_keys(elems)
+		self._update_aggregates(elems)
+		if index is not None:
+			self.data[index:index] = elems
+			self._reindex(index)
+		else:
+			if self._key_index is not None:
+				start = len(self.data)
+				self._key_index.update(zip(elems, range(start, start + len(elems))))
+			self.data.extend(elems)
+		self._invalidate_sortkeys()
+		self._notify("insert", index, elems)
+
+	def data_delete(self, from_, to = None):
+		"""
+		Removes the elements from `from_` to `to` (end-exclusive), or
+		just `from_` if `to` is not given. No effect if `to` <= `from_`.
+		"""
+		to = from_ + 1 if to is None else to
+		if to <= from_:
+			return
+		removed = self.data[from_:to]
+		self.data = self.data[:from_] + self.data[to:]
+		self._update_aggregates(removed = removed if self._agg_names else ())
+		# Removing elements does not affect the order of the others
+		if self._sortkeys is not None:
+			del self._sortkeys[from_:to]
+		if self._key_index is not None:
+			for elem in removed:
+				del self._key_index[elem]
+			self._reindex(from_)
+		self._notify("delete", from_, to)
+
+	def data_delete_many(self, ranges, keep):
+		"""
+		Removes the elements in all given ranges in a single pass.
+		`ranges` must be disjoint and in descending order, `keep` must be
+		a sequence of booleans as long as self.data that is falsy for
+		exactly the elements in `ranges`.
+		"""
+		removed = ()
+		if self._agg_names:
+			removed = [x for x, k in zip(self.data, keep) if not k]
+		self.data = list(compress(self.data, keep))
+		self._update_aggregates(removed = removed)
+		if self._sortkeys is not None:
+			self._sortkeys = list(compress(self._sortkeys, keep))
+		if self._key_index is not None:
+			# Most elements move, so the index is built anew
+			self._key_index = {x: i for i, x in enumerate(self.data)}
+		self._notify("delete_many", ranges, keep)
+
+	def data_update(self, updates):
+		"""
+		Sets the elements at the indices the dict `updates` maps to new
+		elements.
+		"""
+		self._check_keys(updates.values(), updates)
+		data = self.data
+		removed = [data[i] for i in updates]
+		for i, elem in updates.items():
+			data[i] = elem
+		try:
+			self._update_aggregates(updates.values(), removed if self._agg_names else ())
+		except TypeError:
+			for i, elem in zip(updates, removed):
+				data[i] = elem
+			raise
+		if self._sortkeys is not None:
+			for i, elem in updates.items():
+				self._sortkeys[i] = self.cnf.sortkey(elem)
+		self._sorted_reverse = None
+		index = self._key_index
+		if index is not None:
+			# All old keys go first, as updated rows may swap them
+			for elem in removed:
+				del index[elem]
+			for i, elem in updates.items():
+				index[elem] = i
+		self._notify("update", updates)
+
+	def data_set(self, newdata):
+		"""
+		Sets the column's data to the list specified.
+		"""
+		if not isinstance(newdata, list):
+			raise TypeError("Data has to be a list!")
+		self._rebuild_aggregates(newdata)
+		self.data = newdata
+		self._invalidate_sortkeys()
+		self._invalidate_indices()
+		self._notify("set")
+
+	def data_permute(self, perm, sorted_reverse = None):
+		"""
+		Reorders self.data in place so that the element previously at
+		`perm[i]` ends up at index `i`.
+		`sorted_reverse` should be set to the `reverse` argument `perm`
+		was acquired with from this column's `get_sort_permutation`.
+		"""
+		data = self.data
+		data[:] = [data[i] for i in perm]
+		if self._sortkeys is not None:
+			keys = self._sortkeys
+			keys[:] = [keys[i] for i in perm]
+		self._sorted_reverse = sorted_reverse
+		if self._key_index is not None:
+			self._key_index = {x: i for i, x in enumerate(data)}
+		self._notify("permute", perm)
+
+	def get_aggregates(self):
+		"""
+		Returns a dict mapping the names of the column's aggregates to
+		their current values. min and max are None if no elements are
+		aggregated.
+		"""
+		res = {}
+		for name in self._agg_names:
+			if name == "sum":
+				res[name] = self._agg_sum
+			elif name == "count":
+				res[name] = self._agg_count
+			elif name == "min":
+				res[name] = self._agg_sorted[0] if self._agg_sorted else None
+			else:
+				res[name] = self._agg_sorted[-1] if self._agg_sorted else None
+		return res
+
+	def get_display(self, start, stop, view = None):
+		"""
+		Returns the elements from `start` to `stop` (end-exclusive) the way
+		they should be displayed, that is, ran through the formatter if
+		one is set.
+		If `view` is given, `start` and `stop` index it instead and the
+		elements at the indices it contains are returned.
+		"""
+		if view is None:
+			data = self.data[start:stop]
+		else:
+			data = [self.data[i] for i in view[start:stop]]
+		return self.format_elements(data)
+
+	def format_elements(self, elems):
+		"""
+		Returns a list of the elements of the list `elems` ran through the
+		batch formatter, or the formatter if there is none, or `elems`
+		itself if neither is set. Results are taken from and stored in the
+		format cache if it is enabled.
+		"""
+		batch_formatter = self.cnf.batch_formatter
+		if batch_formatter is not None:
+			if not elems:
+				return []
+			if self._format_cache is not None:
+				return self._format_cache.format(batch_formatter, elems, True)
+			res = list(batch_formatter(elems))
+			if len(res) != len(elems):
+				raise ValueError(
+					f"Batch formatter of column {self.col_id!r} returned {len(res)} "
+					f"results for {len(elems)} elements."
+				)
+			return res
+		formatter = self.cnf.formatter
+		if formatter is None:
+			return elems
+		if self._format_cache is not None:
+			return self._format_cache.format(formatter, elems)
+		return [formatter(x) for x in elems]
+
+	def get_format_cache_stats(self):
+		"""
+		Returns a dict of the `hits` and `misses` of the column's format
+		cache, the amount of results it holds as `size` and the amount it
+		may hold as `maxsize`, or None if it is disabled.
+		Hits and misses are counted since it was enabled or resized.
+		"""
+		if self._format_cache is None:
+			return None
+		return self._format_cache.stats()
+
+	def get_key_index(self):
+		"""
+		Returns a dict mapping the column's elements to their index, which
+		is built on first use and kept up to date with all modifications
+		until the data is replaced as a whole. Must not be modified.
+		Once it is built, modifications that would add an element already
+		present in the column raise a ValueError and leave the data
+		unchanged.
+		Raises a ValueError if the elements are not unique.
+		"""
+		if self._key_index is None:
+			index = {}
+			for i, x in enumerate(self.data):
+				if index.setdefault(x, i) != i:
+					raise ValueError(f"Duplicate key {x!r} in column {self.col_id!r}.")
+			self._key_index = index
+		return self._key_index
+
+	def get_sort_args(self):
+		"""
+		Returns a copy of the elements the column is sorted by and the
+		sortkey they still have to be ran through, which is None if the
+		sort keys are cached already. Passing them to `_sort_permutation`
+		along with `reverse` yields the same result as
+		`get_sort_permutation` without accessing the column, so it can be
+		done in another thread or process.
+		"""
+		if self.cnf.sortkey is None or self._sortkeys is not None:
+			return self._get_sortkeys().copy(), None
+		return self.data.copy(), self.cnf.sortkey
+
+	def get_sort_permutation(self, reverse):
+		"""
+		Returns a list of indices that sorts the column's data by its sort
+		keys when passed to `data_permute`, or None if the data already is
+		sorted that way. If the data is sorted the other way around by this
+		column, the permutation simply reverses it and is returned as a
+		`range`.
+		If sorting fails due to a TypeError and a fallback type is set, the
+		column's elements will be converted to it.
+		"""
+		if self._sorted_reverse is not None:
+			if self._sorted_reverse == reverse:
+				return None
+			return range(len(self.data) - 1, -1, -1)
+		try:
+			return _sort_permutation(self._get_sortkeys(), None, reverse)
+		except TypeError:
+			if self.cnf.fallback_type is None:
+				raise
+			self._apply_fallback_type()
+			return _sort_permutation(self._get_sortkeys(), None, reverse)
+
+	def has_formatter(self):
+		"""
+		Returns whether the column's elements are formatted for display,
+		that is, whether a formatter or batch formatter is set.
+		"""
+		return self.cnf.formatter is not None or self.cnf.batch_formatter is not None
+
+	@property
+	def sorted_reverse(self):
+		"""
+		Whether the data is currently sorted by this column in reverse
+		order, None if it is not known to be sorted by this column.
+		"""
+		return self._sorted_reverse
+
+	def subscribe(self, callback):
+		"""
+		Registers `callback` to be called after each modification of the
+		column's data with the kind of modification and its arguments:
+			"clear"
+			"insert", index (None if appended), elements
+			"delete", from, to (end-exclusive)
+			"delete_many", ranges, keep (see `data_delete_many`)
+			"update", dict mapping indices to new elements
+			"set"
+			"permute", permutation (see `data_permute`)
+			"format", sent when the displayed elements changed without the
+				data changing, i.e. the formatter was replaced.
+		"""
+		self._subscribers.append(callback)
+
+	def unsubscribe(self, callback):
+		"""Unregisters a callback registered with `subscribe`."""
+		self._subscribers.remove(callback)
+
+
+class TableModel():
+	"""
+	Tk-independent model of the contents of a MultiframeList: its
+	`ColumnModel`s, the amount of rows, the filter and the rows it lets
+	through, the selection and the active cell.
+	Methods modifying rows keep all columns at the same length, move the
+	selection and active cell along with their rows and report the
+	modifications to the callbacks registered via `subscribe`. Rows
+	modified through a `ColumnModel` directly are not refiltered.
+	While a filter is set, the selection, its anchor and the active cell's
+	y coordinate refer to the displayed rows, which `to_source` and
+	`to_shown` translate.
+	"""
+
+	def __init__(self, key_column = None, selection_type = SELECTION_TYPE.MULTIPLE):
+		# Columns by their id
+		self.columns = {}
+		self.length = 0
+		# Filter set by `set_filter` and the ascending indices of the rows
+		# it lets through, or None
+		self.filter = None
+		self.view = None
+		# Selected row indices
+		self.selection = _IntervalSet()
+		# --Stolen-- borrowed from tk, the first item a selection was started
+		# with, used for expanding it via `selection_set_from_anchor`
+		self.selection_anchor = None
+		self.selection_type = selection_type
+		# Last cell that was interacted with
+		self.active_cell_x = None
+		self.active_cell_y = None
+		# Id of the column whose elements uniquely identify rows
+		self.key_column = key_column
+		# Callbacks notified of modifications
+		self._subscribers = []
+
+	def _clamp_active_cell(self):
+		"""
+		Moves the active cell onto the last displayed row if it is below it.
+		"""
+		if self.active_cell_y is not None and self.active_cell_y >= self.shown_length:
+			self.active_cell_y = self.shown_length - 1 if self.shown_length > 0 else None
+
+	def _clear_selection(self):
+		self.selection.clear()
+		self.selection_anchor = None
+
+	def _delete_ranges(self, ranges):
+		"""
+		Removes the rows in the ranges from all columns. Ranges must be
+		given as returned by `_get_deletion_ranges`. Does not modify the
+		length.
+		"""
+		if len(ranges) == 1:
+			for col in self.columns.values():
+				col.data_delete(ranges[0].start, ranges[0].stop)
+		elif ranges:
+			keep = bytearray(b"\x01") * len(next(iter(self.columns.values()), ()))
+			for rng in ranges:
+				keep[rng.start:rng.stop] = bytes(len(rng))
+			for col in self.columns.values():
+				col.data_delete_many(ranges, keep)
+		self._notify("remove", ranges)
+
+	def _drop_shown(self, removed):
+		"""
+		Moves the selection, its anchor and the active cell along with their
+		rows after the displayed rows at the positions in the ascendedly
+		sorted list of disjoint ranges `removed` are gone. Removed rows are
+		deselected, the anchor is dropped if its row was removed and the
+		active cell moves on to the next row then.
+		"""
+		if not removed:
+			return
+		if self.selection:
+			moved = _ranges_after_removal(self.selection.ranges(), removed)
+			self.selection.clear()
+			self.selection.extend_sorted(moved)
+		anchor = self.selection_anchor
+		if anchor is not None:
+			if any(anchor in rng for rng in removed):
+				self.selection_anchor = None
+			else:
+				self.selection_anchor = _position_after_removal(removed, anchor)
+		if self.active_cell_y is not None:
+			self.active_cell_y = _position_after_removal(removed, self.active_cell_y)
+			self._clamp_active_cell()
+
+	def _filter_rows(self, rows):
+		"""
+		Returns a list of the indices yielded by the iterable `rows` whose
+		rows the filter lets through, in the same order.
+		"""
+		filter_ = self.filter
+		if callable(filter_):
+			cols = tuple(self.columns.values())
+			return [i for i in rows if filter_({col.col_id: col.data[i] for col in cols})]
+		rows = list(rows)
+		for col_id, condition in filter_.items():
+			data = self.columns[col_id].data
+			rows = [i for i in rows if condition(data[i])]
+		return rows
+
+	def _generate_col_id(self):
+		curid = 0
+		while curid in self.columns:
+			curid += 1
+		return curid
+
+	def _get_coldata(self, rows):
+		"""
+		Takes rows in either of the shapes `insert_rows` takes and returns
+		them as a dict mapping column ids to lists of elements as well as
+		the amount of rows.
+		"""
+		if isinstance(rows, dict):
+			amount = len(rows[next(iter(rows))]) if rows else 0
+			if any(len(d) != amount for d in rows.values()):
+				raise ValueError("Differing lengths in supplied column data.")
+			return rows, amount
+		rows = tuple(rows)
+		return {
+			col_id: [row.get(col_id, BLANK) for row in rows]
+			for col_id in self.columns
+		}, len(rows)
+
+	def _get_deletion_ranges(self, what, to = None):
+		"""
+		Validates the rows to remove given in the shape `remove_rows` takes
+		them and returns them as a list of disjoint ranges in descending
+		order.
+		"""
+		if isinstance(what, int):
+			to = what + 1 if to is None else to
+			if what < 0 or what > (self.length - 1):
+				raise IndexError(f"`from` index {what} out of range.")
+			if to < 0 or to > self.length:
+				raise IndexError(f"`to` index {what} out of range.")
+			return [range(what, to)]
+		if isinstance(what, _IntervalSet):
+			to_delete = what.ranges()
+			to_delete.reverse()
+			if to_delete and to_delete[0].stop > self.length:
+				raise IndexError(f"Inaccessible deletion index: {to_delete[0].stop - 1}")
+			if to_delete and to_delete[-1].start < 0:
+				raise IndexError(f"Inaccessible deletion index: {to_delete[-1].start}")
+			return to_delete
+		# Must be reversed to delete entries starting from the back,
+		# otherwise deletion of selection blocks will affect others
+		to_delete = sorted(what, reverse = True)
+		if to_delete and to_delete[0] > self.length - 1:
+			raise IndexError(f"Inaccessible deletion index: {to_delete[0]}")
+		if to_delete and to_delete[-1] < 0:
+			raise IndexError(f"Inaccessible deletion index: {to_delete[-1]}")
+		return _find_consecutive_sequences(to_delete)
+
+	def _insert_coldata(self, coldata, amount, index):
+		"""
+		Inserts `amount` rows given as returned by `_get_coldata` into all
+		columns. Does not modify the length. If a column rejects its
+		elements, the rows are removed from the columns they were already
+		inserted into again before the exception is reraised.
+		"""
+		done = []
+		try:
+			for col in self.columns.values():
+				if col.col_id in coldata:
+					col.data_insert_many(list(coldata[col.col_id]), index)
+				else:
+					col.data_insert_many([BLANK for _ in range(amount)], index)
+				done.append(col)
+		except Exception:
+			start = self.length if index is None else index
+			for col in done:
+				col.data_delete(start, start + amount)
+			raise
+		self._notify("insert", index, amount)
+
+	def _notify(self, change, *args):
+		for callback in self._subscribers:
+			callback(change, *args)
+
+	def _remap_shown(self, old_view, new_index):
+		"""
+		Moves the selection, its anchor and the active cell to the
+		displayed positions of their rows after the rows, which were
+		displayed as `old_view` describes, were moved around and the view
+		was recomputed. `new_index` must be a callable returning the index
+		a row now has in the data, or None if it was removed. It may also be
+		a range with a step of 1 or -1 containing each row's new index at
+		its current one, in which case selected intervals are moved as a
+		whole.
+		Rows that were removed or are not displayed anymore are deselected,
+		the anchor is dropped if its row is one of them and the active
+		cell stays where it is then.
+		"""
+		view = self.view
+		index_of = new_index.__getitem__ if isinstance(new_index, range) else new_index
+		def to_shown(pos):
+			if pos is None:
+				return None
+			idx = index_of(pos if old_view is None else old_view[pos])
+			if idx is None or view is None:
+				return idx
+			pos = bisect_left(view, idx)
+			return pos if pos < len(view) and view[pos] == idx else None
+
+		if self.selection:
+			if old_view is None:
+				selected = self.selection.ranges()
+			else:
+				selected = _IntervalSet.from_sorted(old_view[i] for i in self.selection).ranges()
+			if isinstance(new_index, range):
+				moved = []
+				for rng in selected:
+					a, b = new_index[rng.start], new_index[rng.stop - 1]
+					moved.append(range(a, b + 1) if a <= b else range(b, a + 1))
+				if new_index.step < 0:
+					moved.reverse()
+				if view is not None:
+					# The rows of an interval are all shown or hidden alike, as
+					# they have been shown before and only their order changed
+					moved = [
+						range(bisect_left(view, rng.start), bisect_left(view, rng.stop))
+						for rng in moved
+					]
+			else:
+				moved = []
+				for rng in selected:
+					for idx in rng:
+						idx = index_of(idx)
+						if idx is not None:
+							moved.append(idx)
+				moved.sort()
+				if view is not None:
+					shown = []
+					for idx in moved:
+						pos = bisect_left(view, idx)
+						if pos < len(view) and view[pos] == idx:
+							shown.append(pos)
+					moved = shown
+			self.selection.clear()
+			self.selection.extend_sorted(moved)
+		self.selection_anchor = to_shown(self.selection_anchor)
+		new_active = to_shown(self.active_cell_y)
+		if new_active is not None:
+			self.active_cell_y = new_active
+		self._clamp_active_cell()
+
+	def _rows_inserted(self, start, amount, clear_selection):
+		"""
+		Updates the displayed rows after `amount` rows were inserted at
+		`start`, filtering only the new ones, and moves the selection, its
+		anchor and the active cell along with their rows. The selection is
+		cleared instead if `clear_selection` is True and any rows were
+		inserted among the displayed ones.
+		Returns the displayed rows that were modified, see `subscribe`.
+		"""
+		view = self.view
+		if view is None:
+			pos = start
+			count = amount
+		else:
+			pos = bisect_left(view, start)
+			new = self._filter_rows(range(start, start + amount))
+			view[pos:] = new + [i + amount for i in view[pos:]]
+			count = len(new)
+		if not count:
+			return ([], [], [])
+		if clear_selection:
+			self._clear_selection()
+		self._shift_shown([pos] * count)
+		return ([], [range(pos, pos + count)], [])
+
+	def _rows_removed(self, ranges, clear_selection):
+		"""
+		Updates the displayed rows after the rows in `ranges`, given as
+		returned by `_get_deletion_ranges`, were removed and moves the
+		selection, its anchor and the active cell along with their rows,
+		see `_rows_inserted`.
+		"""
+		ranges = [rng for rng in reversed(ranges) if rng]
+		if not ranges:
+			return ([], [], [])
+		view = self.view
+		if view is None:
+			removed = ranges
+		else:
+			# Displayed positions of the removed rows, while the indices of
+			# the remaining ones are moved down past them
+			removed = []
+			lo = bisect_left(view, ranges[0].start)
+			tail = []
+			j = 0
+			removed_before = 0
+			for pos in range(lo, len(view)):
+				idx = view[pos]
+				while j < len(ranges) and ranges[j].stop <= idx:
+					removed_before += len(ranges[j])
+					j += 1
+				if j < len(ranges) and ranges[j].start <= idx:
+					if removed and removed[-1].stop == pos:
+						removed[-1] = range(removed[-1].start, pos + 1)
+					else:
+						removed.append(range(pos, pos + 1))
+				else:
+					tail.append(idx - removed_before)
+			view[lo:] = tail
+		if not removed:
+			return ([], [], [])
+		if clear_selection:
+			self._clear_selection()
+		self._drop_shown(removed)
+		return (removed, [], [])
+
+	def _rows_updated(self, rows, col_ids, clear_selection):
+		"""
+		Updates the displayed rows after the elements of the columns
+		specified by the ids in `col_ids` were modified in the rows at the
+		ascendedly sorted indices `rows`, filtering only those, and moves
+		the selection, its anchor and the active cell along with their rows,
+		see `_rows_inserted`. Rows that stay displayed are reported as
+		updated.
+		"""
+		view = self.view
+		if view is None:
+			return ([], [], self._shown_ranges(rows))
+		if isinstance(self.filter, dict) and self.filter.keys().isdisjoint(col_ids):
+			return ([], [], self._shown_ranges(rows))
+		passing = set(self._filter_rows(rows))
+		hidden = []
+		added = []
+		for idx in rows:
+			pos = bisect_left(view, idx)
+			if pos < len(view) and view[pos] == idx:
+				if idx not in passing:
+					hidden.append(pos)
+			elif idx in passing:
+				added.append(idx)
+		if not hidden and not added:
+			return ([], [], self._shown_ranges(rows))
+		if clear_selection:
+			self._clear_selection()
+		removed = _find_consecutive_sequences(hidden[::-1])
+		for rng in removed:
+			del view[rng.start:rng.stop]
+		removed.reverse()
+		self._drop_shown(removed)
+		points = [bisect_left(view, idx) for idx in added]
+		for idx, pos in zip(reversed(added), reversed(points)):
+			view.insert(pos, idx)
+		self._shift_shown(points)
+		added = set(added)
+		inserted = _find_consecutive_sequences([pos + k for k, pos in enumerate(points)][::-1])
+		inserted.reverse()
+		updated = self._shown_ranges([idx for idx in rows if idx not in added])
+		return (removed, inserted, updated)
+
+	def _selection_changed(self, old):
+		"""
+		Notifies subscribers of a change of the selection if its ranges
+		differ from `old`.
+		"""
+		if self.selection.ranges() != old:
+			self._notify("selection")
+
+	def _select_item(self, idx, toggle):
+		if self.selection_type is SELECTION_TYPE.SINGLE:
+			self._clear_selection()
+		if self.selection_anchor is None:
+			self.selection_anchor = idx
+		if toggle:
+			self.selection.toggle(idx)
+		else:
+			self.selection.add(idx)
+
+	def _set_coldata(self, coldata, amount):
+		"""
+		Sets the data of all columns to `amount` rows given as returned by
+		`_get_coldata`. Does not modify the length. If a column rejects its
+		data, the columns already set are reset to their previous data
+		before the exception is reraised.
+		"""
+		done = []
+		try:
+			for col in self.columns.values():
+				old = col.data
+				if col.col_id in coldata:
+					col.data_set(coldata[col.col_id])
+				else:
+					col.data_set([BLANK for _ in range(amount)])
+				done.append((col, old))
+		except Exception:
+			for col, old in done:
+				col.data_set(old)
+			raise
+		self._notify("set")
+
+	def _set_rows(self):
+		"""
+		Recomputes the displayed rows from scratch after all rows were
+		replaced, clears the selection and clamps the active cell.
+		"""
+		if self.filter is not None:
+			self.view = self._filter_rows(range(self.length))
+		self._clear_selection()
+		self._clamp_active_cell()
+
+	def _shift_shown(self, points):
+		"""
+		Moves the selection, its anchor and the active cell along with their
+		rows after a displayed row was inserted before each position in the
+		ascendedly sorted list `points`.
+		"""
+		if not points:
+			return
+		if self.selection:
+			moved = _ranges_after_insertion(self.selection.ranges(), points)
+			self.selection.clear()
+			self.selection.extend_sorted(moved)
+		if self.selection_anchor is not None:
+			self.selection_anchor += bisect_right(points, self.selection_anchor)
+		if self.active_cell_y is not None:
+			self.active_cell_y += bisect_right(points, self.active_cell_y)
+
+	def _shown_ranges(self, rows):
+		"""
+		Returns the displayed positions of the rows at the ascendedly sorted
+		indices `rows` that are displayed, as a list of ranges.
+		"""
+		ranges = _find_consecutive_sequences([
+			pos for pos in map(self.to_shown, reversed(rows)) if pos is not None
+		])
+		ranges.reverse()
+		return ranges
+
+	def add_column(self, col_id = None, factory = ColumnModel, **cnf):
+		"""
+		Creates a column with the given id and configuration, filled with
+		blank elements, and returns it. The column is created by calling
+		`factory` with the table, the id and the configuration, which has
+		to return a `ColumnModel`.
+		"""
+		col = factory(self, col_id, **cnf)
+		self.columns[col.col_id] = col
+		return col
+
+	def clear(self):
+		"""Removes all rows."""
+		old_selection = self.selection.ranges()
+		for col in self.columns.values():
+			col.data_clear()
+		self.length = 0
+		self._set_rows()
+		self._notify("shown", None)
+		self._selection_changed(old_selection)
+
+	def get_aggregates(self, col_id = None):
+		"""
+		Returns a dict mapping the names of the aggregates the column
+		specified by col_id keeps track of to their current values.
+		If col_id is not given, returns a dict mapping the ids of all
+		columns with aggregates to such dicts.
+		"""
+		if col_id is not None:
+			return self.get_column_model(col_id).get_aggregates()
+		return {
+			col_id: col.get_aggregates()
+			for col_id, col in self.columns.items() if col.cnf.aggregates
+		}
+
+	def get_cell(self, col_id, y):
+		"""Returns element y of the column specified by col_id."""
+		return self.get_column_model(col_id).data[y]
+
+	def get_column_model(self, col_id):
+		"""
+		Returns the column specified by col_id, raises an exception if it
+		is not found.
+		"""
+		col = self.columns.get(col_id)
+		if col is None:
+			raise ValueError(f"No column with column id {col_id!r}!")
+		return col
+
+	def get_format_cache_stats(self, col_id = None):
+		"""
+		Returns the format cache statistics of the column specified by
+		col_id, see `ColumnModel.get_format_cache_stats`. If col_id is not
+		given, returns a dict mapping the ids of all columns with a format
+		cache to them.
+		"""
+		if col_id is not None:
+			return self.get_column_model(col_id).get_format_cache_stats()
+		return {
+			col_id: col.get_format_cache_stats()
+			for col_id, col in self.columns.items() if col.cnf.format_cache is not None
+		}
+
+	def get_key_column(self):
+		"""
+		Returns the key column, raises an exception if none is configured
+		or it does not exist.
+		"""
+		if self.key_column is None:
+			raise RuntimeError("No key column is configured.")
+		return self.get_column_model(self.key_column)
+
+	def get_row_by_key(self, key):
+		"""
+		Returns the row whose element in the key column is `key` as a
+		dict mapping column ids to the row's elements.
+		Raises a KeyError if there is no such row.
+		"""
+		index = self.get_key_column().get_key_index()
+		if key not in index:
+			raise KeyError(f"No row with key {key!r}.")
+		idx = index[key]
+		return {col_id: col.data[idx] for col_id, col in self.columns.items()}
+
+	def get_rows(self, start, end = None):
+		"""
+		Retrieves rows between a start and an optional end parameter, see
+		`MultiframeList.get_rows`.
+		"""
+		if start == ALL:
+			start = 0
+			end = self.length
+		if end == END:
+			end = self.length
+		if end is None:
+			end = start + 1
+		col_id_map = {col_id: i for i, col_id in enumerate(self.columns.keys())}
+		r_data = [[col.data[idx] for col in self.columns.values()] for idx in range(start, end)]
+		# Performance location: out the window, on the sidewalk
+		return r_data, col_id_map
+
+	def insert_rows(self, rows, index = None, clear_selection = True):
+		"""
+		Inserts rows given as an iterable of dicts mapping column ids to
+		elements or as a dict mapping column ids to lists of elements at
+		`index`, or appends them if it is None.
+		If `clear_selection` is False, the selection moves along with its
+		rows, otherwise it is cleared if any inserted row is displayed.
+		Returns the amount of inserted rows.
+		"""
+		coldata, amount = self._get_coldata(rows)
+		if amount == 0:
+			return 0
+		old_selection = self.selection.ranges()
+		self._insert_coldata(coldata, amount, index)
+		self.length += amount
+		shown = self._rows_inserted(
+			self.length - amount if index is None else index, amount, clear_selection
+		)
+		self._notify("shown", shown)
+		self._selection_changed(old_selection)
+		return amount
+
+	def permute(self, perm, sort_col = None, reverse = None):
+		"""
+		Reorders all columns by the permutation `perm`, see
+		`ColumnModel.data_permute`. `sort_col` is the column `perm` was
+		acquired from with `reverse`, if any.
+		The selection, its anchor and the active cell move along with their
+		rows.
+		"""
+		old_selection = self.selection.ranges()
+		for col in self.columns.values():
+			col.data_permute(perm, reverse if col is sort_col else None)
+		if isinstance(perm, range):
+			# Simple reversal, see `ColumnModel.get_sort_permutation`,
+			# which is its own inverse
+			new_index = perm
+		else:
+			inverse = [0] * len(perm)
+			for i, p in enumerate(perm):
+				inverse[p] = i
+			new_index = inverse.__getitem__
+		old_view = self.view
+		if old_view is not None:
+			if isinstance(perm, range):
+				self.view = [perm[i] for i in reversed(old_view)]
+			else:
+				self.view = sorted(inverse[i] for i in old_view)
+		self._remap_shown(old_view, new_index)
+		self._notify("permute", perm)
+		self._notify("shown", None)
+		self._selection_changed(old_selection)
+
+	def remove_column(self, col_id):
+		"""
+		Removes the column addressed by col_id. Raises a ValueError if the
+		filter checks the column's elements.
+		"""
+		self.get_column_model(col_id)
+		if isinstance(self.filter, dict) and col_id in self.filter:
+			raise ValueError(f"Column {col_id!r} is used by the filter.")
+		self.columns.pop(col_id)
+
+	def remove_rows(self, what, to = None, clear_selection = True):
+		"""
+		If `what` is an int, removes the rows from `what` to `to`
+		(end-exclusive), or only the row at `what` if `to` is not given.
+		Otherwise, removes all rows at the indices `what` yields.
+		If `clear_selection` is False, the selection moves along with its
+		rows, otherwise it is cleared if any removed row was displayed.
+		Raises an IndexError if any index is out of range.
+		"""
+		ranges = self._get_deletion_ranges(what, to)
+		amount = sum(len(rng) for rng in ranges)
+		if amount == 0:
+			return
+		old_selection = self.selection.ranges()
+		self.length -= amount
+		self._delete_ranges(ranges)
+		shown = self._rows_removed(ranges, clear_selection)
+		self._notify("shown", shown)
+		self._selection_changed(old_selection)
+
+	def selection_clear(self):
+		"""Clears the selection and its anchor."""
+		old_selection = self.selection.ranges()
+		self._clear_selection()
+		self._selection_changed(old_selection)
+
+	def selection_set(self, new, anchor = None, toggle = False):
+		"""
+		Clears and then sets the selection to the given iterable or single
+		index. If `anchor` is not None, the selection anchor is set to it.
+		Otherwise, it is set to the first index seen in the new selection.
+		`toggle` is passed on to `selection_set_item` for each index.
+		"""
+		old_selection = self.selection.ranges()
+		self._clear_selection()
+		if anchor is not None:
+			self.selection_anchor = anchor
+		if isinstance(new, int):
+			self._select_item(new, toggle)
+		elif (
+			isinstance(new, range) and new.step == 1 and not toggle and
+			self.selection_type is SELECTION_TYPE.MULTIPLE
+		):
+			if new and self.selection_anchor is None:
+				self.selection_anchor = new.start
+			self.selection.add_range(new.start, new.stop)
+		else:
+			for idx in new:
+				self._select_item(idx, toggle)
+		self._selection_changed(old_selection)
+
+	def selection_set_from_anchor(self, target, toggle = False, clear = True):
+		"""
+		If the selection type is `MULTIPLE`, sets the selection from the
+		current anchor to `target`. If there is no anchor or the selection
+		type is `SINGLE`, sets the selection to just `target` like
+		`selection_set` does, passing on `toggle`.
+		If `clear` is False, the range is added to the current selection.
+		"""
+		anchor = self.selection_anchor
+		if self.selection_type is SELECTION_TYPE.SINGLE or anchor is None:
+			self.selection_set(target, toggle = toggle)
+			return
+		old_selection = self.selection.ranges()
+		if clear:
+			self.selection.clear()
+		self.selection.add_range(min(anchor, target), max(anchor, target) + 1)
+		self._selection_changed(old_selection)
+
+	def selection_set_item(self, idx, toggle = False):
+		"""
+		Adds an index to the selection, which is cleared beforehand if the
+		selection type is `SINGLE`. If there is no selection anchor, it is
+		set to the index. If `toggle` is True, the index is toggled instead.
+		"""
+		old_selection = self.selection.ranges()
+		self._select_item(idx, toggle)
+		self._selection_changed(old_selection)
+
+	def set_active_cell(self, x, y):
+		"""
+		Sets the active cell to the given coordinates, either of which may
+		be None, and notifies subscribers with the previous ones if it
+		changed. Raises a ValueError if y is not a displayed row.
+		"""
+		if y is not None and not 0 <= y < self.shown_length:
+			raise ValueError("New y selection exceeds length.")
+		old_x = self.active_cell_x
+		old_y = self.active_cell_y
+		if x == old_x and y == old_y:
+			return
+		self.active_cell_x = x
+		self.active_cell_y = y
+		self._notify("active_cell", old_x, old_y)
+
+	def set_column(self, col_id, data):
+		"""
+		Sets the data of the column specified by col_id to the list `data`.
+		It may only differ in length from the current data if there are no
+		other columns. If the length or the displayed rows change, the
+		selection is cleared.
+		Raises a ValueError if the length differs otherwise.
+		"""
+		col = self.get_column_model(col_id)
+		if len(data) != self.length:
+			for other in self.columns.values():
+				if other is not col:
+					raise ValueError(
+						f"Length of supplied column data is different from length of "
+						f"column {other.col_id!r}."
+					)
+		old_selection = self.selection.ranges()
+		old_view = self.view
+		col.data_set(data)
+		if len(data) != self.length:
+			self.length = len(data)
+			self._set_rows()
+		elif self.filter is not None:
+			self.view = self._filter_rows(range(self.length))
+			if self.view != old_view:
+				self._clear_selection()
+				self._clamp_active_cell()
+		self._notify("shown", None)
+		self._selection_changed(old_selection)
+
+	def set_data(self, data):
+		"""
+		Sets the data of all columns from a dict mapping column ids to lists
+		of equal length. Columns missing from it are filled with blank
+		elements. Clears the selection.
+		"""
+		coldata, amount = self._get_coldata(data)
+		old_selection = self.selection.ranges()
+		self._set_coldata(coldata, amount)
+		self.length = amount
+		self._set_rows()
+		self._notify("shown", None)
+		self._selection_changed(old_selection)
+
+	def set_filter(self, filter_):
+		"""
+		Only lets the rows `filter_` lets through be displayed. It may be a
+		callable receiving a dict mapping each column's id to the row's
+		element in it, a dict mapping column ids to callables receiving the
+		row's element in that column, which all have to return a truthy
+		value, or None to remove the filter, see `MultiframeList.set_filter`.
+		Clears the selection.
+		Raises a ValueError if a column in a dict filter does not exist.
+		"""
+		if isinstance(filter_, dict):
+			for col_id in filter_:
+				self.get_column_model(col_id)
+		old_selection = self.selection.ranges()
+		self.filter = filter_
+		self.view = None
+		self._set_rows()
+		self._notify("filter")
+		self._selection_changed(old_selection)
+
+	@property
+	def shown_length(self):
+		"""Amount of displayed rows, which is the length unless filtered."""
+		return self.length if self.view is None else len(self.view)
+
+	def sort(self, col_id, reverse = False):
+		"""
+		Sorts all rows by the column specified by col_id and returns the
+		permutation that was applied, see `ColumnModel.get_sort_permutation`.
+		"""
+		col = self.get_column_model(col_id)
+		perm = col.get_sort_permutation(reverse)
+		if perm is not None:
+			self.permute(perm, col, reverse)
+		return perm
+
+	def subscribe(self, callback):
+		"""
+		Registers `callback` to be called after each modification with the
+		kind of modification and its arguments:
+			"insert", index (None if appended), amount
+			"remove", ranges in descending order
+			"set"
+			"permute", permutation (see `ColumnModel.data_permute`)
+			"shown", changes: The displayed rows were modified by the
+				operation that just ended. The selection and active cell
+				have been moved along with their rows already. `changes` is
+				None if all displayed rows may have changed, otherwise a
+				tuple of three ascendedly sorted lists of ranges: The
+				displayed positions of the removed rows as they were before,
+				and the ones of the inserted and of the updated rows as they
+				are now.
+			"filter": A new filter was set.
+			"selection": The selection changed, reported after "shown".
+			"active_cell", previous x, previous y: `set_active_cell` moved
+				the active cell.
+			"aggregates", the column whose aggregates changed
+		Modifications of single columns are reported by the columns
+		themselves, see `ColumnModel.subscribe`.
+		"""
+		self._subscribers.append(callback)
+
+	def to_shown(self, idx):
+		"""
+		Returns the position the row at index `idx` is displayed at, or
+		None if the filter hides it.
+		"""
+		if self.view is None:
+			return idx
+		pos = bisect_left(self.view, idx)
+		return pos if pos < len(self.view) and self.view[pos] == idx else None
+
+	def to_source(self, pos):
+		"""Returns the index of the row displayed at position `pos`."""
+		return pos if self.view is None else self.view[pos]
+
+	def unsubscribe(self, callback):
+		"""Unregisters a callback registered with `subscribe`."""
+		self._subscribers.remove(callback)
+
+	def update_cells(self, updates, clear_selection = True):
+		"""
+		Replaces elements given as a dict mapping column ids to dicts
+		mapping row indices to the new elements. Only the modified rows
+		are refiltered.
+		If `clear_selection` is False, the selection moves along with its
+		rows, otherwise it is cleared if the displayed rows change.
+		If a column rejects its elements, the columns already modified are
+		reset before the exception is reraised.
+		"""
+		cols = [
+			(self.get_column_model(col_id), col_updates)
+			for col_id, col_updates in updates.items() if col_updates
+		]
+		old_selection = self.selection.ranges()
+		done = []
+		try:
+			for col, col_updates in cols:
+				old = {i: col.data[i] for i in col_updates}
+				col.data_update(col_updates)
+				done.append((col, old))
+		except Exception:
+			for col, old in done:
+				col.data_update(old)
+			raise
+		rows = sorted(set().union(*(col_updates.keys() for _, col_updates in cols)))
+		shown = self._rows_updated(rows, [col.col_id for col, _ in cols], clear_selection)
+		self._notify("shown", shown)
+		self._selection_changed(old_selection)
+
+	def update_data(self, data):
+		"""
+		Sets the data of all columns like `set_data` does, but only applies
+		the differences to the current data: Changed elements are updated,
+		other rows are removed or inserted.
+		If the key column is set and `data` contains it, rows are matched
+		by their key and may be inserted, removed or reordered. Otherwise,
+		rows are matched by their position and rows are only added or
+		removed at the end.
+		Only inserted and changed rows are refiltered. The selection, its
+		anchor and the active cell move along with rows that are kept and
+		still displayed.
+		Returns a function mapping a row's previous index to its new one,
+		or to None if the row was removed.
+		Raises a ValueError if the keys in `data` are not unique.
+		"""
+		coldata, amount = self._get_coldata(data)
+		key_id = self.key_column
+		if key_id is not None and key_id in coldata:
+			keys = coldata[key_id]
+			if len(set(keys)) != len(keys):
+				raise ValueError(f"Duplicate keys in the data for key column {key_id!r}.")
+			opcodes = SequenceMatcher(
+				None, self.get_column_model(key_id).data, coldata[key_id], autojunk = False
+			).get_opcodes()
+		else:
+			common = min(self.length, amount)
+			opcodes = [("equal", 0, common, 0, common)]
+			if self.length > common:
+				opcodes.append(("delete", common, self.length, common, common))
+			elif amount > common:
+				opcodes.append(("insert", common, common, common, amount))
+
+		old_selection = self.selection.ranges()
+		old_view = self.view
+		# New indices of the rows the filter has to be run for
+		recheck = []
+		# Rows may be inserted before their old versions are removed, so
+		# key indices could see duplicates. They are rebuilt once needed.
+		for col in self.columns.values():
+			col._invalidate_indices()
+		# Going backwards, indices of the current data stay valid
+		for tag, i1, i2, j1, j2 in reversed(opcodes):
+			if tag == "equal":
+				changed = set()
+				for col_id, col in self.columns.items():
+					old = col.data
+					new = coldata.get(col_id)
+					if new is None:
+						updates = {i: BLANK for i in range(i1, i2) if old[i] != BLANK}
+					else:
+						updates = {
+							i1 + k: new[j1 + k] for k in range(i2 - i1)
+							if old[i1 + k] is not new[j1 + k] and old[i1 + k] != new[j1 + k]
+						}
+					if updates:
+						col.data_update(updates)
+						changed.update(updates)
+				recheck.extend(j1 + i - i1 for i in changed)
+				continue
+			if i2 > i1:
+				self.length -= i2 - i1
+				self._delete_ranges([range(i1, i2)])
+			if j2 > j1:
+				self._insert_coldata(
+					{col_id: col_data[j1:j2] for col_id, col_data in coldata.items()},
+					j2 - j1, i1,
+				)
+				self.length += j2 - j1
+				recheck.extend(range(j1, j2))
+
+		kept = [op for op in opcodes if op[0] == "equal"]
+		kept_starts = [op[1] for op in kept]
+		def new_index(idx):
+			block = bisect_right(kept_starts, idx) - 1
+			if block < 0:
+				return None
+			_, i1, i2, j1, _ = kept[block]
+			return j1 + idx - i1 if idx < i2 else None
+
+		if old_view is not None:
+			recheck = set(recheck)
+			view = [new_index(i) for i in old_view]
+			view = [i for i in view if i is not None and i not in recheck]
+			view.extend(self._filter_rows(sorted(recheck)))
+			view.sort()
+			self.view = view
+		self._remap_shown(old_view, new_index)
+		self._notify("shown", None)
+		self._selection_changed(old_selection)
+		return new_index
@@ -4,61 +4,81 @@ Its purpose is to display items and their properties over
 several colums and easily format, sort and manage them as part of a UI.
 """
 
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from enum import IntEnum
-from operator import itemgetter
+from functools import wraps
+from itertools import compress, islice
 import os
+from queue import Empty, Queue
+from time import perf_counter
 import tkinter as tk
 import tkinter.ttk as ttk
 
+from multiframe_list.model import (
+	AGGREGATES, ALL, BLANK, END, SELECTION_TYPE, ColumnModel, TableModel, _IntervalSet,
+	_sort_permutation, _subtract_ranges,
+)
+
 __version__ = "4.0.1"
 __author__ = "Square789"
 
 NoneType = type(None)
 
-BLANK = ""
 _DEF_LISTBOX_WIDTH = 20
 DRAG_THRES = 10
+# Amount of ranges above which a column rebuilds its listbox instead of
+# deleting each range from it on its own
+_MAX_RANGE_DELETES = 8
 MIN_WIDTH = 30
+# Milliseconds after which type-ahead input starts a new search
+TYPEAHEAD_TIMEOUT = 1000
+# Milliseconds between checks whether a background sort has finished
+_SORT_POLL_INTERVAL = 20
 WEIGHT = 1000
 
-ALL = "all"
-END = "end"
-
 class DRAGINTENT(IntEnum):
 	REORDER = 0
 	RESIZE = 1
 
-class SELECTION_TYPE(IntEnum):
-	SINGLE = 0
-	MULTIPLE = 1
+class _INGEST_OP(IntEnum):
+	INSERT_ROW = 0
+	SET_CELL = 1
+	REMOVE_ROWS = 2
 
 def _drag_intent(x, frame):
 	if x < (MIN_WIDTH // 2) and frame != 0:
 		return DRAGINTENT.RESIZE
 	return DRAGINTENT.REORDER
 
-def _find_consecutive_sequences(lst):
+def _instrumented(method):
 	"""
-	Given a **descendedly sorted list**, returns a list of ranges
-	of all consecutively descending ranges of numbers in the
-	given list. Duplicate numbers following one another are treated
-	as a single number.
-	Example: `[6, 5, 5, 4, 2, 1]` -> `[range(4, 7), range(1, 3)]`
+	Decorates a MultiframeList method so that, if Tk call instrumentation
+	is enabled, the Tk calls made while it runs are attributed to it.
+	Calls made by instrumented methods it calls in turn count towards it
+	as well.
 	"""
-	if not lst:
-		return []
-	last_start = lst[0]
-	last = None
-	res = []
-	for x in lst:
-		if last is not None and last != x and last != x + 1:
-			res.append(range(last, last_start + 1))
-			last_start = x
-		last = x
-	res.append(range(last, last_start + 1))
-	return res
+	name = method.__name__
+	@wraps(method)
+	def wrapper(self, *args, **kwargs):
+		recorder = self._tk_recorder
+		if recorder is None or recorder.operation is not None:
+			return method(self, *args, **kwargs)
+		recorder.begin(name)
+		start = perf_counter()
+		try:
+			return method(self, *args, **kwargs)
+		finally:
+			record = recorder.end(perf_counter() - start)
+			if self.cnf.instrument_callback is not None:
+				self.cnf.instrument_callback(name, record)
+	return wrapper
 
 SORTSYM = ("\u25B2", "\u25BC", "\u25A0") # desc, asc, none
+SORTSYM_BUSY = "\u2026"
+# Operation Tk calls made outside of any instrumented method are attributed to
+INSTRUMENT_OTHER = "(other)"
 
 # State modifier flags for tk event. These are hardcoded by tuple position
 # in tkinter.
@@ -68,13 +88,18 @@ def with_shift(e):
 def with_ctrl(e):
 	return bool(e.state & 4)
 
+# State modifier flags that turn a key press into a shortcut instead of
+# typed text, by windowing system. Alt is Mod1 on X11, but Mod1 is NumLock
+# on Windows, where Alt has its own flag. On aqua, Mod1 is Command.
+SHORTCUT_STATE = {"x11": 0x4 | 0x8, "win32": 0x4 | 0x20000, "aqua": 0x4 | 0x8}
+
 SCROLLCOMMAND = """
 if {{[tk windowingsystem] eq "aqua"}} {{
 	bind {w} <MouseWheel> {{
-		%W yview scroll [expr {{- (%D)}}] units
+		{yview} scroll [expr {{- (%D)}}] units
 	}}
 	bind {w} <Option-MouseWheel> {{
-		%W yview scroll [expr {{-10 * (%D)}}] units
+		{yview} scroll [expr {{-10 * (%D)}}] units
 	}}
 	bind {w} <Shift-MouseWheel> {{
 		%W xview scroll [expr {{- (%D)}}] units
@@ -84,7 +109,7 @@ if {{[tk windowingsystem] eq "aqua"}} {{
 	}}
 }} else {{
 	bind {w} <MouseWheel> {{
-		%W yview scroll [expr {{- (%D / 120) * 4}}] units
+		{yview} scroll [expr {{- (%D / 120) * 4}}] units
 	}}
 	bind {w} <Shift-MouseWheel> {{
 		%W xview scroll [expr {{- (%D / 120) * 4}}] units
@@ -94,7 +119,7 @@ if {{[tk windowingsystem] eq "aqua"}} {{
 if {{"x11" eq [tk windowingsystem]}} {{
 	bind {w} <4> {{
 	if {{!$tk_strictMotif}} {{
-		%W yview scroll -5 units
+		{yview} scroll -5 units
 	}}
 	}}
 	bind {w} <Shift-4> {{
@@ -104,7 +129,7 @@ if {{"x11" eq [tk windowingsystem]}} {{
 	}}
 	bind {w} <5> {{
 	if {{!$tk_strictMotif}} {{
-		%W yview scroll 5 units
+		{yview} scroll 5 units
 	}}
 	}}
 	bind {w} <Shift-5> {{
@@ -115,7 +140,321 @@ if {{"x11" eq [tk windowingsystem]}} {{
 }}
 """
 
-class _Column():
+class _RowStream():
+	"""
+	Handle of rows being streamed into a MultiframeList, as returned by
+	`MultiframeList.stream_rows`.
+	"""
+	def __init__(self, mfl, rows, chunk_size, budget_ms, callback):
+		self.mfl = mfl
+		self.rows = iter(rows)
+		self.chunk_size = chunk_size
+		self.budget_ms = budget_ms
+		self.callback = callback
+		# Amount of rows inserted so far
+		self.inserted = 0
+		# Whether the stream has ended, by exhaustion or otherwise
+		self.done = False
+		self.cancelled = False
+		self._after_id = mfl.after_idle(self._step)
+		mfl._streams.add(self)
+
+	def __repr__(self):
+		return (
+			f"<{self.__class__.__name__} of {self.mfl!r}, {self.inserted} inserted, "
+			f"done={self.done}, cancelled={self.cancelled}>"
+		)
+
+	def cancel(self):
+		"""
+		Stops the stream. Rows that were already inserted remain in the
+		MultiframeList, no event is generated and the callback is not
+		called. Has no effect if the stream has ended already.
+		"""
+		if self.done:
+			return
+		self.mfl.after_cancel(self._after_id)
+		self._after_id = None
+		self._end()
+		self.cancelled = True
+
+	def _end(self):
+		"""Marks the stream as ended and unregisters it."""
+		self.done = True
+		self.mfl._streams.discard(self)
+
+	def _step(self):
+		"""
+		Pulls up to `chunk_size` rows from the iterator, stopping early
+		once `budget_ms` have passed, and appends them to the
+		MultiframeList. Then schedules the next step or ends the stream.
+		"""
+		self._after_id = None
+		deadline = perf_counter() + self.budget_ms / 1000
+		chunk = []
+		exhausted = True
+		try:
+			for row in islice(self.rows, self.chunk_size):
+				chunk.append(row)
+				if perf_counter() >= deadline:
+					exhausted = False
+					break
+			else:
+				exhausted = len(chunk) < self.chunk_size
+			self.mfl._insert_rows(chunk, None, True, False)
+		except BaseException:
+			self._end()
+			raise
+		self.inserted += len(chunk)
+		if not exhausted:
+			self._after_id = self.mfl.after(1, self._step)
+			return
+		self._end()
+		self.mfl.event_generate("<<MultiframeStreamEnd>>", when = "tail")
+		if self.callback is not None:
+			self.callback(self)
+
+
+class _IngestQueue():
+	"""
+	Thread-safe handle feeding modifications into a MultiframeList, as
+	returned by `MultiframeList.ingest_queue`.
+	Its `insert_row`, `set_cell` and `remove_rows` methods may be called from
+	any thread. The modifications are queued and applied by the thread
+	running the tkinter event loop, in order, every `interval_ms`
+	milliseconds, each time for at most `budget_ms` milliseconds.
+	Consecutive row insertions are applied as one.
+	Once `maxsize` modifications are queued, the methods block until there
+	is space again, or raise `queue.Full` if `block` is False or `timeout`
+	expires. To use the handle from an asyncio event loop, either pass
+	`block = False` or call the methods in an executor.
+	"""
+	def __init__(self, mfl, maxsize, interval_ms, budget_ms):
+		self.mfl = mfl
+		self.interval_ms = interval_ms
+		self.budget_ms = budget_ms
+		self.closed = False
+		# Amount of modifications applied so far
+		self.applied = 0
+		# Amount of times modifications were taken from the queue
+		self.drains = 0
+		# Seconds the oldest modification of the last drain was queued for
+		self.latency = 0.0
+		self.max_latency = 0.0
+		self._queue = Queue(maxsize)
+		self._after_id = mfl.after(interval_ms, self._drain)
+		mfl._ingest_queues.add(self)
+
+	def __repr__(self):
+		return (
+			f"<{self.__class__.__name__} of {self.mfl!r}, depth={self.depth}, "
+			f"closed={self.closed}>"
+		)
+
+	@property
+	def depth(self):
+		"""Amount of modifications waiting to be applied."""
+		return self._queue.qsize()
+
+	def close(self):
+		"""
+		Closes the queue. Modifications already queued will still be applied,
+		after that the handle stops polling. Queueing further modifications
+		raises a RuntimeError.
+		"""
+		self.closed = True
+
+	def insert_row(self, data, block = True, timeout = None):
+		"""
+		Queues appending a row, supplied as a dict like `MultiframeList.insert_row`
+		takes it. Appending resets the sortstates of all columns, but keeps
+		the selection.
+		"""
+		self._put(_INGEST_OP.INSERT_ROW, data, block, timeout)
+
+	def remove_rows(self, what, to = None, block = True, timeout = None):
+		"""
+		Queues a call to `MultiframeList.remove_rows`. The indices are
+		interpreted once the removal is applied.
+		"""
+		self._put(_INGEST_OP.REMOVE_ROWS, (what, to), block, timeout)
+
+	def set_cell(self, col_id, y, data, reset_sortstate = True, block = True, timeout = None):
+		"""
+		Queues a call to `MultiframeList.set_cell`. The index is interpreted
+		once the modification is applied.
+		"""
+		self._put(_INGEST_OP.SET_CELL, (col_id, y, data, reset_sortstate), block, timeout)
+
+	def stats(self):
+		"""
+		Returns a dict of the queue's depth, the amount of modifications
+		applied, the amount of drains and the latency of the last drain as
+		well as the highest one so far in milliseconds.
+		"""
+		return {
+			"depth": self.depth,
+			"applied": self.applied,
+			"drains": self.drains,
+			"latency_ms": self.latency * 1000,
+			"max_latency_ms": self.max_latency * 1000,
+		}
+
+	def _drain(self):
+		"""
+		Applies queued modifications until the queue is empty or the time
+		budget is used up, then schedules the next drain. Consecutive
+		appends are inserted through a single incremental insertion, so a
+		drain costs no more than the rows it adds. Exceptions raised by a
+		modification are left to tkinter's error reporting; the
+		modifications queued after it remain queued.
+		"""
+		self._after_id = None
+		try:
+			try:
+				op, arg, queued_at = self._queue.get_nowait()
+			except Empty:
+				return
+			deadline = perf_counter() + self.budget_ms / 1000
+			self.drains += 1
+			self.latency = perf_counter() - queued_at
+			self.max_latency = max(self.max_latency, self.latency)
+			rows = []
+			while True:
+				self.applied += 1
+				if op is _INGEST_OP.INSERT_ROW:
+					rows.append(arg)
+				else:
+					self._flush_rows(rows)
+					if op is _INGEST_OP.SET_CELL:
+						self.mfl.set_cell(*arg)
+					else:
+						self.mfl.remove_rows(*arg)
+				if perf_counter() >= deadline:
+					break
+				try:
+					op, arg, _ = self._queue.get_nowait()
+				except Empty:
+					break
+			self._flush_rows(rows)
+		finally:
+			if self.closed and self._queue.empty():
+				self.mfl._ingest_queues.discard(self)
+			else:
+				self._after_id = self.mfl.after(self.interval_ms, self._drain)
+
+	def _flush_rows(self, rows):
+		"""Appends and then clears the collected list of rows."""
+		if rows:
+			self.mfl._insert_rows(rows, None, True, False)
+			rows.clear()
+
+	def _put(self, op, arg, block, timeout):
+		if self.closed:
+			raise RuntimeError("Ingest queue is closed.")
+		self._queue.put((op, arg, perf_counter()), block, timeout)
+
+	def _stop(self):
+		"""
+		Closes the queue and stops polling immediately, discarding all
+		modifications that are still queued.
+		"""
+		self.closed = True
+		if self._after_id is not None:
+			self.mfl.after_cancel(self._after_id)
+			self._after_id = None
+		self.mfl._ingest_queues.discard(self)
+		# Unblocks threads waiting for space
+		while True:
+			try:
+				self._queue.get_nowait()
+			except Empty:
+				break
+
+
+class _TkCallRecorder():
+	"""
+	Stands in for the Tk application object of a MultiframeList and its
+	widgets while Tk call instrumentation is enabled.
+	Counts and times the Tcl commands run through it and adds them to the
+	statistics of the instrumented operation running at the time, or
+	`INSTRUMENT_OTHER` if there is none.
+	"""
+	def __init__(self, tkapp, stats):
+		self.tkapp = tkapp
+		self.stats = stats
+		# Name of the running operation and the record of its Tk calls
+		self.operation = None
+		self._record = None
+
+	def __getattr__(self, name):
+		return getattr(self.tkapp, name)
+
+	def _count(self, command, seconds):
+		if self._record is None:
+			self._add(INSTRUMENT_OTHER, 0, 0.0, 1, seconds, {command: 1})
+			return
+		self._record["tk_calls"] += 1
+		self._record["tk_seconds"] += seconds
+		commands = self._record["commands"]
+		commands[command] = commands.get(command, 0) + 1
+
+	def _add(self, name, calls, seconds, tk_calls, tk_seconds, commands):
+		entry = self.stats.get(name)
+		if entry is None:
+			entry = self.stats[name] = {
+				"calls": 0, "seconds": 0.0, "tk_calls": 0, "tk_seconds": 0.0,
+				"commands": {},
+			}
+		entry["calls"] += calls
+		entry["seconds"] += seconds
+		entry["tk_calls"] += tk_calls
+		entry["tk_seconds"] += tk_seconds
+		for command, amount in commands.items():
+			entry["commands"][command] = entry["commands"].get(command, 0) + amount
+
+	def begin(self, name):
+		"""Starts recording Tk calls for the operation `name`."""
+		self.operation = name
+		self._record = {"tk_calls": 0, "tk_seconds": 0.0, "commands": {}}
+
+	def end(self, seconds):
+		"""
+		Ends recording for the running operation, which took `seconds`,
+		adds its record to the statistics and returns it.
+		"""
+		record = self._record
+		record["seconds"] = seconds
+		self._add(
+			self.operation, 1, seconds, record["tk_calls"], record["tk_seconds"],
+			record["commands"],
+		)
+		self.operation = self._record = None
+		return record
+
+	def call(self, *args):
+		# tkinter sometimes passes all arguments as a single tuple
+		if len(args) == 1 and isinstance(args[0], tuple):
+			args = args[0]
+		command = str(args[0])
+		# Widget commands are told apart by their subcommand
+		if command.startswith(".") and len(args) > 1:
+			command = str(args[1])
+		start = perf_counter()
+		try:
+			return self.tkapp.call(*args)
+		finally:
+			self._count(command, perf_counter() - start)
+
+	def eval(self, script):
+		start = perf_counter()
+		try:
+			return self.tkapp.eval(script)
+		finally:
+			self._count("eval", perf_counter() - start)
+
+
+class _Column(ColumnModel):
 	"""
 	Class whose purpose is to store data and information regarding a
 	column. Can be assigned to frames of a MultiframeList, displaying
@@ -136,7 +475,8 @@ class _Column():
 	sort: Whether the column should sort the entire MultiframeList when its
 		label is clicked.
 	sortkey: A function that will be used to sort values in this column,
-		just like the regular `sorted` `key` kwarg.
+		just like the regular `sorted` `key` kwarg. Its results are cached
+		until the column's data is modified.
 	minsize: Specify the minimum amount of pixels the column should be wide.
 		This option gets passed to the grid geometry manager and will at least
 		be `MIN_WIDTH`.
@@ -146,6 +486,11 @@ class _Column():
 		This is especially useful for i. e. dates, where you want
 		to be able to sort by a unix timestamp but still be able to have the
 		dates in a human-readable format.
+	batch_formatter: A function that formats many elements of the column at
+		once, being given a list of them and returning a sequence of the same
+		length containing their formatted versions, e. g. a NumPy `char.mod`
+		call. Used instead of `formatter` if set, which is much faster for
+		large amounts of rows than calling a function for each element.
 	fallback_type: A datatype that all elements of the column will be converted
 		to in case it has to be sorted and the sort fails due to a TypeError.
 		Note that this will modify the contained elements upon sorting and is
@@ -155,22 +500,37 @@ class _Column():
 		raised normally.
 	dblclick_cmd: A command that will be run when the column is double-clicked.
 		Will be called with an event as only parameter.
+	aggregates: An iterable of names from `AGGREGATES` the column should keep
+		track of as its data changes. Elements that are `BLANK` or None are
+		ignored, all rows count regardless of a filter. Their values can be
+		retrieved with `MultiframeList.get_aggregates`. Modifications adding
+		elements that can not be aggregated with the others, such as a
+		string to a summed column, raise a TypeError and leave the data
+		unchanged.
+	format_cache: Maximum amount of formatter results to cache, looked up by
+		the element or, if it is unhashable, its identity. Once full, the
+		least recently used results are discarded. Meant for expensive
+		formatters, as the cache is dropped when the formatter is replaced.
+		Statistics can be retrieved with `MultiframeList.get_format_cache_stats`.
+		None by default, which disables the cache.
 	"""
 	# COLUMNS ARE RESPONSIBLE FOR UI UPDATING. GENERAL FLOW LIKE THIS:
 	# USER INTERFACES WITH THE MFL, MFL KEEPS TRACK OF A FEW LISTS AND
-	# VARS, VALIDATES, GIVES COMMANDS TO COLUMNS, COLUMNS UPDATE UI
-	# THEMSELVES
+	# VARS, VALIDATES, GIVES COMMANDS TO COLUMNS, COLUMNS STORE DATA IN
+	# THEIR MODEL AND UPDATE UI THEMSELVES ONCE IT NOTIFIES THEM
 
 	class Config():
 		__slots__ = (
 			"name", "sort", "sortkey", "minsize", "weight", "formatter",
-			"fallback_type", "dblclick_cmd",
+			"batch_formatter", "fallback_type", "dblclick_cmd", "aggregates",
+			"format_cache",
 		)
 		def __init__(
 			self,
 			name = BLANK, sort = False, sortkey = None,
 			minsize = MIN_WIDTH, weight = WEIGHT, formatter = None,
-			fallback_type = None, dblclick_cmd = None,
+			batch_formatter = None, fallback_type = None, dblclick_cmd = None,
+			aggregates = (), format_cache = None,
 		):
 			self.name = name
 			self.sort = sort
@@ -178,33 +538,33 @@ class _Column():
 			self.minsize = minsize
 			self.weight = weight
 			self.formatter = formatter
+			self.batch_formatter = batch_formatter
 			self.fallback_type = fallback_type
 			self.dblclick_cmd = dblclick_cmd
+			self.aggregates = tuple(aggregates)
+			self.format_cache = format_cache
 
 	def __init__(self, mfl, col_id = None, **kwargs):
 		if not isinstance(mfl, MultiframeList):
 			raise TypeError("Bad Column parent, must be MultiframeList.")
 		self.mfl = mfl
 		self.assignedframe = None
-
-		self._cnfcmd = {
-			"name": self._cnf_name, "sort": self._cnf_sort,
-			"sortkey": lambda: False, "minsize": self._cnf_grid,
-			"weight": self._cnf_grid, "formatter": self.format,
-			"fallback_type": lambda: False, "dblclick_cmd": self._cnf_dblclick_cmd,
-		}
-
-		if col_id is None:
-			self.col_id = self._generate_col_id()
-		else:
-			if col_id in self.mfl.columns:
-				raise ValueError(f"Column id {col_id!r} is already in use!")
-			self.col_id = col_id
-
-		self.data = [BLANK for _ in range(self.mfl.length)]
 		self.sortstate = 2 # 0 if next sort will be descending, else 1
-
-		self.cnf = self.Config(**kwargs)
+		# Casefolded displayed elements in ascending order and the display
+		# indices of their rows, built for type-ahead search when needed
+		self._find_index = None
+		# In lazy formatting mode, a flag for each element of the listbox
+		# whether it is displayed formatted. None if not formatting lazily
+		# or the listbox contents are not tracked.
+		self._formatted = None
+
+		super().__init__(mfl.model, col_id, **kwargs)
+		self._cnfcmd.update({
+			"name": self._cnf_name, "sort": self._cnf_sort,
+			"minsize": self._cnf_grid, "weight": self._cnf_grid,
+			"dblclick_cmd": self._cnf_dblclick_cmd,
+		})
+		self.subscribe(self._on_data_change)
 
 	def __repr__(self):
 		return (
@@ -212,15 +572,6 @@ class _Column():
 			f"0x{id(self):016X}, col_id: {self.col_id}>"
 		)
 
-	def __len__(self):
-		return len(self.data)
-
-	def _generate_col_id(self):
-		curid = 0
-		while curid in self.mfl.columns:
-			curid += 1
-		return curid
-
 	def _cnf_dblclick_cmd(self):
 		if self.assignedframe is None:
 			return
@@ -258,84 +609,208 @@ class _Column():
 		else:
 			self.mfl.frames[self.assignedframe][3].configure(text = BLANK)
 
-	def config(self, **kw):
-		if not kw:
-			return {s: getattr(self.cnf, s) for s in self.cnf.__slots__}
-		for k, v in kw.items():
-			if not k in self.Config.__slots__:
-				raise ValueError(
-					f"Unkown configuration arg {k!r}, must be one of "
-					f"{', '.join(self.Config.__slots__)}."
-				)
-			setattr(self.cnf, k, v)
-			self._cnfcmd[k]()
-
-	def data_clear(self):
-		"""Clears self.data, refreshes interface, if assigned a frame."""
-		self.data.clear()
-		if self.assignedframe is not None:
-			self.mfl.frames[self.assignedframe][1].delete(0, tk.END)
-
-	def data_insert(self, elem, index=None):
+	def _get_listbox(self):
 		"""
-		Inserts elem to self.data at index and refreshes interface, if
-		assigned a frame. If index is not specified, elem will be appended
-		instead.
+		Returns the listbox the column should write its data into or None
+		if it is not assigned a frame or the MultiframeList is in virtual
+		mode or filtered, where the listboxes are filled by the
+		MultiframeList itself.
+		During a batch, None is returned as well and the column's frame
+		is marked for a redraw once the batch ends.
 		"""
-		if index is not None:
-			self.data.insert(index, elem)
-		else:
-			self.data.append(elem)
-			index = tk.END
-		if self.assignedframe is not None:
-			if self.cnf.formatter is not None:
-				self.mfl.frames[self.assignedframe][1].insert(index, self.cnf.formatter(elem))
+		if (
+			self.assignedframe is None or self.mfl.cnf.virtual or
+			self.table.view is not None
+		):
+			return None
+		if self.mfl._batch_depth > 0:
+			self.mfl._batch_dirty_frames.add(self.assignedframe)
+			return None
+		# Modifying a listbox' contents messes with its selection
+		self.mfl._painted_selection = None
+		return self.mfl.frames[self.assignedframe][1]
+
+	def _format_visible(self, first = None, last = None):
+		"""
+		In lazy formatting mode, formats the elements of the listbox that
+		are in view and not formatted yet. `first` and `last` should be the
+		fractions of the listbox contents in view as reported by it,
+		otherwise they are queried.
+		The selection and active cell are restored on the formatted rows.
+		"""
+		mfl = self.mfl
+		if mfl.cnf.virtual or self.table.view is not None:
+			# The listbox is filled by the MultiframeList now
+			self._formatted = None
+		flags = self._formatted
+		if flags is None or mfl._batch_depth > 0:
+			return
+		lb = mfl.frames[self.assignedframe][1]
+		if first is None:
+			first, last = lb.yview()
+		stop = min(len(flags), int(float(last) * len(flags)) + 1)
+		start = flags.find(0, int(float(first) * len(flags)), stop)
+		if start == -1:
+			return
+		ay = mfl.active_cell_y
+		restyle = False
+		while start != -1:
+			end = flags.find(1, start, stop)
+			end = stop if end == -1 else end
+			lb.delete(start, end - 1)
+			lb.insert(start, *self.format_elements(self.data[start:end]))
+			flags[start:end] = b"\x01" * (end - start)
+			# Modifying a listbox' contents messes with its selection
+			for rng in mfl.selection.ranges(start, end):
+				lb.selection_set(rng.start, rng.stop - 1)
+			if ay is not None and start <= ay < end:
+				restyle = True
+			start = flags.find(0, end, stop)
+		if restyle:
+			if mfl.active_cell_x == self.assignedframe:
+				lb.itemconfigure(ay, mfl._active_cell_style)
+			elif mfl.cnf.active_cell_span_row:
+				lb.itemconfigure(ay, mfl._active_row_style)
+
+	def _is_lazy(self):
+		"""
+		Returns whether the column's listbox should be formatted lazily.
+		"""
+		return self.mfl.cnf.lazy_format and self.has_formatter()
+
+	def _on_data_change(self, change, *args):
+		"""
+		Subscribed to the column's data, updates the listbox to reflect the
+		change if the column writes into one, see `ColumnModel.subscribe`.
+		In lazy formatting mode, elements are written unformatted and only
+		the ones in view are formatted afterwards.
+		"""
+		self._find_index = None
+		if change == "format":
+			self.format()
+			self.mfl._refresh_view()
+			return
+		lb = self._get_listbox()
+		if lb is None:
+			self._formatted = None
+			return
+		lazy = self._is_lazy()
+		flags = self._formatted if lazy else None
+		if change == "clear":
+			lb.delete(0, tk.END)
+			flags = None
+		elif change == "insert":
+			index, elems = args
+			lb.insert(
+				tk.END if index is None else index,
+				*(elems if lazy else self.format_elements(elems))
+			)
+			if flags is not None:
+				if index is None:
+					flags.extend(bytes(len(elems)))
+				else:
+					flags[index:index] = bytes(len(elems))
+		elif change == "delete":
+			from_, to = args
+			lb.delete(from_, to - 1)
+			if flags is not None:
+				del flags[from_:to]
+		elif change == "delete_many":
+			ranges, keep = args
+			if len(ranges) <= _MAX_RANGE_DELETES:
+				for rng in ranges:
+					lb.delete(rng.start, rng.stop - 1)
 			else:
-				self.mfl.frames[self.assignedframe][1].insert(index, elem)
-
-	def data_delete(self, from_, to = None):
-		"""
-		Removes the elements from `from_` to `to` (end-exclusive), or
-		just `from_` if `to` is not given. No effect if `to` <= `from_`.
-		Refreshes interface if assigned a frame.
-		"""
-		to = from_ + 1 if to is None else to
-		if to <= from_:
+				remaining = list(compress(lb.get(0, tk.END), keep))
+				lb.delete(0, tk.END)
+				lb.insert(tk.END, *remaining)
+			if flags is not None:
+				flags = bytearray(compress(flags, keep))
+		elif change == "update":
+			updates = args[0]
+			elems = list(updates.values())
+			for i, elem in zip(updates, elems if lazy else self.format_elements(elems)):
+				lb.delete(i)
+				lb.insert(i, elem)
+				if flags is not None:
+					flags[i] = 0
+		elif change == "set":
+			lb.delete(0, tk.END)
+			lb.insert(tk.END, *self.data)
+			flags = None
+		elif change == "permute":
+			# Reorder what is shown without running the formatter again
+			perm = args[0]
+			shown = lb.get(0, tk.END)
+			lb.delete(0, tk.END)
+			lb.insert(tk.END, *[shown[i] for i in perm])
+			if flags is not None:
+				flags = bytearray(map(flags.__getitem__, perm))
+		if not lazy:
+			self._formatted = None
 			return
-		self.data = self.data[:from_] + self.data[to:]
-		if self.assignedframe is not None:
-			self.mfl.frames[self.assignedframe][1].delete(from_, to - 1)
-
-	def data_set(self, newdata):
-		"""
-		Sets the column's data to the list specified, refreshes interface
-		if assigned a frame.
-		"""
-		if not isinstance(newdata, list):
-			raise TypeError("Data has to be a list!")
-		self.data = newdata
-		if self.assignedframe is not None:
-			self.mfl.frames[self.assignedframe][1].delete(0, tk.END)
-			self.mfl.frames[self.assignedframe][1].insert(tk.END, *self.data)
+		# Without knowing which elements are formatted, all have to be
+		# considered unformatted.
+		self._formatted = bytearray(len(self.data)) if flags is None else flags
+		self._format_visible()
+
+	def find_prefix(self, prefix):
+		"""
+		Returns the display index of the row whose displayed element is the
+		smallest one starting with `prefix`, compared casefolded, or None
+		if there is no such row. The sorted index this searches is built on
+		first use and dropped whenever the column's data, its formatter or
+		the displayed rows change.
+		"""
+		if self._find_index is None:
+			display = self.get_display(0, self.table.shown_length, self.table.view)
+			pairs = sorted((str(x).casefold(), i) for i, x in enumerate(display))
+			self._find_index = ([p[0] for p in pairs], [p[1] for p in pairs])
+		keys, rows = self._find_index
+		prefix = prefix.casefold()
+		i = bisect_left(keys, prefix)
+		if i < len(keys) and keys[i].startswith(prefix):
+			return rows[i]
+		return None
 
 	def format(self, exclusively = None):
 		"""
 		If interface frame is specified, runs all data through
-		`self.cnf.formatter` and displays result.
+		`self.cnf.batch_formatter` or `self.cnf.formatter` and displays
+		the result.
 		If exclusively is set (as an iterable), only specified indices
 		will be formatted.
+		In virtual mode or while the MultiframeList is filtered, this does
+		nothing as the displayed rows are always formatted. In lazy
+		formatting mode, the elements are only marked to be formatted once
+		they are scrolled into view, and those in view are formatted.
 		"""
-		if self.cnf.formatter is None or self.assignedframe is None:#
+		if not self.has_formatter():
+			self._formatted = None
+			return
+		lb = self._get_listbox()
+		if lb is None:
+			self._formatted = None
+			return
+		if self.mfl.cnf.lazy_format:
+			if exclusively is None or self._formatted is None:
+				self._formatted = bytearray(len(self.data))
+			else:
+				for i in exclusively:
+					self._formatted[i] = 0
+			self._format_visible()
 			return
+		self._formatted = None
 		if exclusively is None:
-			f_data = [self.cnf.formatter(i) for i in self.data]
-			self.mfl.frames[self.assignedframe][1].delete(0, tk.END)
-			self.mfl.frames[self.assignedframe][1].insert(tk.END, *f_data)
+			f_data = self.format_elements(self.data)
+			lb.delete(0, tk.END)
+			lb.insert(tk.END, *f_data)
 		else:
-			for i in exclusively:
-				tmp = self.data[i]
-				self.mfl.frames[self.assignedframe][1].delete(i)
-				self.mfl.frames[self.assignedframe][1].insert(i, self.cnf.formatter(tmp))
+			exclusively = list(exclusively)
+			f_data = self.format_elements([self.data[i] for i in exclusively])
+			for i, elem in zip(exclusively, f_data):
+				lb.delete(i)
+				lb.insert(i, elem)
 
 	def setdisplay(self, wanted_frame):
 		"""
@@ -349,6 +824,7 @@ class _Column():
 			# do to the widgets and tries to get them into the default state.
 			self.mfl._clear_frame(self.assignedframe)
 			self.assignedframe = wanted_frame
+			self._formatted = None
 			return
 
 		self.assignedframe = wanted_frame
@@ -371,11 +847,36 @@ class _Column():
 		self.set_sortstate(self.sortstate)
 		# NOTE: I don't think these two recurring lines warrant their own
 		# "setframetodata" method.
-		self.mfl.frames[self.assignedframe][1].delete(0, tk.END)
-		self.mfl.frames[self.assignedframe][1].insert(tk.END, *self.data)
-		for fnc in set(self._cnfcmd.values()):
+		lb = self._get_listbox()
+		if lb is not None:
+			lb.delete(0, tk.END)
+			lb.insert(tk.END, *self.data)
+		# Only the options concerning the display have to be applied, the
+		# data and everything derived from it stays as it is.
+		for fnc in (
+			self._cnf_name, self._cnf_sort, self._cnf_grid, self._cnf_dblclick_cmd,
+			self._cnf_formatter,
+		):
 			fnc()
 
+	def redraw(self):
+		"""
+		Refills the column's listbox with all of its elements, ran through
+		the formatter. In lazy formatting mode, only the ones in view are.
+		"""
+		lb = self._get_listbox()
+		if lb is None:
+			self._formatted = None
+			return
+		lb.delete(0, tk.END)
+		if self._is_lazy():
+			lb.insert(tk.END, *self.data)
+			self._formatted = bytearray(len(self.data))
+			self._format_visible()
+		else:
+			self._formatted = None
+			lb.insert(tk.END, *self.get_display(0, len(self.data)))
+
 	def set_sortstate(self, to):
 		"""
 		Sets the column's sortstate, also updating it on the UI if it is being
@@ -409,9 +910,14 @@ class MultiframeList(ttk.Frame):
 			the active cell's row as well.
 
 	The list broadcasts the Virtual event "<<MultiframeSelect>>" after the selection
-		is modified in any way.
+		is modified in any way. During a batch, at most one of these events is
+		generated once the batch ends.
 	The list broadcasts the Virtual event "<<MultiframeRightclick>>" whenever the right
 		click mouse button is released or the context menu button is pressed.
+	The list broadcasts the Virtual event "<<MultiframeStreamEnd>>" whenever a
+		stream started with `stream_rows` is exhausted.
+	The list broadcasts the Virtual event "<<MultiframeAggregates>>" when the
+		aggregates of any column changed, at most once per event loop iteration.
 	The list will reset the active selection when Escape is pressed.
 	"""
 
@@ -433,6 +939,11 @@ class MultiframeList(ttk.Frame):
 		"selectforeground": "#FFFFFF",
 	}
 
+	# Listbox options the cached listbox metrics are derived from
+	_LISTBOX_METRIC_OPTIONS = frozenset(
+		("font", "selectborderwidth", "borderwidth", "highlightthickness")
+	)
+
 	_DEFAULT_ITEMCONFIGURE = {
 		"background": "",
 		"foreground": "",
@@ -444,12 +955,16 @@ class MultiframeList(ttk.Frame):
 		__slots__ = (
 			"rightclickbtn", "click_key", "listboxheight", "reorderable",
 			"resizable", "selection_type", "active_cell_span_row", "active_cell_style",
-			"active_cell_row_style",
+			"active_cell_row_style", "virtual", "sort_async_threshold", "sort_executor",
+			"typeahead", "key_column", "instrument", "instrument_callback", "lazy_format",
 		)
 		def __init__(
 			self, rightclickbtn = "3", click_key = "space", listboxheight = 10,
 			reorderable = False, resizable = False, selection_type = SELECTION_TYPE.MULTIPLE,
 			active_cell_span_row = False, active_cell_style = None, active_cell_row_style = None,
+			virtual = False, sort_async_threshold = None, sort_executor = None,
+			typeahead = True, key_column = None, instrument = False,
+			instrument_callback = None, lazy_format = False,
 		):
 			self.rightclickbtn = rightclickbtn
 			self.click_key = click_key
@@ -462,6 +977,14 @@ class MultiframeList(ttk.Frame):
 				else active_cell_style
 			self.active_cell_row_style = {} if active_cell_row_style is None \
 				else active_cell_row_style
+			self.virtual = virtual
+			self.sort_async_threshold = sort_async_threshold
+			self.sort_executor = sort_executor
+			self.typeahead = typeahead
+			self.key_column = key_column
+			self.instrument = instrument
+			self.instrument_callback = instrument_callback
+			self.lazy_format = lazy_format
 
 	def __init__(self, master, inicolumns = None, **kwargs):
 		"""
@@ -499,12 +1022,70 @@ class MultiframeList(ttk.Frame):
 
 		active_cell_span_row <Bool>: Whether the selected active cell will apply a
 			per-item style across its entire row. False by default.
+
+		virtual <Bool>: Whether the MultiframeList should run in virtual mode.
+			In virtual mode, the listboxes only hold the rows currently in view
+			and are refilled whenever the view is scrolled, so Tk does not keep
+			a copy of every row. Formatters are always applied to displayed rows
+			in this mode. False by default.
+
+		sort_async_threshold <Int|None>: Amount of rows from which on the sort
+			permutation is computed in the background when a column header is
+			clicked. Meanwhile, the column's sort indicator shows `SORTSYM_BUSY`
+			and the MultiframeList stays usable; modifying its data cancels the
+			sort. None by default, which always sorts immediately.
+
+		sort_executor <concurrent.futures.Executor|None>: Executor background sorts
+			are submitted to. A process pool can be used if the sorted column's
+			elements and sortkey are picklable. If None, a thread of the
+			MultiframeList's own is used. None by default.
+
+		typeahead <Bool>: Whether typing while the MultiframeList has focus jumps
+			to the first row, in ascending order, of the active cell's column
+			whose displayed text starts with what was typed. Keys typed more than
+			`TYPEAHEAD_TIMEOUT` milliseconds apart start a new search.
+			True by default.
+
+		key_column <Hashable|None>: Id of the column whose elements uniquely
+			identify rows. Required for `upsert_rows`, `delete_by_keys` and
+			`get_row_by_key`, which find rows through a hash index of this
+			column. None by default.
+
+		instrument <Bool>: Whether to count and time the Tcl commands the
+			MultiframeList's widgets run, attributed to the public method or
+			event handler that caused them. See `get_tk_stats`. Adds overhead
+			to every Tcl command while enabled. False by default.
+
+		instrument_callback <Callable|None>: If instrumentation is enabled,
+			called after each instrumented method with its name and a dict
+			of `seconds` it took, `tk_calls` and `tk_seconds` made and spent
+			in Tk and `commands`, mapping Tcl command names to the amount of
+			times they were called. None by default.
+
+		lazy_format <Bool>: Whether formatters should only be applied to rows
+			once they are scrolled into view instead of to all rows at once,
+			which makes `format` and modifications cost a constant amount of
+			formatter calls. Rows are still inserted into the listboxes
+			unformatted and displayed formatted once in view, regardless of
+			whether `format` was called. Only has an effect outside of virtual
+			mode and while no filter is set. False by default.
 		"""
 		super().__init__(master, takefocus = True)
 
 		self.master = master
 		self.cnf = self.Config(**kwargs)
 
+		# Records Tk calls while instrumentation is enabled
+		self._tk_recorder = None
+		# Tk call statistics by operation, see `get_tk_stats`
+		self._tk_stats = {}
+
+		# Stores the columns, which provide data storage capability as well
+		# as some metadata, the length, the filter, the selected items and
+		# the last direct cell that was interacted with.
+		self.model = TableModel(self.cnf.key_column, self.cnf.selection_type)
+		self.model.subscribe(self._on_model_change)
+
 		self.bind("<Up>", lambda e: self._on_arrow_y(e, -1))
 		self.bind("<Down>", lambda e: self._on_arrow_y(e, 1))
 		self.bind("<Left>", lambda e: self._on_arrow_x(e, -1))
@@ -519,25 +1100,26 @@ class MultiframeList(ttk.Frame):
 		if ctxtmen_btn is not None:
 			self.bind(f"<KeyPress-{ctxtmen_btn}>", self._on_menu_button)
 		self.bind(f"<KeyPress-{self.cnf.click_key}>", self._on_click_key)
-		self.bind(f"<Escape>", lambda _: self._selection_clear(with_event = True))
+		self.bind(f"<Escape>", lambda _: self.model.selection_clear())
+		self.bind("<KeyPress>", self._on_typeahead_key)
 
 		self.ttk_style = ttk.Style()
 		self.bind("<<ThemeChanged>>", self._theme_update)
 
-		# Last direct cell that was interacted with
-		self.active_cell_x = None
-		self.active_cell_y = None
 		# Listbox-local coordinate the interaction was made at
 		self.coordx = None
 		self.coordy = None
-		# Selected items 
-		self.selection = set()
-		# --Stolen-- borrowed from tk, the first item a selection was started
-		# with, used for expanding it via shift-clicks/Up-Downs
-		self._selection_anchor = None
 		# The element last dragged over in a mouse dragging selection.
 		# Does not include the initially clicked element.
 		self._last_dragged_over_element = None
+		# Text typed for the current type-ahead search and when it was last
+		# typed into
+		self._typeahead_text = ""
+		self._typeahead_time = 0.0
+		# Modifier flags of key presses that are ignored by the type-ahead
+		self._shortcut_state = SHORTCUT_STATE.get(
+			self.tk.call("tk", "windowingsystem"), SHORTCUT_STATE["x11"]
+		)
 		# The last ButtonPress event for a click on a listbox.
 		# If None, no selection is being made.
 		self._last_click_event = None
@@ -562,27 +1144,102 @@ class MultiframeList(ttk.Frame):
 		self.reorder_highlight = ttk.Frame(
 			self.framecontainer, style = "MultiframeListReorderInd.TFrame"
 		)
+		# Ids of the scheduled <<MultiframeAggregates>> and <<MultiframeSelect>>
+		# events, if any
+		self._aggregates_after_id = None
+		self._select_after_id = None
+		# Row streams and ingest queues that have not ended yet
+		self._streams = set()
+		self._ingest_queues = set()
+
 		self.frames = [] # Each frame contains interface elements for display.
-		self.columns = {} # Columns will provide data storage capability as
-		# well as some metadata.
 
-		self.length = 0
+		# Index of the first row displayed in virtual mode
+		self._view_offset = 0
+		# Amount of rows that fit into the listboxes in virtual mode
+		self._view_rows = self.cnf.listboxheight
+		# Amount of rows currently placed into the listboxes in virtual mode
+		self._view_count = 0
+		# Tcl command the mouse wheel is routed to in virtual mode
+		self._virtual_yview_cmd = self.register(self._scrollallbar)
+
+		# Nesting depth of `batch` context managers
+		self._batch_depth = 0
+		# Frames whose listboxes have to be redrawn after a batch
+		self._batch_dirty_frames = set()
+		# Active cell and length at the start of the outermost batch
+		self._batch_active_cell = (None, None)
+		self._batch_length = 0
+		# Whether a <<MultiframeSelect>> event was deferred by a batch
+		self._batch_select_event = False
+		# Index to scroll to after a batch, if any
+		self._batch_see = None
+
+		# Entry height, border width and highlight thickness of listboxes,
+		# by their Tcl path name
+		self._listbox_metrics = {}
+
+		# Scroll positions last reported by each listbox, by frame index
+		self._scroll_reports = {}
+		# Scroll position all listboxes were last synchronized to
+		self._scroll_pos = None
+		# Frame index of the listbox the others will be synchronized to
+		self._scroll_leader = None
+		# Id of the scheduled synchronization, if any
+		self._scroll_after_id = None
+		# Whether listboxes are being synchronized right now
+		self._scroll_syncing = False
+
+		# Future, column and new sortstate of the running background sort
+		self._sort_job = None
+		self._sort_after_id = None
+		# Executor used for background sorts if none is configured
+		self._sort_executor = None
+
+		# Ranges of listbox indices currently displayed as selected.
+		# None if unknown, which is the case after listbox contents changed.
+		self._painted_selection = None
 
 		if inicolumns is not None:
 			self.add_frames(len(inicolumns))
 			# using self.add_columns would require iterating a dict relying
 			# on the fact it's sorted, i don't like that so we copypaste 2 lines
 			for index, colopt in enumerate(inicolumns):
-				new_col = _Column(self, **colopt)
+				new_col = self.model.add_column(factory = self._create_column, **colopt)
 				new_col.setdisplay(index)
-				self.columns[new_col.col_id] = new_col
 
 		self.scrollbar.pack(fill = tk.Y, expand = 0, side = tk.RIGHT)
 		self.framecontainer.pack(expand = 1, fill = tk.BOTH, side = tk.RIGHT)
 		self._listboxheight_hack.pack(expand = 0, fill = tk.Y, side = tk.RIGHT)
 
+		if self.cnf.instrument:
+			self._cnf_instrument(False)
+
+	# The following are stored by the model
+
+	@property
+	def active_cell_x(self):
+		return self.model.active_cell_x
+
+	@property
+	def active_cell_y(self):
+		return self.model.active_cell_y
+
+	@property
+	def columns(self):
+		return self.model.columns
+
+	@property
+	def length(self):
+		return self.model.length
+
+	@property
+	def selection(self):
+		return self.model.selection
+
 	#====USER METHODS====
 
+	@_instrumented
 	def add_columns(self, *coldicts):
 		"""
 		Takes any amount of dicts, then adds columns where the column
@@ -590,10 +1247,10 @@ class MultiframeList(ttk.Frame):
 		multiframe_list._Column class for a list of acceptable kwargs.
 		"""
 		for coldict in coldicts:
-			new_col = _Column(self, **coldict)
 			# Columns will give themselves a proper id
-			self.columns[new_col.col_id] = new_col
+			self.model.add_column(factory = self._create_column, **coldict)
 
+	@_instrumented
 	def add_frames(self, amount):
 		"""
 		Adds amount of frames, display slots in a way, fills their listboxes
@@ -637,15 +1294,19 @@ class MultiframeList(ttk.Frame):
 				return self._on_listbox_mouse_press(event, rcb, curindex)
 			def _rcb_release_handler(event, rcb = rcb, curindex = curindex):
 				return self._on_listbox_mouse_release(event, rcb, curindex)
+			def _yscroll_handler(first, last, curindex = curindex):
+				return self._on_listbox_yscroll(curindex, first, last)
 			new_frame[1].bind("<Button-1>", _m1_press_handler)
 			new_frame[1].bind("<ButtonRelease-1>", _m1_release_handler)
 			new_frame[1].bind("<Motion>", _motion_handler)
 			new_frame[1].bind(f"<Button-{rcb}>", _rcb_press_handler)
 			new_frame[1].bind(f"<ButtonRelease-{rcb}>", _rcb_release_handler)
-			self.tk.eval(SCROLLCOMMAND.format(w = new_frame[1]._w))
-			new_frame[1].configure(
+			new_frame[1].bind("<Configure>", self._on_listbox_configure)
+			self._bind_scroll(new_frame[1])
+			self._configure_listbox(
+				new_frame[1],
 				**self._get_listbox_conf(new_frame[1]),
-				yscrollcommand = self._scrollalllistbox
+				yscrollcommand = _yscroll_handler
 			)
 			self._clear_frame(curindex)
 
@@ -661,9 +1322,11 @@ class MultiframeList(ttk.Frame):
 			self._listboxheight_hack.configure(height = new_frame[1].winfo_reqheight())
 
 		self.framecontainer.event_generate("<Configure>")
+		self._refresh_view()
 		self._redraw_active_cell()
 		self._redraw_selection()
 
+	@_instrumented
 	def assign_column(self, col_id, req_frame):
 		"""
 		Sets display of a column given by its column id to req_frame.
@@ -678,16 +1341,44 @@ class MultiframeList(ttk.Frame):
 						f"Frame {req_frame} is already in use by column {col.col_id!r}"
 					)
 		self._get_col_by_id(col_id).setdisplay(req_frame)
+		self._refresh_view()
 		self._redraw_active_cell()
 		self._redraw_selection()
 
+	@contextmanager
+	def batch(self):
+		"""
+		Context manager that suspends all listbox updates, redraws of the
+		selection and active cell as well as <<MultiframeSelect>> events
+		until it is exited. Then, a single consolidated refresh is performed
+		and at most one <<MultiframeSelect>> event is generated.
+		Columns whose data was modified during the batch are redrawn with
+		their formatter applied. Batches can be nested, only the outermost
+		one will refresh the MultiframeList.
+
+		with mfl.batch():
+			mfl.set_column("price", prices)
+			mfl.set_cell("stock", 3, 0)
+			mfl.format()
+		"""
+		if self._batch_depth == 0:
+			self._batch_active_cell = (self.active_cell_x, self.active_cell_y)
+			self._batch_length = self.model.shown_length
+		self._batch_depth += 1
+		try:
+			yield self
+		finally:
+			self._batch_depth -= 1
+			if self._batch_depth == 0:
+				self._batch_flush()
+
+	@_instrumented
 	def clear(self):
 		"""Clears the MultiframeList."""
-		# self._set_active_cell(None, None)
-		self._set_length(0)
-		for col in self.columns.values():
-			col.data_clear()
+		self._cancel_sort()
+		self.model.clear()
 
+	@_instrumented
 	def config(self, **kwargs):
 		"""
 		Change configuration options of the MultiframeList/underlying frame.
@@ -710,6 +1401,7 @@ class MultiframeList(ttk.Frame):
 					cnf_method(old_value)
 		super().configure(**kwargs)
 
+	@_instrumented
 	def config_column(self, col_id, **cnf):
 		"""
 		Update the configuration of the column referenced by col_id
@@ -718,6 +1410,30 @@ class MultiframeList(ttk.Frame):
 		col = self._get_col_by_id(col_id)
 		col.config(**cnf)
 
+	def destroy(self):
+		"""
+		Cancels a running background sort and shuts down the executor
+		created for them, if any, cancels all row streams, stops all ingest
+		queues and unschedules pending callbacks, then destroys the
+		MultiframeList.
+		"""
+		self._cancel_sort()
+		if self._sort_executor is not None:
+			self._sort_executor.shutdown(wait = False)
+			self._sort_executor = None
+		for stream in tuple(self._streams):
+			stream.cancel()
+		for ingest_queue in tuple(self._ingest_queues):
+			ingest_queue._stop()
+		for after_id in (self._aggregates_after_id, self._select_after_id, self._scroll_after_id):
+			if after_id is not None:
+				self.after_cancel(after_id)
+		self._aggregates_after_id = None
+		self._select_after_id = None
+		self._scroll_after_id = None
+		super().destroy()
+
+	@_instrumented
 	def format(self, targetcols = None, indices = None):
 		"""
 		Format the entire list based on the formatter functions in columns.
@@ -739,15 +1455,21 @@ class MultiframeList(ttk.Frame):
 		else:
 			for col_id in targetcols:
 				self._get_col_by_id(col_id).format(exclusively = indices)
+		self._refresh_view()
 		self._redraw_active_cell()
 		self._redraw_selection()
 
-	def get_active_cell(self):
+	def get_active_cell(self, source = False):
 		"""
 		Returns the coordinates of the currently selected active cell as a
 		tuple of length 2; (0, 0) starting in the top left corner;
 		The two values may also be None.
+		While a filter is set, the y coordinate is an index into the
+		displayed rows, unless `source` is True, in which case it is
+		translated to the row's index in the data.
 		"""
+		if source and self.active_cell_y is not None:
+			return (self.active_cell_x, self.model.to_source(self.active_cell_y))
 		return (self.active_cell_x, self.active_cell_y)
 
 	def get_columns(self):
@@ -769,28 +1491,75 @@ class MultiframeList(ttk.Frame):
 		"""Returns length of the MultiframeList."""
 		return self.length
 
-	def get_selection(self):
+	def get_selection(self, source = False):
 		"""
 		Returns the selection of the MultiframeList.
 		If in SINGLE selection mode, returns only the selected index
-		or `None`, otherwise passes through the selection set.
+		or `None`, otherwise passes through the selection set. It is not a
+		builtin `set`, but supports the same read-only interface.
 		This mainly serves as convenience for the SINGLE selection
 		type, it is preferrable to check for selection emptiness
 		with simply `if mfl.selection:`
-		"""
+		While a filter is set, the selection consists of indices into the
+		displayed rows. If `source` is True, they are translated to the
+		rows' indices in the data and a new set is returned, which can be
+		passed to `remove_rows`, for example.
+		"""
+		selection = self.selection
+		if source and self.model.view is not None:
+			# The view is ascending, so the translated indices are as well
+			view = self.model.view
+			selection = _IntervalSet.from_sorted(view[i] for i in selection)
 		if self.cnf.selection_type is SELECTION_TYPE.SINGLE:
-			return next(iter(self.selection)) if self.selection else None
+			return next(iter(selection)) if selection else None
 		else:
-			return self.selection
+			return selection
+
+	def get_shown_length(self):
+		"""
+		Returns the amount of rows displayed, which is the length of the
+		MultiframeList unless a filter is set.
+		"""
+		return self.model.shown_length
+
+	def get_tk_stats(self):
+		"""
+		Returns a dict of the Tk calls recorded while instrumentation was
+		enabled through the `instrument` option. It maps the names of the
+		MultiframeList's methods and event handlers to dicts of:
+			`calls`: Amount of times the method was called.
+			`seconds`: Total time spent in the method.
+			`tk_calls`: Total amount of Tcl commands it ran.
+			`tk_seconds`: Total time spent in those Tcl commands.
+			`commands`: Dict mapping Tcl command names to the amount of times
+				they were run. For widget commands, the subcommand is used,
+				such as `insert` or `itemconfigure`.
+		Calls made by a method called by another method count towards the
+		outer one. Tcl commands run outside of any method, such as by
+		scheduled callbacks, are found under `INSTRUMENT_OTHER`.
+		The returned dict is a copy.
+		"""
+		return {
+			name: {**entry, "commands": entry["commands"].copy()}
+			for name, entry in self._tk_stats.items()
+		}
 
+	@_instrumented
 	def remove_column(self, col_id):
 		"""
 		Deletes the column addressed by col_id, safely unregistering all
 		related elements.
+		Raises a ValueError if the filter checks the column's elements.
 		"""
-		self.assign_column(col_id, None)
-		self.columns.pop(col_id)
+		col = self._get_col_by_id(col_id)
+		self.model.remove_column(col_id)
+		if col.assignedframe is not None:
+			col.setdisplay(None)
+			self._refresh_view()
+			self._redraw_active_cell()
+			self._redraw_selection()
 
+	@_instrumented
 	def remove_frames(self, amount):
 		"""
 		Safely remove the specified amount of frames from the
@@ -802,16 +1571,25 @@ class MultiframeList(ttk.Frame):
 				col.setdisplay(None)
 		for i in to_purge:
 			if self.active_cell_x is not None and self.active_cell_x >= i:
-				self._set_active_cell(i - 1, self.active_cell_y)
+				self.model.set_active_cell(i - 1, self.active_cell_y)
 			self.framecontainer.grid_columnconfigure(i, weight = 0, minsize = 0)
 			# update in conjunction with the <Configure> event is for some
 			# reason necessary so the grid manager actually releases
 			# the space occupied by the deleted frames and redistributes it.
+			self._listbox_metrics.pop(self.frames[i][1]._w, None)
 			self.frames[i][0].destroy()
 			self.framecontainer.update()
 			self.frames.pop(i)
+			self._scroll_reports.pop(i, None)
 		self.framecontainer.event_generate("<Configure>")
 
+	def reset_tk_stats(self):
+		"""
+		Discards all Tk call statistics recorded so far.
+		"""
+		self._tk_stats.clear()
+
+	@_instrumented
 	def set_active_cell(self, x, y):
 		"""
 		Sets the active cell to the specified x and y coordinates.
@@ -823,14 +1601,36 @@ class MultiframeList(ttk.Frame):
 			raise TypeError("Invalid type for x and/or y coordinate.")
 		if isinstance(x, int) and x >= len(self.frames):
 			raise ValueError("New x selection out of range.")
-		if isinstance(y, int) and y >= self.length:
-			raise ValueError("New y selection exceeds length.")
-		self._set_active_cell(x, y)
+		self.model.set_active_cell(x, y)
 		if y is not None:
-			for i in self.frames:
-				i[1].see(self.active_cell_y)
+			self._see(self.active_cell_y)
 		self._redraw_selection()
 
+	@_instrumented
+	def set_filter(self, filter_):
+		"""
+		Only displays the rows `filter_` lets through, while all data stays
+		in the MultiframeList. `filter_` may be:
+			- A callable, which is called with a dict mapping each column's
+				id to the row's element in it and should return whether the
+				row is displayed.
+			- A dict mapping column ids to callables, which are called with
+				the row's element in that column. A row is displayed if all
+				of them return a truthy value.
+			- None, which removes the filter.
+		The filter is reapplied whenever the data is modified. Setting it
+		clears the selection and scrolls to the top.
+
+		While a filter is set, all indices the user interface deals with
+		refer to the displayed rows; these are the selection, the active
+		cell, and the indices given to `set_selection` and `set_active_cell`.
+		`get_selection` and `get_active_cell` can translate them to indices
+		into the data, which all data modification and retrieval methods
+		keep working with.
+		"""
+		self.model.set_filter(filter_)
+
+	@_instrumented
 	def set_selection(self, new_selection):
 		"""
 		Sets the listbox' selection to be made out of only these
@@ -842,15 +1642,16 @@ class MultiframeList(ttk.Frame):
 		Will set the view to look at the last index.
 		"""
 		# Wasteful iteration just to look at the last idx but whatever
-		new_selection = tuple(new_selection)
-		self._selection_set(new_selection)
-		self.event_generate("<<MultiframeSelect>>", when = "tail")
+		if not isinstance(new_selection, range):
+			new_selection = tuple(new_selection)
+		self.model.selection_set(new_selection)
+		self._selection_changed()
 		if new_selection:
-			for i in self.frames:
-				i[1].see(new_selection[-1])
+			self._see(new_selection[-1])
 
 	#==DATA MODIFICATION==
 
+	@_instrumented
 	def insert_row(self, data, insindex = None, reset_sortstate = True):
 		"""
 		Inserts a row of data into the MultiframeList.
@@ -862,13 +1663,86 @@ class MultiframeList(ttk.Frame):
 			at the given position.
 			The function takes an optional reset_sortstate parameter to control whether
 		or not to reset the sortstates on all columns. (Default True)
+		To insert many rows, use `insert_rows`, which is considerably faster
+		than calling this method repeatedly.
 		"""
-		if reset_sortstate:
-			self._reset_sortstate()
-		for col in self.columns.values():
-			col.data_insert(data.get(col.col_id, BLANK), insindex)
-		self._set_length(self.length + 1)
+		self.insert_rows((data,), insindex, reset_sortstate)
+
+	@_instrumented
+	def insert_rows(self, rows, insindex = None, reset_sortstate = True):
+		"""
+		Inserts multiple rows of data into the MultiframeList at once.
+
+		Rows can either be supplied as an iterable of dicts shaped like the
+		ones `insert_row` takes, or as a single dict where a key is a
+		column's id and the corresponding value is a list of elements that
+		should be inserted into the column. In the latter case, a ValueError
+		will be raised if the lists are of differing lengths.
+		If insindex is not specified, data will be appended, else inserted
+			at the given position.
+		The function takes an optional reset_sortstate parameter to control whether
+		or not to reset the sortstates on all columns. (Default True)
+		"""
+		self._insert_rows(rows, insindex, reset_sortstate, True)
+
+	def stream_rows(self, rows, chunk_size = 500, budget_ms = 20, callback = None):
+		"""
+		Appends rows pulled from the iterable `rows` to the MultiframeList
+		over the course of multiple tkinter event loop iterations, so the UI
+		stays responsive while the iterable is being consumed. This is meant
+		for generators that are slow or very long, such as database cursors.
+		Rows have to be supplied as dicts in the shape `insert_row` takes.
+
+		At most `chunk_size` rows are appended at once, and pulling rows for
+		them will stop early once `budget_ms` milliseconds have passed.
+		Every appended chunk resets the sortstates of all columns, as the
+		list is not sorted anymore. The selection is kept.
+		Once the iterable is exhausted, a <<MultiframeStreamEnd>> event is
+		generated and the optional `callback` is called with the stream.
+
+		Returns a stream handle, whose `cancel` method stops the stream and
+		whose `inserted` attribute is the amount of rows appended so far.
+		The stream is cancelled when the MultiframeList is destroyed.
+		Raises a ValueError if `chunk_size` is smaller than 1.
+		"""
+		if chunk_size < 1:
+			raise ValueError("chunk_size must be at least 1.")
+		return _RowStream(self, rows, chunk_size, budget_ms, callback)
+
+	def ingest_queue(self, maxsize = 10000, interval_ms = 50, budget_ms = 20):
+		"""
+		Returns a thread-safe handle that other threads can queue row
+		insertions, cell modifications and row removals into. The handle
+		holds at most `maxsize` modifications; they are applied in order
+		every `interval_ms` milliseconds by the thread running the tkinter
+		event loop, for at most `budget_ms` milliseconds at a time.
+		The handle's `stats` method reports its queue depth and the time
+		modifications spend queued. See `multiframe_list._IngestQueue`.
+		When the MultiframeList is destroyed, the handle is closed and
+		modifications still queued are dropped.
+		Raises a ValueError if `maxsize` is smaller than 1.
+		"""
+		if maxsize < 1:
+			raise ValueError("maxsize must be at least 1.")
+		return _IngestQueue(self, maxsize, interval_ms, budget_ms)
+
+	@_instrumented
+	def delete_by_keys(self, keys):
+		"""
+		Removes the rows whose element in the key column is in the
+		iterable `keys`, see `remove_rows`.
+		Raises a KeyError if there is no row for any of the keys, in which
+		case no rows are removed.
+		"""
+		index = self._get_key_column().get_key_index()
+		try:
+			rows = {index[key] for key in keys}
+		except KeyError as e:
+			raise KeyError(f"No row with key {e.args[0]!r}.") from None
+		if rows:
+			self.remove_rows(rows)
 
+	@_instrumented
 	def remove_rows(self, what, to = None):
 		"""
 		If `what` is an int, deletes the rows from `what` to `to`
@@ -880,28 +1754,53 @@ class MultiframeList(ttk.Frame):
 		Properly sets the length and will clear the selection
 		Raises an IndexError if any index should be out of the list's range. 
 		"""
-		if isinstance(what, int):
-			to = what + 1 if to is None else to
-			if what < 0 or what > (self.length - 1):
-				raise IndexError(f"`from` index {what} out of range.")
-			if to < 0 or to > self.length:
-				raise IndexError(f"`to` index {what} out of range.")
-			to_delete = [range(what, to)]
-		else:
-			# Must be reversed to delete entries starting from the back,
-			# otherwise deletion of selection blocks will affect others
-			to_delete = sorted(what, reverse = True)
-			if to_delete and to_delete[0] > self.length - 1:
-				raise IndexError(f"Inaccessible deletion index: {to_delete[0]}")
-			if to_delete and to_delete[-1] < 0:
-				raise IndexError(f"Inaccessible deletion index: {to_delete[-1]}")
-			to_delete = _find_consecutive_sequences(to_delete)
-		self._set_length(self.length - sum(len(rng) for rng in to_delete))
-		for rng in to_delete:
-			for col in self.columns.values():
-				col.data_delete(rng.start, rng.stop)
-		self._redraw_active_cell()
+		self._cancel_sort()
+		self.model.remove_rows(what, to)
 
+	@_instrumented
+	def upsert_rows(self, rows, reset_sortstate = True):
+		"""
+		Takes an iterable of dicts shaped like the ones `insert_row` takes,
+		which all have to contain the key column's id. Rows whose key
+		already is in the MultiframeList have their elements in the columns
+		present in the dict replaced, the other rows are appended.
+		Unlike `set_data`, this keeps the selection and scroll position,
+		the selection only losing rows the filter hides now.
+		The function takes an optional reset_sortstate parameter to control whether
+		or not to reset the sortstates on all columns. (Default True)
+		Raises a ValueError if a row does not contain the key column's id
+		or the key column's elements are not unique.
+		"""
+		key_col = self._get_key_column()
+		key_id = key_col.col_id
+		index = key_col.get_key_index()
+		updates = {col_id: {} for col_id in self.columns if col_id != key_id}
+		new_rows = []
+		new_keys = {}
+		for row in rows:
+			if key_id not in row:
+				raise ValueError(f"Row {row!r} has no element for key column {key_id!r}.")
+			key = row[key_id]
+			idx = index.get(key)
+			if idx is not None:
+				for col_id, elem in row.items():
+					if col_id in updates:
+						updates[col_id][idx] = elem
+			elif key in new_keys:
+				new_rows[new_keys[key]].update(row)
+			else:
+				new_keys[key] = len(new_rows)
+				new_rows.append(dict(row))
+
+		self._cancel_sort()
+		if reset_sortstate:
+			self._reset_sortstate()
+		if any(updates.values()):
+			self.model.update_cells(updates, clear_selection = False)
+		if new_rows:
+			self._insert_rows(new_rows, None, False, False)
+
+	@_instrumented
 	def set_data(self, data, reset_sortstate = True):
 		"""
 		Sets the data of the MultiframeList, clearing everything beforehand.
@@ -916,18 +1815,39 @@ class MultiframeList(ttk.Frame):
 		self.clear()
 		if not data:
 			return
-		ln = len(data[next(iter(data))])
-		if any(len(d) != ln for d in data.values()):
-			raise ValueError("Differing lengths in supplied column data.")
 		if reset_sortstate:
 			self._reset_sortstate()
-		for col in self.columns.values():
-			if col.col_id in data:
-				col.data_set(data[col.col_id])
-			else:
-				col.data_set([BLANK for _ in range(ln)])
-		self._set_length(ln)
-
+		self.model.set_data(data)
+
+	@_instrumented
+	def update_data(self, data, reset_sortstate = True):
+		"""
+		Sets the data of the MultiframeList like `set_data` does, but only
+		applies the differences to the current data, so unchanged rows cost
+		no listbox updates.
+		If a key column is configured and `data` contains it, rows are
+		matched by their key and may be inserted, removed or reordered.
+		Otherwise, rows are matched by their position and rows are only
+		added or removed at the end.
+		Rows that are kept stay selected and the view stays on the row
+		that was on top, as far as they still are displayed.
+		Raises a ValueError if rows are matched by their key and the keys
+		in `data` are not unique.
+		The function takes an optional reset_sortstate parameter to control whether
+		or not to reset the sortstates on all columns. (Default True)
+		"""
+		self._cancel_sort()
+		if reset_sortstate:
+			self._reset_sortstate()
+		top = self._get_top_row()
+		new_index = self.model.update_data(data)
+		# Stay on the row that was on top, as far as it still is displayed
+		top = None if top is None else new_index(top)
+		top = None if top is None else self.model.to_shown(top)
+		if top is not None:
+			self._scroll_restore(top if self.cnf.virtual else top / self.model.shown_length)
+
+	@_instrumented
 	def set_cell(self, col_to_mod, y, data, reset_sortstate = True):
 		"""
 		Sets the cell in col_to_mod at y to data.
@@ -935,14 +1855,15 @@ class MultiframeList(ttk.Frame):
 		The function takes an optional reset_sortstate parameter to control whether
 		or not to reset the sortstates on all columns. (Default True)
 		"""
-		if reset_sortstate:
-			self._reset_sortstate()
 		col = self._get_col_by_id(col_to_mod)
 		if y > (self.length - 1):
 			raise IndexError("Cell index does not exist.")
-		col.data_delete(y)
-		col.data_insert(data, y)
+		self._cancel_sort()
+		if reset_sortstate:
+			self._reset_sortstate()
+		self.model.update_cells({col.col_id: {y: data}})
 
+	@_instrumented
 	def set_column(self, col_to_mod, data, reset_sortstate = True):
 		"""
 		Sets column specified by col_to_mod to data.
@@ -950,21 +1871,10 @@ class MultiframeList(ttk.Frame):
 		The function takes an optional reset_sortstate parameter to control whether		
 		or not to reset the sortstates on all columns. (Default True)
 		"""
+		self._cancel_sort()
 		if reset_sortstate:
 			self._reset_sortstate()
-		targetcol = self._get_col_by_id(col_to_mod)
-		datalen = len(data)
-		if len(self.columns) == 1:
-			targetcol.data_set(data)
-			self._set_length(datalen)
-		else:
-			for col in self.columns.values():
-				if len(col.data) != datalen:
-					raise ValueError(
-						"Length of supplied column data is different from length of " \
-						"column {col.col_id!r}."
-					)
-			targetcol.data_set(data)
+		self.model.set_column(col_to_mod, data)
 
 	#==DATA RETRIEVAL==
 
@@ -990,17 +1900,35 @@ class MultiframeList(ttk.Frame):
 		column "name_col" would be ["egg", "foo", "bar"], "rating_col"
 		["2", "3", "0"] and "comment_col" ["", "Comment", ""].
 		"""
-		if start == ALL:
-			start = 0
-			end = self.length
-		if end == END:
-			end = self.length
-		if end is None:
-			end = start + 1
-		col_id_map = {col_id: i for i, col_id in enumerate(self.columns.keys())}
-		r_data = [[col.data[idx] for col in self.columns.values()] for idx in range(start, end)]
-		# Performance location: out the window, on the sidewalk
-		return r_data, col_id_map
+		return self.model.get_rows(start, end)
+
+	def get_row_by_key(self, key):
+		"""
+		Returns the row whose element in the key column is `key` as a
+		dict mapping column ids to the row's elements.
+		Raises a KeyError if there is no such row.
+		"""
+		return self.model.get_row_by_key(key)
+
+	def get_aggregates(self, col_id = None):
+		"""
+		Returns a dict mapping the names of the aggregates the column
+		specified by col_id keeps track of to their current values.
+		If col_id is not given, returns a dict mapping the ids of all
+		columns with aggregates to such dicts.
+		"""
+		return self.model.get_aggregates(col_id)
+
+	def get_format_cache_stats(self, col_id = None):
+		"""
+		Returns a dict of the `hits` and `misses` of the format cache of the
+		column specified by col_id, the amount of results it holds as `size`
+		and the amount it may hold as `maxsize`, or None if the column has
+		no format cache.
+		If col_id is not given, returns a dict mapping the ids of all
+		columns with a format cache to such dicts.
+		"""
+		return self.model.get_format_cache_stats(col_id)
 
 	def get_column(self, col_id):
 		"""Returns the data of the column with col_id as a list."""
@@ -1009,11 +1937,11 @@ class MultiframeList(ttk.Frame):
 
 	def get_cell(self, col_id, y):
 		"""Returns element y of the column specified by col_id."""
-		col = self._get_col_by_id(col_id)
-		return col.data[y]
+		return self.model.get_cell(col_id, y)
 
 	#====SORT METHOD====
 
+	@_instrumented
 	def sort(self, _, call_col):
 		"""
 		Sort the list, modifying all column's data.
@@ -1022,41 +1950,19 @@ class MultiframeList(ttk.Frame):
 		taking an event placeholder (which is ignored), followed by the
 		calling column where id, sortstate and - if needed - the
 		fallback type are read from.
+		The selection and active cell move along with their rows.
 		"""
-		caller_id = call_col.col_id
-		scroll = self._scroll_get()
-
+		self._cancel_sort()
 		new_sortstate = abs(int(call_col.sortstate) - 1)
-		rev = bool(new_sortstate)
-		call_col.set_sortstate(new_sortstate)
-		for col in self.columns.values(): # reset sortstate of other columns
-			if col.col_id != caller_id:
-				col.set_sortstate(2)
-
-		tmpdat, colidmap = self.get_rows(ALL)
-		datacol_index = colidmap[caller_id]
-		keyfunc_internal = itemgetter(datacol_index)
-		if call_col.cnf.sortkey is not None:
-			keyfunc = lambda e: call_col.cnf.sortkey(keyfunc_internal(e))
-		else:
-			keyfunc = keyfunc_internal
-
-		try:
-			tmpdat = sorted(tmpdat, key = keyfunc, reverse = rev)
-		except TypeError:
-			fb_type = call_col.cnf.fallback_type
-			if fb_type is None:
-				raise
-			for i, _ in enumerate(tmpdat):
-				tmpdat[i][datacol_index] = fb_type(tmpdat[i][datacol_index])
-			tmpdat = sorted(tmpdat, key = keyfunc, reverse = rev)
-		newdat = {
-			col_id: [r[idx] for r in tmpdat]
-			for col_id, idx in colidmap.items()
-		}
-		self.set_data(newdat, reset_sortstate = False)
-		self.format()
-		self._scroll_restore(scroll)
+		threshold = self.cnf.sort_async_threshold
+		if (
+			threshold is not None and self.length >= threshold and
+			call_col.sorted_reverse is None
+		):
+			self._sort_async(call_col, new_sortstate)
+			return
+		perm = call_col.get_sort_permutation(bool(new_sortstate))
+		self._apply_sort(call_col, new_sortstate, perm)
 
 	#====INTERNAL METHODS - cnf====
 
@@ -1066,7 +1972,7 @@ class MultiframeList(ttk.Frame):
 		config method.
 		"""
 		for frame in self.frames:
-			frame[1].configure(height = self.cnf.listboxheight)
+			self._configure_listbox(frame[1], height = self.cnf.listboxheight)
 		if self.frames:
 			self._listboxheight_hack.configure(height = self.frames[0][1].winfo_reqheight())
 
@@ -1086,7 +1992,8 @@ class MultiframeList(ttk.Frame):
 		Callback for when the selection type is changed via the config
 		method.
 		"""
-		self._selection_clear()
+		self.model.selection_type = self.cnf.selection_type
+		self.model.selection_clear()
 
 	def _cnf_active_cell_span_row(self, old):
 		"""
@@ -1096,12 +2003,154 @@ class MultiframeList(ttk.Frame):
 		# NOTE: Extremely hacky but works so whatever
 		cur = self.cnf.active_cell_span_row
 		self.cnf.active_cell_span_row = old
-		self._undraw_active_cell()
+		self._undraw_active_cell(self.active_cell_x, self.active_cell_y)
 		self.cnf.active_cell_span_row = cur
 		self._redraw_active_cell()
 
+	def _cnf_virtual(self, old):
+		"""
+		Callback for when virtual mode is toggled via the config method.
+		Reroutes the mouse wheel bindings and refills all listboxes.
+		"""
+		if old == self.cnf.virtual:
+			return
+		for frame in self.frames:
+			self._bind_scroll(frame[1])
+		if self.cnf.virtual:
+			self._view_offset = int(self.frames[0][1].yview()[0] * self.model.shown_length) \
+				if self.frames else 0
+			if self.frames and self.frames[0][1].winfo_ismapped():
+				self._view_rows = self._measure_view_rows(
+					self.frames[0][1], self.frames[0][1].winfo_height()
+				)
+			self._refresh_view()
+			return
+		offset = self._view_offset
+		if self.model.view is not None:
+			self._refresh_view()
+		else:
+			for col in self.columns.values():
+				col.redraw()
+			self._fill_empty_frames()
+			self._redraw_active_cell()
+			self._redraw_selection()
+		if self.model.shown_length > 0:
+			self._scrollalllistbox(offset / self.model.shown_length, 1.0)
+
+	def _cnf_lazy_format(self, old):
+		"""
+		Callback for when lazy formatting is toggled via the config method.
+		Formats all rows, or the ones in view in lazy formatting mode.
+		"""
+		if bool(old) != bool(self.cnf.lazy_format):
+			self.format()
+
+	def _cnf_key_column(self, _):
+		self.model.key_column = self.cnf.key_column
+
+	def _cnf_instrument(self, old):
+		"""
+		Callback for when instrumentation is toggled via the config method.
+		Puts a call recorder in place of the Tk application object of the
+		MultiframeList and all its widgets or restores the original one.
+		Widgets created later on take it over from their master.
+		"""
+		if bool(old) == bool(self.cnf.instrument):
+			return
+		if self.cnf.instrument:
+			self._tk_recorder = _TkCallRecorder(self.tk, self._tk_stats)
+			self._set_tkapp(self, self._tk_recorder)
+		else:
+			self._set_tkapp(self, self._tk_recorder.tkapp)
+			self._tk_recorder = None
+
 	#====INTERNAL METHODS====
 
+	def _aggregates_changed(self):
+		"""
+		Schedules a <<MultiframeAggregates>> event, unless one is already.
+		"""
+		if self._aggregates_after_id is None:
+			self._aggregates_after_id = self.after_idle(self._generate_aggregates_event)
+
+	def _apply_sort(self, call_col, new_sortstate, perm):
+		"""
+		Sets the sortstates for a sort by `call_col` and applies the sort
+		permutation `perm` to all columns, which may be None if the data
+		is sorted already.
+		"""
+		scroll = self._scroll_get()
+		rev = bool(new_sortstate)
+		call_col.set_sortstate(new_sortstate)
+		for col in self.columns.values(): # reset sortstate of other columns
+			if col is not call_col:
+				col.set_sortstate(2)
+
+		# Only a permutation of the row indices is sorted, which is
+		# then applied to every column.
+		if perm is not None:
+			self.model.permute(perm, call_col, rev)
+		self._scroll_restore(scroll)
+
+	@_instrumented
+	def _batch_flush(self):
+		"""
+		Performs all listbox updates, redraws and events that were deferred
+		by a batch that just ended.
+		"""
+		dirty = self._batch_dirty_frames
+		self._batch_dirty_frames = set()
+		if dirty:
+			self._painted_selection = None
+		if self.cnf.virtual or self.model.view is not None:
+			self._refresh_view()
+		else:
+			scroll = self._scroll_get()
+			# Listboxes not redrawn still display the active cell as it
+			# was when the batch started.
+			old_y = self._batch_active_cell[1]
+			if old_y is not None and old_y < self._batch_length:
+				for fi, frame in enumerate(self.frames):
+					if fi not in dirty:
+						frame[1].itemconfigure(old_y, **self._DEFAULT_ITEMCONFIGURE)
+			for col in self.columns.values():
+				if col.assignedframe in dirty:
+					col.redraw()
+			self._fill_empty_frames()
+			self._scroll_restore(scroll)
+			self._redraw_active_cell()
+			self._redraw_selection()
+		if self._batch_see is not None:
+			see = self._batch_see
+			self._batch_see = None
+			if self.model.shown_length > 0:
+				self._see(min(see, self.model.shown_length - 1))
+		if self._batch_select_event:
+			self._batch_select_event = False
+			self._selection_changed()
+
+	def _bind_scroll(self, listbox):
+		"""
+		Sets up the mouse wheel bindings of a listbox. In virtual mode, they
+		are routed to `_scrollallbar` instead of scrolling the listbox itself.
+		"""
+		yview = self._virtual_yview_cmd if self.cnf.virtual else "%W yview"
+		self.tk.eval(SCROLLCOMMAND.format(w = listbox._w, yview = yview))
+
+	def _cancel_sort(self):
+		"""
+		Cancels the running background sort, if any, and restores the sort
+		indicator of the column it was started by.
+		"""
+		if self._sort_job is None:
+			return
+		future, call_col, _ = self._sort_job
+		self._sort_job = None
+		future.cancel()
+		self.after_cancel(self._sort_after_id)
+		self._sort_after_id = None
+		call_col.set_sortstate(call_col.sortstate)
+
 	def _clear_frame(self, frame_idx):
 		"""
 		Will set up default bindings on a frame, and clear its label,
@@ -1110,9 +2159,13 @@ class MultiframeList(ttk.Frame):
 		from a frame or initial setup.
 		"""
 		tgt_frame = self.frames[frame_idx]
+		if self._batch_depth > 0:
+			self._batch_dirty_frames.add(frame_idx)
+		self._painted_selection = None
 		tgt_frame[1].delete(0, tk.END)
-		tgt_frame[1].insert(0, *(BLANK for _ in range(self.length)))
-		tgt_frame[1].configure(width = _DEF_LISTBOX_WIDTH)
+		if not self.cnf.virtual:
+			tgt_frame[1].insert(0, *(BLANK for _ in range(self.model.shown_length)))
+		self._configure_listbox(tgt_frame[1], width = _DEF_LISTBOX_WIDTH)
 		tgt_frame[1].unbind("<Double-Button-1>")
 		tgt_frame[2].configure(text = BLANK)
 		tgt_frame[2].bind("<Button-1>",
@@ -1130,6 +2183,49 @@ class MultiframeList(ttk.Frame):
 			weight = WEIGHT, minsize = MIN_WIDTH
 		)
 
+	def _create_column(self, table, col_id = None, **cnf):
+		"""Column factory passed to `TableModel.add_column`."""
+		return _Column(self, col_id, **cnf)
+
+	def _configure_listbox(self, lb, **cnf):
+		"""
+		Configures a listbox with the given options, dropping its cached
+		metrics if any of the options they are derived from change.
+		All reconfiguration of listboxes should go through here.
+		"""
+		if not self._LISTBOX_METRIC_OPTIONS.isdisjoint(cnf):
+			self._listbox_metrics.pop(lb._w, None)
+		lb.configure(**cnf)
+
+	def _fill_empty_frames(self):
+		"""
+		Adds or removes blank strings to the listboxes of all frames without
+		a column so their amount matches the amount of displayed rows.
+		Not applicable in virtual mode.
+		"""
+		if self._batch_depth > 0:
+			return
+		for fi in self._get_empty_frames():
+			curframelen = self.frames[fi][1].size()
+			if curframelen != self.model.shown_length:
+				self._painted_selection = None
+			if curframelen > self.model.shown_length:
+				self.frames[fi][1].delete(self.model.shown_length, tk.END)
+			elif curframelen < self.model.shown_length:
+				self.frames[fi][1].insert(
+					tk.END, *(BLANK for _ in range(self.model.shown_length - curframelen))
+				)
+
+	@_instrumented
+	def _generate_aggregates_event(self):
+		self._aggregates_after_id = None
+		self.event_generate("<<MultiframeAggregates>>", when = "tail")
+
+	@_instrumented
+	def _generate_select_event(self):
+		self._select_after_id = None
+		self.event_generate("<<MultiframeSelect>>", when = "tail")
+
 	def _get_clamps(self, dragged_frame):
 		c_frame = self.frames[dragged_frame]
 		p_frame = self.frames[dragged_frame - 1]
@@ -1154,10 +2250,7 @@ class MultiframeList(ttk.Frame):
 		Returns the column specified by col_id, raises an exception if it
 		is not found.
 		"""
-		col = self.columns.get(col_id)
-		if col is None:
-			raise ValueError(f"No column with column id {col_id!r}!")
-		return col
+		return self.model.get_column_model(col_id)
 
 	def _get_col_by_frame(self, frame):
 		"""Returns the column in `frame` or None if there is none in it."""
@@ -1166,6 +2259,18 @@ class MultiframeList(ttk.Frame):
 				return col
 		return None
 
+	def _get_display_index(self, index):
+		"""
+		Returns the listbox index the row at `index` is displayed at,
+		or None if it is not displayed in virtual mode.
+		"""
+		if not self.cnf.virtual:
+			return index
+		local = index - self._view_offset
+		if 0 <= local < self._view_count:
+			return local
+		return None
+
 	def _get_empty_frames(self):
 		"""Returns the indexes of all frames that are not assigned a column."""
 		assignedframes = [col.assignedframe for col in self.columns.values()]
@@ -1183,6 +2288,13 @@ class MultiframeList(ttk.Frame):
 			highlight_idx += 1
 		return max(highlight_idx, 0)
 
+	def _get_key_column(self):
+		"""
+		Returns the key column, raises an exception if none is configured
+		or it does not exist.
+		"""
+		return self.model.get_key_column()
+
 	def _get_listbox_conf(self, listbox):
 		"""
 		Creates a dict of style options based on the ttk Style settings in
@@ -1206,19 +2318,74 @@ class MultiframeList(ttk.Frame):
 		Returns the height of a listbox' entry by measuring its
 		font and border width parameters.
 		"""
-		fm = self.tk.call("font", "metrics", lb["font"]).split()
-		return int(fm[fm.index("-linespace") + 1]) + 1 + 2 * int(lb["selectborderwidth"])
+		return self._get_listbox_metrics(lb)[0]
 
-	def _get_index_from_mouse_y(self, lb, y_pos):
+	def _get_listbox_metrics(self, lb):
 		"""
-		Calculates the index of a listbox from pixel y position
+		Returns a tuple of a listbox' entry height, border width and
+		highlight thickness. The values are cached per listbox until one
+		of the options they depend on is changed through
+		`_configure_listbox`, so this does not require any calls to Tcl
+		most of the time.
+		"""
+		metrics = self._listbox_metrics.get(lb._w)
+		if metrics is None:
+			fm = self.tk.call("font", "metrics", lb["font"]).split()
+			metrics = (
+				int(fm[fm.index("-linespace") + 1]) + 1 + 2 * int(lb["selectborderwidth"]),
+				int(lb["borderwidth"]),
+				int(lb["highlightthickness"]),
+			)
+			self._listbox_metrics[lb._w] = metrics
+		return metrics
+
+	def _get_index_from_mouse_y(self, frameindex, y_pos):
+		"""
+		Calculates the index of a frame's listbox from pixel y position
 		by measuring font height, y offset and border settings.
 		"""
-		offset = int(lb.yview()[0] * self.length)
-		borderwidth = int(lb["borderwidth"])
-		e_height = self._get_listbox_entry_height(lb)
+		if self.cnf.virtual:
+			offset = self._view_offset
+		else:
+			offset = int(self._get_yview_start(frameindex) * self.model.shown_length)
+		e_height, borderwidth, _ = self._get_listbox_metrics(self.frames[frameindex][1])
 		return ((y_pos - borderwidth) // e_height) + offset
 
+	def _get_top_row(self):
+		"""
+		Returns the index in the data of the row on top of the view, or
+		None if no row is displayed.
+		"""
+		shown = self.model.shown_length
+		if self.cnf.virtual:
+			top = self._view_offset
+		elif self.frames and shown > 0:
+			top = int(self._get_yview_start(0) * shown + 0.5)
+		else:
+			return None
+		return self.model.to_source(top) if top < shown else None
+
+	def _get_yview_start(self, frameindex):
+		"""
+		Returns the fraction of rows above the view of the listbox in frame
+		`frameindex` as it was last reported by the listbox. Only queries
+		the listbox if it has not reported its view yet.
+		"""
+		pos = self._scroll_reports.get(frameindex)
+		if pos is None:
+			return self.frames[frameindex][1].yview()[0]
+		return pos[0]
+
+	def _insert_rows(self, rows, insindex, reset_sortstate, clear_selection):
+		"""
+		Inserts rows, see `insert_rows`. If `clear_selection` is False, the
+		selection moves along with its rows instead of being cleared.
+		"""
+		self._cancel_sort()
+		if reset_sortstate:
+			self._reset_sortstate()
+		self.model.insert_rows(rows, insindex, clear_selection)
+
 	def _load_active_cell_style(self):
 		"""
 		Returns a 2-value tuple of the active cell style and the active
@@ -1232,17 +2399,54 @@ class MultiframeList(ttk.Frame):
 
 		return ac, ar
 
+	def _measure_view_rows(self, lb, height):
+		"""
+		Returns the amount of rows that fully fit into the listbox `lb`
+		if it were `height` pixels tall, but at least 1.
+		"""
+		e_height, borderwidth, highlightthickness = self._get_listbox_metrics(lb)
+		return max(1, (height - 2 * (borderwidth + highlightthickness)) // e_height)
+
+	def _on_active_cell_change(self, old_x, old_y):
+		"""
+		Called when the model's active cell was moved from `old_x` and
+		`old_y`. Updates its highlights appropiately.
+		"""
+		if self._batch_depth > 0:
+			return
+		new_x = self.active_cell_x
+		new_y = self.active_cell_y
+		if new_y != old_y:
+			self._undraw_active_cell(old_x, old_y)
+			self._redraw_active_cell()
+			return
+		if new_y is None:
+			return
+		row = self._get_display_index(new_y)
+		if row is None:
+			return
+		if old_x is not None:
+			self.frames[old_x][1].itemconfigure(row, **(
+				self._active_row_style
+				if self.cnf.active_cell_span_row else
+				self._DEFAULT_ITEMCONFIGURE
+			))
+		if new_x is not None:
+			self.frames[new_x][1].itemconfigure(row, **self._active_cell_style)
+
+	@_instrumented
 	def _on_arrow_x(self, event, direction):
 		"""
 		Executed when the MultiframeList receives <Left> and <Right> events,
 		triggered by the user pressing the arrow keys.
 		"""
 		new_x = 0 if self.active_cell_x is None and self.frames else self.active_cell_x + direction
-		new_y = 0 if self.active_cell_y is None and self.length > 0 else self.active_cell_y
+		new_y = 0 if self.active_cell_y is None and self.model.shown_length > 0 else self.active_cell_y
 		if new_x < 0 or new_x > len(self.frames) - 1:
 			return
-		self._set_active_cell(new_x, new_y)
+		self.model.set_active_cell(new_x, new_y)
 
+	@_instrumented
 	def _on_arrow_y(self, event, direction):
 		"""
 		Executed when the MultiframeList receives <Up> and <Down> events,
@@ -1252,22 +2456,22 @@ class MultiframeList(ttk.Frame):
 		"""
 		new_x = 0 if self.active_cell_x is None and self.frames else self.active_cell_x
 		new_y = 0 if self.active_cell_y is None else self.active_cell_y + direction
-		if new_y < 0 or new_y > self.length - 1:
+		if new_y < 0 or new_y > self.model.shown_length - 1:
 			return
-		self._set_active_cell(new_x, new_y)
-		for i in self.frames:
-			i[1].see(self.active_cell_y)
+		self.model.set_active_cell(new_x, new_y)
+		self._see(self.active_cell_y)
 
 		selection_made = True
 		if with_shift(event):
-			self._selection_set_from_anchor(self.active_cell_y, clear = not with_ctrl(event))
+			self.model.selection_set_from_anchor(self.active_cell_y, clear = not with_ctrl(event))
 		elif with_ctrl(event):
 			selection_made = False
 		else:
-			self._selection_set(self.active_cell_y)
+			self.model.selection_set(self.active_cell_y)
 		if selection_made:
-			self.event_generate("<<MultiframeSelect>>", when = "tail")
+			self._selection_changed()
 
+	@_instrumented
 	def _on_click_key(self, event):
 		"""
 		Called when the "click" key (Space by default) is pressed.
@@ -1275,20 +2479,21 @@ class MultiframeList(ttk.Frame):
 		selection depending on whether shift and ctrl were being held.
 		"""
 		new_x = 0 if self.active_cell_x is None and self.frames else self.active_cell_x
-		new_y = 0 if self.active_cell_y is None and self.length > 0 else self.active_cell_y
+		new_y = 0 if self.active_cell_y is None and self.model.shown_length > 0 else self.active_cell_y
 		if new_y is None or new_x is None:
 			return
 
-		self._set_active_cell(new_x, new_y)
+		self.model.set_active_cell(new_x, new_y)
 		if with_shift(event):
-			self._selection_set_from_anchor(self.active_cell_y, clear = not with_ctrl(event))
+			self.model.selection_set_from_anchor(self.active_cell_y, clear = not with_ctrl(event))
 		elif with_ctrl(event):
-			self._selection_anchor = None
-			self._selection_set_item(self.active_cell_y, toggle = True)
+			self.model.selection_anchor = None
+			self.model.selection_set_item(self.active_cell_y, toggle = True)
 		else:
-			self._selection_set(self.active_cell_y)
-		self.event_generate("<<MultiframeSelect>>", when = "tail")
+			self.model.selection_set(self.active_cell_y)
+		self._selection_changed()
 
+	@_instrumented
 	def _on_column_release(self, event, released_frame, drag_intent):
 		if drag_intent is DRAGINTENT.REORDER and self.cnf.reorderable:
 			self.reorder_highlight.place_forget()
@@ -1322,6 +2527,7 @@ class MultiframeList(ttk.Frame):
 			if rcol is not None and rcol.cnf.sort:
 				self.sort(None, rcol)
 
+	@_instrumented
 	def _on_column_drag(self, event, dragged_frame):
 		if self.dragging is DRAGINTENT.REORDER and self.cnf.reorderable:
 			highlight_idx = self._get_frame_at_x(event.widget.winfo_rootx() + event.x)
@@ -1339,9 +2545,31 @@ class MultiframeList(ttk.Frame):
 			)
 			self.resize_highlight.tkraise()
 
+	def _on_filter_change(self):
+		"""
+		Called when the model's filter was replaced. Refills the listboxes
+		with the rows it lets through and scrolls to the top. Also aborts a
+		dragging selection in progress.
+		"""
+		self._last_click_event = None
+		self._last_dragged_over_element = None
+		for col in self.columns.values():
+			col._find_index = None
+		if self.model.view is None:
+			for col in self.columns.values():
+				col.redraw()
+			self._fill_empty_frames()
+		self._view_offset = 0
+		self._refresh_view()
+		self._scroll_restore(0)
+		self._redraw_active_cell()
+		self._redraw_selection()
+
+	@_instrumented
 	def _on_frame_header_leave(self, evt):
 		evt.widget.configure(cursor = "arrow")
 
+	@_instrumented
 	def _on_frame_header_motion(self, evt, fidx):
 		if self.pressed_frame is not None:
 			if self.dragging is not None:
@@ -1355,6 +2583,7 @@ class MultiframeList(ttk.Frame):
 				else "arrow"
 			)
 
+	@_instrumented
 	def _on_frame_header_press(self, evt, fidx):
 		"""
 		Callback to register the pressed frame and initial press position
@@ -1363,6 +2592,7 @@ class MultiframeList(ttk.Frame):
 		self.pressed_frame = fidx
 		self.pressed_x = evt.x
 
+	@_instrumented
 	def _on_frame_header_release(self, evt, fidx):
 		"""
 		Callback to reset press variables and invoke release handler after
@@ -1372,6 +2602,44 @@ class MultiframeList(ttk.Frame):
 		self.pressed_frame = self.pressed_x = None
 		self.dragging = None
 
+	@_instrumented
+	def _on_listbox_configure(self, event):
+		"""
+		Called whenever a listbox changes its size. In virtual mode,
+		adjusts the amount of displayed rows.
+		"""
+		if not self.cnf.virtual:
+			return
+		rows = self._measure_view_rows(event.widget, event.height)
+		if rows != self._view_rows:
+			self._view_rows = rows
+			self._refresh_view()
+
+	@_instrumented
+	def _on_listbox_yscroll(self, frameindex, first, last):
+		"""
+		Set as every listbox' yscrollcommand. Formats the rows that came
+		into view if the listbox' column is formatted lazily, makes the
+		reporting listbox the one all others will follow and schedules a
+		synchronization for when Tk is idle, so bursts of reports are
+		coalesced.
+		Reports that merely confirm the last synchronization as well as
+		those made while synchronizing are ignored.
+		"""
+		if self.cnf.virtual:
+			return
+		col = self._get_col_by_frame(frameindex)
+		if col is not None and col._formatted is not None:
+			col._format_visible(first, last)
+		pos = (float(first), float(last))
+		self._scroll_reports[frameindex] = pos
+		if self._scroll_syncing or pos == self._scroll_pos:
+			return
+		self._scroll_leader = frameindex
+		if self._scroll_after_id is None:
+			self._scroll_after_id = self.after_idle(self._scroll_sync)
+
+	@_instrumented
 	def _on_listbox_mouse_motion(self, event, button, frameindex):
 		"""
 		Called by listboxes whenever a mousebutton is dragged.
@@ -1381,24 +2649,24 @@ class MultiframeList(ttk.Frame):
 		"""
 		if self._last_click_event is None:
 			return
-		hovered = self._get_index_from_mouse_y(self.frames[frameindex][1], event.y)
+		hovered = self._get_index_from_mouse_y(frameindex, event.y)
 		if hovered < 0:
 			return
-		hovered = min(hovered, self.length - 1)
+		hovered = min(hovered, self.model.shown_length - 1)
 		if self._last_dragged_over_element == hovered:
 			return
 		self._last_dragged_over_element = hovered
-		self._set_active_cell(frameindex, hovered)
+		self.model.set_active_cell(frameindex, hovered)
 		if with_ctrl(event):
-			self._selection_set_item(hovered, toggle = True)
+			self.model.selection_set_item(hovered, toggle = True)
 		elif with_shift(event):
-			self._selection_set_item(hovered)
+			self.model.selection_set_item(hovered)
 		else:
-			self._selection_set_from_anchor(hovered)
-		for i in self.frames:
-			i[1].see(hovered)
-		self.event_generate("<<MultiframeSelect>>", when = "tail")
+			self.model.selection_set_from_anchor(hovered)
+		self._see(hovered)
+		self._selection_changed()
 
+	@_instrumented
 	def _on_listbox_mouse_press(self, event, button, frameindex):
 		"""
 		Called by listboxes whenever a mouse button is pressed on them.
@@ -1407,28 +2675,29 @@ class MultiframeList(ttk.Frame):
 		"""
 		# Reset focus to mfl, all mouse events will still go to the listbox
 		self.focus()
-		if self.length == 0:
+		if self.model.shown_length == 0:
 			return
-		tosel = self._get_index_from_mouse_y(self.frames[frameindex][1], event.y)
+		tosel = self._get_index_from_mouse_y(frameindex, event.y)
 		if tosel < 0:
 			return
-		tosel = min(tosel, self.length - 1)
-		self._set_active_cell(frameindex, tosel)
+		tosel = min(tosel, self.model.shown_length - 1)
+		self.model.set_active_cell(frameindex, tosel)
 		if button != self.cnf.rightclickbtn or tosel not in self.selection:
 			# NOTE: these should be handled differently / behave very
 			# specifically in the windows listboxes but tbh who cares
 			if with_shift(event):
-				self._selection_set_from_anchor(tosel)
+				self.model.selection_set_from_anchor(tosel)
 			elif with_ctrl(event):
-				self._selection_set_item(tosel, toggle = True)
+				self.model.selection_set_item(tosel, toggle = True)
 			else:
-				self._selection_set(tosel)
+				self.model.selection_set(tosel)
 
-			self.event_generate("<<MultiframeSelect>>", when = "tail")
+			self._selection_changed()
 
 		self._last_dragged_over_element = tosel
 		self._last_click_event = event
 
+	@_instrumented
 	def _on_listbox_mouse_release(self, event, button, frameindex):
 		"""
 		Called by listboxes when the mouse is released over them.
@@ -1446,6 +2715,25 @@ class MultiframeList(ttk.Frame):
 		if button == self.cnf.rightclickbtn:
 			self.event_generate("<<MultiframeRightclick>>", when = "tail")
 
+	def _on_model_change(self, change, *args):
+		"""
+		Subscribed to the model. The data of the columns is kept up to date
+		with the listboxes by the columns themselves, everything else that
+		is displayed is updated from here.
+		"""
+		if change == "shown":
+			self._on_shown_change(*args)
+		elif change == "filter":
+			self._on_filter_change()
+		elif change == "selection":
+			self._redraw_selection()
+			self._selection_changed()
+		elif change == "active_cell":
+			self._on_active_cell_change(*args)
+		elif change == "aggregates":
+			self._aggregates_changed()
+
+	@_instrumented
 	def _on_menu_button(self, _):
 		"""
 		User has pressed the menu button.
@@ -1459,10 +2747,13 @@ class MultiframeList(ttk.Frame):
 		local_actcellx = 0 if self.active_cell_x is None else self.active_cell_x
 		pseudo_lbl = self.frames[local_actcellx][0]
 		pseudo_lbx = self.frames[local_actcellx][1]
-		first_offset = pseudo_lbx.yview()[0]
+		if self.cnf.virtual:
+			first_index = self._view_offset
+		else:
+			first_index = self.model.shown_length * self._get_yview_start(local_actcellx)
 		entry_height = self._get_listbox_entry_height(pseudo_lbx)
 		tmp_x = pseudo_lbl.winfo_rootx() + 5
-		tmp_y = entry_height * (self.active_cell_y - (self.length * first_offset)) + \
+		tmp_y = entry_height * (self.active_cell_y - first_index) + \
 			20 + pseudo_lbl.winfo_rooty()
 		tmp_x = int(round(tmp_x))
 		tmp_y = int(round(tmp_y))
@@ -1471,37 +2762,190 @@ class MultiframeList(ttk.Frame):
 		self.coordy = tmp_y
 		self.event_generate("<<MultiframeRightclick>>", when = "tail")
 
+	def _on_shown_change(self, changes):
+		"""
+		Called when the model's displayed rows were modified, see
+		`TableModel.subscribe`. Without a filter or virtual mode, the
+		columns have updated their listboxes already and only the ones
+		without a column have to be adjusted. While filtered, the modified
+		rows are spliced into the listboxes if `changes` tells which ones
+		they are.
+		Also aborts a dragging selection in progress.
+		"""
+		# Will cause errors otherwise if change occurs while user is dragging
+		self._last_click_event = None
+		self._last_dragged_over_element = None
+		if self.model.view is not None:
+			for col in self.columns.values():
+				col._find_index = None
+		if self.cnf.virtual or self.model.view is not None:
+			if self.cnf.virtual or changes is None or self._batch_depth > 0:
+				self._refresh_view()
+			else:
+				self._splice_view(*changes)
+			return
+		self._fill_empty_frames()
+		self._redraw_active_cell()
+		self._redraw_selection()
+
 	def _redraw_active_cell(self):
 		"""
 		Sets the active cell's itemconfigurations.
 		Should be used after e.g. new frames have been added or reordered.
 		"""
+		if self._batch_depth > 0:
+			return
 		if self.active_cell_x is None or self.active_cell_y is None:
 			return
+		row = self._get_display_index(self.active_cell_y)
+		if row is None:
+			return
 		if self.cnf.active_cell_span_row:
 			for idx, i in enumerate(self.frames):
-				i[1].itemconfigure(self.active_cell_y, **(
+				i[1].itemconfigure(row, **(
 					self._active_cell_style
 					if idx == self.active_cell_x else
 					self._active_row_style
 				))
 		else:
 			self.frames[self.active_cell_x][1].itemconfigure(
-				self.active_cell_y, self._active_cell_style
+				row, self._active_cell_style
 			)
 
 	def _redraw_selection(self):
 		"""
 		Sets the visual selection to the selected indices in each frame's
 		listbox.
+		Only the ranges that changed since the last redraw are touched,
+		unless the listboxes' contents changed in the meantime.
 		"""
-		for i in self.frames:
-			i[1].selection_clear(0, tk.END)
-		if self.selection is None:
+		if self._batch_depth > 0:
 			return
-		for idx in self.selection:
+		if self.cnf.virtual:
+			start = self._view_offset
+			new = [
+				range(rng.start - start, rng.stop - start)
+				for rng in self.selection.ranges(start, start + self._view_count)
+			]
+		else:
+			new = self.selection.ranges()
+		old = self._painted_selection
+		if old is None:
+			for i in self.frames:
+				i[1].selection_clear(0, tk.END)
+			to_clear = ()
+			to_set = new
+		else:
+			to_clear = _subtract_ranges(old, new)
+			to_set = _subtract_ranges(new, old)
+		for rng in to_clear:
 			for i in self.frames:
-				i[1].selection_set(idx)
+				i[1].selection_clear(rng.start, rng.stop - 1)
+		for rng in to_set:
+			for i in self.frames:
+				i[1].selection_set(rng.start, rng.stop - 1)
+		self._painted_selection = new
+
+	def _refresh_view(self):
+		"""
+		In virtual mode, fills all listboxes with the rows currently in
+		view and updates the scrollbar. Otherwise, if a filter is set, fills
+		them with all rows it lets through. Then redraws selection and
+		active cell. Has no effect if neither applies or during a batch.
+		"""
+		if (not self.cnf.virtual and self.model.view is None) or self._batch_depth > 0:
+			return
+		shown = self.model.shown_length
+		if self.cnf.virtual:
+			self._view_offset = max(0, min(self._view_offset, shown - self._view_rows))
+			start = self._view_offset
+			stop = min(shown, start + self._view_rows + 1)
+			self._view_count = stop - start
+		else:
+			scroll = self._scroll_get()
+			start = 0
+			stop = shown
+		self._painted_selection = None
+		for col in self.columns.values():
+			if col.assignedframe is None:
+				continue
+			lb = self.frames[col.assignedframe][1]
+			lb.delete(0, tk.END)
+			lb.insert(tk.END, *col.get_display(start, stop, self.model.view))
+		for fi in self._get_empty_frames():
+			lb = self.frames[fi][1]
+			lb.delete(0, tk.END)
+			lb.insert(tk.END, *(BLANK for _ in range(stop - start)))
+		if not self.cnf.virtual:
+			self._scroll_restore(scroll)
+		elif shown > 0:
+			self.scrollbar.set(start / shown, min(1.0, (start + self._view_rows) / shown))
+		else:
+			self.scrollbar.set(0.0, 1.0)
+		self._redraw_active_cell()
+		self._redraw_selection()
+
+	@_instrumented
+	def _on_typeahead_key(self, event):
+		"""
+		Called for any key pressed on the MultiframeList that has no other
+		binding. Extends the type-ahead text by the typed character and
+		moves the active cell and selection to the first row starting with
+		it in the active cell's column, unless the active cell's row does.
+		"""
+		# Only consider plain printable characters, no Ctrl/Alt combinations.
+		# Keys such as Shift or Home have an empty one, which is printable.
+		if not self.cnf.typeahead or not event.char or not event.char.isprintable() or \
+				event.state & self._shortcut_state:
+			return
+		x = 0 if self.active_cell_x is None else self.active_cell_x
+		col = self._get_col_by_frame(x)
+		if col is None:
+			return
+		now = perf_counter()
+		if now - self._typeahead_time > TYPEAHEAD_TIMEOUT / 1000:
+			self._typeahead_text = ""
+		self._typeahead_time = now
+		self._typeahead_text += event.char
+		text = self._typeahead_text.casefold()
+
+		y = self.active_cell_y
+		if y is not None:
+			current = str(col.get_display(y, y + 1, self.model.view)[0]).casefold()
+			if current.startswith(text):
+				return
+		new_y = col.find_prefix(text)
+		if new_y is None:
+			return
+		self.model.set_active_cell(x, new_y)
+		self._see(new_y)
+		self.model.selection_set(new_y)
+		self._selection_changed()
+
+	@_instrumented
+	def _poll_sort(self):
+		"""
+		Applies the result of the running background sort once it is done,
+		otherwise checks again later.
+		"""
+		future, call_col, new_sortstate = self._sort_job
+		if not future.done():
+			self._sort_after_id = self.after(_SORT_POLL_INTERVAL, self._poll_sort)
+			return
+		self._sort_job = None
+		self._sort_after_id = None
+		try:
+			perm = future.result()
+		except TypeError:
+			if call_col.cnf.fallback_type is None:
+				call_col.set_sortstate(call_col.sortstate)
+				raise
+			# Let the column convert its elements and sort them on the spot
+			perm = call_col.get_sort_permutation(bool(new_sortstate))
+		except BaseException:
+			call_col.set_sortstate(call_col.sortstate)
+			raise
+		self._apply_sort(call_col, new_sortstate, perm)
 
 	def _reset_sortstate(self):
 		"""
@@ -1541,161 +2985,182 @@ class MultiframeList(ttk.Frame):
 			tgt_col.setdisplay(src_frame)
 		else:
 			self.framecontainer.grid_columnconfigure(src_frame, weight = tgt_w)
+		self._refresh_view()
 		self._scroll_restore(scroll)
 		self._redraw_active_cell()
 		self._redraw_selection()
 
+	def _sort_async(self, call_col, new_sortstate):
+		"""
+		Submits the computation of the sort permutation for a sort by
+		`call_col` to the sort executor and starts polling for its result.
+		The column's data is copied, so the executor never sees it change.
+		"""
+		keys, sortkey = call_col.get_sort_args()
+		executor = self.cnf.sort_executor
+		if executor is None:
+			if self._sort_executor is None:
+				self._sort_executor = ThreadPoolExecutor(1)
+			executor = self._sort_executor
+		future = executor.submit(_sort_permutation, keys, sortkey, bool(new_sortstate))
+		self._sort_job = (future, call_col, new_sortstate)
+		if call_col.assignedframe is not None and call_col.cnf.sort:
+			self.frames[call_col.assignedframe][3].configure(text = SORTSYM_BUSY)
+		self._sort_after_id = self.after(_SORT_POLL_INTERVAL, self._poll_sort)
+
 	def _scroll_get(self):
+		if self.cnf.virtual:
+			return self._view_offset
 		if not self.frames:
 			return None
 		return self.frames[0][1].yview()[0]
 
 	def _scroll_restore(self, scroll):
-		if scroll is not None:
+		if scroll is None:
+			return
+		if self.cnf.virtual:
+			self._set_view_offset(scroll)
+		else:
 			self._scrollalllistbox(scroll, 1.0)
 
+	@_instrumented
+	def _scroll_sync(self):
+		"""
+		Scrolls all listboxes that are not at the scroll leader's last
+		reported position to it and updates the scrollbar.
+		"""
+		self._scroll_after_id = None
+		leader = self._scroll_leader
+		if self.cnf.virtual or leader is None or leader >= len(self.frames):
+			return
+		pos = self._scroll_reports[leader]
+		self._scroll_pos = pos
+		self._scroll_syncing = True
+		try:
+			for fi, frame in enumerate(self.frames):
+				if fi != leader and self._scroll_reports.get(fi) != pos:
+					frame[1].yview_moveto(pos[0])
+		finally:
+			self._scroll_syncing = False
+		self.scrollbar.set(*pos)
+
+	@_instrumented
 	def _scrollallbar(self, *args):
-		"""Bound to the scrollbar; Will scroll listboxes."""
+		"""
+		Bound to the scrollbar; Will scroll listboxes.
+		In virtual mode, also receives the listboxes' mouse wheel scrolling
+		and moves the displayed rows instead.
+		"""
 		# args can have 2 or 3 values
+		if self.cnf.virtual:
+			if args[0] == "moveto":
+				self._set_view_offset(int(float(args[1]) * self.model.shown_length))
+			elif args[0] == "scroll":
+				amount = int(args[1])
+				if args[2] == "pages":
+					amount *= self._view_rows
+				self._set_view_offset(self._view_offset + amount)
+			return
 		for i in self.frames:
 			i[1].yview(*args)
 
 	def _scrollalllistbox(self, a, b):
-		"""Bound to all listboxes so that they will scroll the other ones
-		and scrollbar.
 		"""
+		Scrolls all listboxes to `a` and sets the scrollbar to the position
+		they ended up at, or to `a` and `b` if there are none.
+		In virtual mode, the listboxes never scroll by themselves and this
+		method has no effect.
+		"""
+		if self.cnf.virtual:
+			return
 		for i in self.frames:
 			i[1].yview_moveto(a)
-		self.scrollbar.set(a, b)
-
-	def _selection_clear(self, redraw = True, with_event = False):
-		"""
-		Clears the selection anchor and the selection.
-		If `redraw` is `True`, will also redraw the selection.
-		If `with_event` is `True`, a <<MultiframeSelect>> event will
-		be generated if the selection was not empty beforehand.
-		"""
-		was_not_empty = bool(self.selection)
-		self._selection_anchor = None
-		self.selection.clear()
-		if redraw:
-			self._redraw_selection()
-		if with_event and was_not_empty:
-			self.event_generate("<<MultiframeSelect>>", when = "tail")
-
-	def _selection_set(self, new, anchor = None, toggle = False):
-		"""
-		Clears and then sets the selection to the given iterable or single index.
-		If `anchor` is not `None`, the selection anchor will be set to `anchor`.
-		Otherwise, anchor will be set to the first value seen in the new selection set,
-		whose order can possibly not be guaranteed.
-		`toggle` will be passed on to all calls to `self._selection_set_item`.
-		"""
-		self._selection_clear(False)
-		if anchor is not None:
-			self._selection_anchor = anchor
-		if isinstance(new, int):
-			self._selection_set_item(new, False, toggle)
+		if self.frames:
+			# Listboxes that did not move report nothing, so the scrollbar
+			# can not be left to their reports.
+			pos = tuple(float(x) for x in self.frames[0][1].yview())
+			self._scroll_pos = pos
+			self.scrollbar.set(*pos)
 		else:
-			for idx in new:
-				self._selection_set_item(idx, False, toggle)
-		self._redraw_selection()
+			self._scroll_pos = None
+			self.scrollbar.set(a, b)
 
-	def _selection_set_from_anchor(self, target, toggle = False, clear = True):
+	def _see(self, index):
 		"""
-		If the selection mode is `MULTIPLE`, sets the selection from the current
-		anchor to the given target index. If the anchor does not exist, will set
-		the selection as just the target item and make it the new anchor.
-		If the selection mode is `SINGLE`, will simply set the selection to `target`.
-		`toggle` will be passed on to `self._selection_set`.
-		Only relevant for `MULTIPLE` selection mode, if `clear` is set to `False`,
-		the current selection will be kept and the new selection added as a union to it.
+		Scrolls all listboxes so that the row at `index` is visible.
 		"""
-		if self.cnf.selection_type is SELECTION_TYPE.SINGLE or self._selection_anchor is None:
-			self._selection_set(target, toggle = toggle)
+		if self._batch_depth > 0:
+			self._batch_see = index
+			return
+		if self.cnf.virtual:
+			if index < self._view_offset:
+				self._set_view_offset(index)
+			elif index >= self._view_offset + self._view_rows:
+				self._set_view_offset(index - self._view_rows + 1)
 			return
-		step = -1 if target < self._selection_anchor else 1
-		new_sel = set() if clear else self.selection.copy()
-		new_sel.update(range(self._selection_anchor, target + step, step))
-		self._selection_set(new_sel, self._selection_anchor, toggle)
+		for i in self.frames:
+			i[1].see(index)
 
-	def _selection_set_item(self, idx, redraw = True, toggle = False):
+	def _selection_changed(self):
 		"""
-		Adds a new index to the MultiframeList's selection, be it in single
-		or multiple selection mode. If the selection mode is SINGLE, the
-		selection will be cleared. If the selection anchor is None, it
-		will be set to the given item.
-		If `redraw` is `True`, will redraw the selection.
-		If `toggle` is `True`, will toggle the index instead of setting it.
+		Schedules a <<MultiframeSelect>> event, unless one is already, or
+		defers it until the current batch ends.
 		"""
-		if self.cnf.selection_type is SELECTION_TYPE.SINGLE:
-			self._selection_clear(False)
-		if self._selection_anchor is None:
-			self._selection_anchor = idx
-		if toggle and idx in self.selection:
-			self.selection.remove(idx)
-		else:
-			self.selection.add(idx)
-		if redraw:
-			self._redraw_selection()
+		if self._batch_depth > 0:
+			self._batch_select_event = True
+		elif self._select_after_id is None:
+			self._select_after_id = self.after_idle(self._generate_select_event)
 
-	def _set_active_cell(self, new_x, new_y):
+	def _set_tkapp(self, widget, tkapp):
 		"""
-		Sets the active cell to the new values and updates its highlights
-		appropiately. The values may be `None`, to keep one of the fields
-		unchanged, pass in `self.active_cell_x|y` as needed.
+		Sets the Tk application object of the widget and all its
+		descendants.
 		"""
-		old_x = self.active_cell_x
-		old_y = self.active_cell_y
-
-		if new_x != old_x:
-			self.active_cell_x = new_x
-			if old_x is not None and old_y is not None:
-				self.frames[old_x][1].itemconfigure(old_y, **(
-					self._active_row_style
-					if self.cnf.active_cell_span_row else
-					self._DEFAULT_ITEMCONFIGURE
-				))
-			if new_x is not None and new_y is not None:
-				self.frames[new_x][1].itemconfigure(new_y, **self._active_cell_style)
-
-		if new_y != old_y:
-			if old_y is not None:
-				self._undraw_active_cell()
-			self.active_cell_y = new_y
-			self._redraw_active_cell()
+		widget.tk = tkapp
+		for child in widget.children.values():
+			self._set_tkapp(child, tkapp)
 
-	def _set_length(self, new_length):
+	def _set_view_offset(self, new_offset):
 		"""
-		Use this for any change to `self.length`. This method updates
-		frames without a column so the amount of blank strings in them
-		stays correct, clears the selection generating an event if it
-		was not empty previously, will adjust the active cell if it runs
-		out of bounds and clear the click/dragging event.
+		Sets the first row displayed in virtual mode, clamped to the
+		MultiframeList's length, and refreshes the view if it changed.
 		"""
-		self.length = new_length
-
-		# Will cause errors otherwise if change occurs while user is dragging
-		self._last_click_event = None
-		self._last_dragged_over_element = None
-
-		if self.active_cell_y is not None:
-			new_ay = self.active_cell_y
-			if new_ay > self.length - 1:
-				new_ay = self.length - 1 if self.length > 0 else None
-			if new_ay != self.active_cell_y:
-				self._set_active_cell(self.active_cell_x, new_ay)
-		self._selection_clear(with_event = True)
+		new_offset = max(0, min(new_offset, self.model.shown_length - self._view_rows))
+		if new_offset != self._view_offset:
+			self._view_offset = new_offset
+			self._refresh_view()
 
+	def _splice_view(self, removed, inserted, updated):
+		"""
+		While filtered, applies a modification of the displayed rows to the
+		listboxes, given as the ranges of displayed positions the model
+		reports, see `TableModel.subscribe`. Only the inserted and updated
+		rows are formatted. Then redraws selection and active cell.
+		"""
+		view = self.model.view
+		for col in self.columns.values():
+			if col.assignedframe is None:
+				continue
+			lb = self.frames[col.assignedframe][1]
+			for rng in reversed(removed):
+				lb.delete(rng.start, rng.stop - 1)
+			for rng in inserted:
+				lb.insert(rng.start, *col.get_display(rng.start, rng.stop, view))
+			for rng in updated:
+				lb.delete(rng.start, rng.stop - 1)
+				lb.insert(rng.start, *col.get_display(rng.start, rng.stop, view))
 		for fi in self._get_empty_frames():
-			curframelen = self.frames[fi][1].size()
-			if curframelen > self.length:
-				self.frames[fi][1].delete(self.length, tk.END)
-			elif curframelen < self.length:
-				self.frames[fi][1].insert(
-					tk.END, *(BLANK for _ in range(self.length - curframelen))
-				)
+			lb = self.frames[fi][1]
+			for rng in reversed(removed):
+				lb.delete(rng.start, rng.stop - 1)
+			for rng in inserted:
+				lb.insert(rng.start, *(BLANK for _ in rng))
+		if removed or inserted or updated:
+			self._painted_selection = None
+		self._redraw_active_cell()
+		self._redraw_selection()
 
+	@_instrumented
 	def _theme_update(self, _):
 		"""
 		Called from event binding when the current theme changes.
@@ -1709,24 +3174,25 @@ class MultiframeList(ttk.Frame):
 
 		conf = self._get_listbox_conf(self.frames[0][1])
 		for f in self.frames:
-			f[1].configure(**conf)
+			self._configure_listbox(f[1], **conf)
 
 		self._redraw_active_cell()
 
-	def _undraw_active_cell(self):
+	def _undraw_active_cell(self, x, y):
 		"""
-		Removes all itemconfigure options on the active cell/the active
-		cell's row, depending on `self.cnf.active_cell_span_row`.
+		Removes all itemconfigure options on the active cell at `x` and `y`
+		or its row, depending on `self.cnf.active_cell_span_row`.
 		"""
-		if self.active_cell_y is None:
+		if self._batch_depth > 0 or y is None:
+			return
+		row = self._get_display_index(y)
+		if row is None:
 			return
 		if self.cnf.active_cell_span_row:
 			for f in self.frames:
-				f[1].itemconfigure(self.active_cell_y, **self._DEFAULT_ITEMCONFIGURE)
-		else:
-			self.frames[self.active_cell_x][1].itemconfigure(
-				self.active_cell_y, **self._DEFAULT_ITEMCONFIGURE
-			)
+				f[1].itemconfigure(row, **self._DEFAULT_ITEMCONFIGURE)
+		elif x is not None:
+			self.frames[x][1].itemconfigure(row, **self._DEFAULT_ITEMCONFIGURE)
 
 
 if __name__ == "__main__":
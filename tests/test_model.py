@@ -0,0 +1,467 @@
+import random
+import unittest
+
+from multiframe_list.model import (
+	BLANK, SELECTION_TYPE, TableModel, _FormatCache, _IntervalSet, _sort_permutation,
+)
+
+class IntervalSetTest(unittest.TestCase):
+	def test_constructor_merges(self):
+		s = _IntervalSet([5, 3, 3, 9, 4, 10])
+		self.assertEqual(s.ranges(), [range(3, 6), range(9, 11)])
+		self.assertEqual(len(s), 5)
+		self.assertEqual(list(s), [3, 4, 5, 9, 10])
+
+	def test_constructor_shuffled(self):
+		elems = list(range(0, 10000, 2)) + list(range(10000, 20000))
+		random.Random(0).shuffle(elems)
+		s = _IntervalSet(elems)
+		self.assertEqual(len(s), len(elems))
+		self.assertEqual(set(s), set(elems))
+		self.assertEqual(s.ranges()[-1], range(10000, 20000))
+
+	def test_from_sorted(self):
+		s = _IntervalSet.from_sorted([range(0, 3), 2, 3, range(3, 3), range(5, 8), range(6, 7), 8, 10])
+		self.assertEqual(s.ranges(), [range(0, 4), range(5, 9), range(10, 11)])
+		self.assertEqual(len(s), 9)
+
+	def test_extend_sorted(self):
+		s = _IntervalSet([1, 2])
+		s.extend_sorted([2, 3, range(7, 9)])
+		self.assertEqual(s.ranges(), [range(1, 4), range(7, 9)])
+		self.assertEqual(len(s), 5)
+
+	def test_add_remove(self):
+		s = _IntervalSet()
+		s.add_range(0, 10)
+		s.add_range(20, 30)
+		s.add_range(10, 20)
+		self.assertEqual(s.ranges(), [range(0, 30)])
+		s.remove_range(5, 25)
+		self.assertEqual(s.ranges(), [range(0, 5), range(25, 30)])
+		self.assertEqual(len(s), 10)
+		s.discard(0)
+		s.discard(100)
+		s.toggle(27)
+		s.toggle(15)
+		self.assertEqual(s.ranges(), [range(1, 5), range(15, 16), range(25, 27), range(28, 30)])
+		self.assertEqual(len(s), 9)
+
+	def test_contains(self):
+		s = _IntervalSet([1, 2, 3, 7])
+		self.assertIn(2, s)
+		self.assertIn(7, s)
+		self.assertNotIn(4, s)
+		self.assertNotIn(0, s)
+		self.assertNotIn("2", s)
+
+	def test_ranges_window(self):
+		s = _IntervalSet.from_sorted([range(0, 10), range(20, 30)])
+		self.assertEqual(s.ranges(5, 25), [range(5, 10), range(20, 25)])
+		self.assertEqual(s.ranges(10, 20), [])
+
+	def test_set_operations(self):
+		rng = random.Random(1)
+		for _ in range(50):
+			a = {rng.randrange(60) for _ in range(rng.randrange(40))}
+			b = {rng.randrange(60) for _ in range(rng.randrange(40))}
+			c = {rng.randrange(60) for _ in range(rng.randrange(40))}
+			s = _IntervalSet(a)
+			self.assertEqual(s.union(b, c), a.union(b, c))
+			self.assertEqual(s.intersection(b, c), a.intersection(b, c))
+			self.assertEqual(s.difference(b, c), a.difference(b, c))
+			self.assertEqual(s.symmetric_difference(b), a.symmetric_difference(b))
+			self.assertEqual(s.issubset(b), a.issubset(b))
+			self.assertEqual(s.issuperset(b), a.issuperset(b))
+			self.assertEqual(s.issubset(a | b), True)
+			self.assertEqual(s.issuperset(_IntervalSet(a & b)), True)
+			self.assertIsInstance(s.union(b), _IntervalSet)
+
+	def test_set_operations_non_ints(self):
+		s = _IntervalSet([1, 2])
+		self.assertEqual(s.intersection({1, "a"}), {1})
+		self.assertEqual(s.difference(["a", 2]), {1})
+		self.assertTrue(s.issubset({1, 2, "a"}))
+		self.assertFalse(s.issuperset({1, "a"}))
+		with self.assertRaises(TypeError):
+			s.union({"a"})
+
+	def test_set_interface(self):
+		s = _IntervalSet([1, 2, 3])
+		self.assertEqual(s, {1, 2, 3})
+		self.assertEqual(s.copy(), s)
+		self.assertIsNot(s.copy()._starts, s._starts)
+		s.clear()
+		self.assertEqual(len(s), 0)
+		self.assertFalse(s)
+
+
+class FormatCacheTest(unittest.TestCase):
+	def setUp(self):
+		# The cache tells formatters apart by identity, so they are created
+		# once instead of accessing new bound methods each time
+		self.calls = calls = []
+		def formatter(x):
+			calls.append(x)
+			return f"<{x}>"
+		def batch_formatter(elems):
+			calls.append(list(elems))
+			return [f"<{x}>" for x in elems]
+		self.formatter = formatter
+		self.batch_formatter = batch_formatter
+
+	def test_hits_and_misses(self):
+		cache = _FormatCache(10)
+		self.assertEqual(cache.format(self.formatter, [1, 2, 1]), ["<1>", "<2>", "<1>"])
+		self.assertEqual(self.calls, [1, 2])
+		self.assertEqual(cache.stats(), {"hits": 1, "misses": 2, "size": 2, "maxsize": 10})
+
+	def test_type_is_part_of_key(self):
+		cache = _FormatCache(10)
+		self.assertEqual(cache.format(self.formatter, [1, 1.0, True]), ["<1>", "<1.0>", "<True>"])
+
+	def test_unhashable(self):
+		cache = _FormatCache(10)
+		elem = [1]
+		cache.format(self.formatter, [elem, elem])
+		self.assertEqual(len(self.calls), 1)
+		cache.format(self.formatter, [[1]])
+		self.assertEqual(len(self.calls), 2)
+
+	def test_lru_eviction(self):
+		cache = _FormatCache(2)
+		cache.format(self.formatter, [1, 2, 1, 3])
+		self.assertEqual(cache.stats()["size"], 2)
+		self.calls.clear()
+		cache.format(self.formatter, [1, 2])
+		self.assertEqual(self.calls, [2])
+
+	def test_cleared_on_new_formatter(self):
+		cache = _FormatCache(10)
+		cache.format(self.formatter, [1])
+		self.assertEqual(cache.format(str, [1]), ["1"])
+
+	def test_batch(self):
+		cache = _FormatCache(10)
+		self.assertEqual(
+			cache.format(self.batch_formatter, [1, 2, 1], True), ["<1>", "<2>", "<1>"]
+		)
+		self.assertEqual(cache.format(self.batch_formatter, [3, 2], True), ["<3>", "<2>"])
+		self.assertEqual(self.calls, [[1, 2, 1], [3]])
+
+	def test_batch_wrong_length(self):
+		cache = _FormatCache(10)
+		with self.assertRaises(ValueError):
+			cache.format(lambda elems: ["x"], [1, 2], True)
+
+
+class AggregatesTest(unittest.TestCase):
+	def setUp(self):
+		self.table = TableModel()
+		self.col = self.table.add_column("a", aggregates = ("sum", "count", "min", "max"))
+		self.table.add_column("b")
+		self.table.set_data({"a": [3, BLANK, 1, None, 5], "b": list(range(5))})
+
+	def assert_aggregates(self, data):
+		data = [x for x in data if x is not None and x != BLANK]
+		self.assertEqual(self.col.get_aggregates(), {
+			"sum": sum(data), "count": len(data),
+			"min": min(data, default = None), "max": max(data, default = None),
+		})
+
+	def test_set_data(self):
+		self.assert_aggregates([3, 1, 5])
+
+	def test_modifications(self):
+		self.table.insert_rows([{"a": 10}, {"a": -2}], 1)
+		self.assert_aggregates(self.col.data)
+		self.table.remove_rows(0)
+		self.assert_aggregates(self.col.data)
+		self.col.data_update({0: 7, 1: BLANK})
+		self.assert_aggregates(self.col.data)
+		self.table.insert_rows({"a": list(range(100)), "b": list(range(100))})
+		self.assert_aggregates(self.col.data)
+		self.table.remove_rows(range(0, self.table.length, 2))
+		self.assert_aggregates(self.col.data)
+		self.table.remove_rows(0, self.table.length)
+		self.assert_aggregates([])
+
+	def test_notifies(self):
+		changed = []
+		self.table.subscribe(lambda change, *args: changed.append((change, *args)))
+		self.table.insert_rows([{"a": 4}])
+		self.assertIn(("aggregates", self.col), changed)
+
+	def test_unaggregatable_element_changes_nothing(self):
+		before = self.col.get_aggregates()
+		for modify in (
+			lambda: self.table.insert_rows([{"a": "n/a", "b": 9}]),
+			lambda: self.table.insert_rows({"a": [1] * 99 + ["x"], "b": [0] * 100}),
+			lambda: self.col.data_update({0: "n/a"}),
+			lambda: self.col.data_set([1, "x", 3, 4, 5]),
+		):
+			with self.assertRaises(TypeError):
+				modify()
+			self.assertEqual(self.col.data, [3, BLANK, 1, None, 5])
+			self.assertEqual(self.table.columns["b"].data, list(range(5)))
+			self.assertEqual(self.table.length, 5)
+			self.assertEqual(self.col.get_aggregates(), before)
+
+
+class SortPermutationTest(unittest.TestCase):
+	def setUp(self):
+		self.table = TableModel()
+		self.col = self.table.add_column("a")
+		self.table.set_data({"a": [3, 1, 2]})
+
+	def test_permutation(self):
+		self.assertEqual(self.col.get_sort_permutation(False), [1, 2, 0])
+		self.assertEqual(self.col.get_sort_permutation(True), [0, 2, 1])
+
+	def test_sorted_state(self):
+		self.table.sort("a")
+		self.assertEqual(self.col.data, [1, 2, 3])
+		self.assertIs(self.col.sorted_reverse, False)
+		self.assertIsNone(self.col.get_sort_permutation(False))
+		self.assertEqual(self.col.get_sort_permutation(True), range(2, -1, -1))
+		self.col.data_update({0: 4})
+		self.assertIsNone(self.col.sorted_reverse)
+		self.assertEqual(self.col.get_sort_permutation(False), [1, 2, 0])
+
+	def test_sortkey(self):
+		self.col.config(sortkey = lambda x: -x)
+		self.assertEqual(self.col.get_sort_permutation(False), [0, 2, 1])
+		keys, sortkey = self.col.get_sort_args()
+		self.assertEqual(_sort_permutation(keys, sortkey, False), [0, 2, 1])
+
+	def test_fallback_type(self):
+		self.col.data_set([3, "1", 2])
+		with self.assertRaises(TypeError):
+			self.col.get_sort_permutation(False)
+		self.col.config(fallback_type = str)
+		self.assertEqual(self.col.get_sort_permutation(False), [1, 2, 0])
+		self.assertEqual(self.col.data, ["3", "1", "2"])
+
+
+class KeyIndexTest(unittest.TestCase):
+	def setUp(self):
+		self.table = TableModel("key")
+		self.col = self.table.add_column("key")
+		self.table.add_column("val")
+		self.table.set_data({"key": list("abcdef"), "val": list(range(6))})
+		self.index = self.col.get_key_index()
+
+	def assert_index(self):
+		self.assertIs(self.col.get_key_index(), self.index)
+		self.assertEqual(self.index, {x: i for i, x in enumerate(self.col.data)})
+
+	def test_kept_up_to_date(self):
+		self.table.insert_rows([{"key": "x"}, {"key": "y"}], 2)
+		self.assert_index()
+		self.table.insert_rows([{"key": "z"}])
+		self.assert_index()
+		self.table.remove_rows(1, 3)
+		self.assert_index()
+		self.table.remove_rows([0, 4, 5])
+		self.index = self.col.get_key_index()
+		self.assert_index()
+		self.col.data_update({0: self.col.data[1], 1: self.col.data[0]})
+		self.assert_index()
+		self.table.sort("key", True)
+		self.index = self.col.get_key_index()
+		self.assert_index()
+
+	def test_duplicates_rejected(self):
+		for modify in (
+			lambda: self.table.insert_rows([{"key": "a"}]),
+			lambda: self.table.insert_rows([{"key": "x"}, {"key": "x"}], 0),
+			lambda: self.col.data_update({1: "a"}),
+			lambda: self.table.update_data({"key": list("aab"), "val": [0, 1, 2]}),
+		):
+			with self.assertRaises(ValueError):
+				modify()
+			self.assertEqual(self.col.data, list("abcdef"))
+			self.assertEqual(self.table.columns["val"].data, list(range(6)))
+			self.assert_index()
+
+	def test_duplicates_in_data(self):
+		self.table.set_data({"key": list("aba"), "val": [0, 1, 2]})
+		with self.assertRaises(ValueError):
+			self.col.get_key_index()
+
+
+class UpdateDataTest(unittest.TestCase):
+	def test_keyed(self):
+		table = TableModel("key")
+		table.add_column("key")
+		table.add_column("val")
+		table.set_data({"key": ["a", "b", "c", "d"], "val": [1, 2, 3, 4]})
+		changes = []
+		table.subscribe(lambda change, *args: changes.append(change))
+		new_index = table.update_data({"key": ["b", "c", "e", "d"], "val": [2, 30, 5, 4]})
+		self.assertEqual(table.length, 4)
+		self.assertEqual(table.columns["val"].data, [2, 30, 5, 4])
+		self.assertEqual([new_index(i) for i in range(4)], [None, 0, 1, 3])
+		# Applied from the back: "e" is inserted, then "a" removed
+		self.assertEqual(changes, ["insert", "remove", "shown"])
+
+
+class RowStateTest(unittest.TestCase):
+	def setUp(self):
+		self.table = TableModel("id")
+		self.table.add_column("id")
+		self.table.add_column("val")
+		self.table.set_data({"id": list(range(10)), "val": list(range(10))})
+		self.changes = []
+		self.table.subscribe(lambda change, *args: self.changes.append(change))
+
+	def shown_ids(self, positions):
+		return {self.table.get_cell("id", self.table.to_source(i)) for i in positions}
+
+	def test_anchor(self):
+		table = self.table
+		table.selection_set(3)
+		table.selection_set_from_anchor(6)
+		self.assertEqual(table.selection.ranges(), [range(3, 7)])
+		table.selection_set_from_anchor(1)
+		self.assertEqual(table.selection.ranges(), [range(1, 4)])
+		table.selection_set_item(8, toggle = True)
+		table.selection_set_item(2, toggle = True)
+		self.assertEqual(list(table.selection), [1, 3, 8])
+		self.assertEqual(table.selection_anchor, 3)
+		table.selection_type = SELECTION_TYPE.SINGLE
+		table.selection_set_from_anchor(5)
+		self.assertEqual(list(table.selection), [5])
+		self.assertEqual(table.selection_anchor, 5)
+
+	def test_selection_notifications(self):
+		self.table.selection_set(range(2, 4))
+		self.table.selection_set(range(2, 4))
+		self.table.selection_clear()
+		self.table.selection_clear()
+		self.assertEqual(self.changes, ["selection", "selection"])
+
+	def test_follows_rows(self):
+		table = self.table
+		table.selection_set([2, 3, 7])
+		table.set_active_cell(0, 7)
+		table.insert_rows([{"id": 10}, {"id": 11}], 3, clear_selection = False)
+		self.assertEqual(list(table.selection), [2, 5, 9])
+		self.assertEqual(table.selection_anchor, 2)
+		self.assertEqual(table.active_cell_y, 9)
+		table.remove_rows([0, 2], clear_selection = False)
+		self.assertEqual(list(table.selection), [3, 7])
+		self.assertIsNone(table.selection_anchor)
+		self.assertEqual(table.active_cell_y, 7)
+		table.remove_rows(7, 10, clear_selection = False)
+		self.assertEqual(table.active_cell_y, 6)
+		self.assertEqual(list(table.selection), [3])
+		table.insert_rows([{"id": 12}])
+		self.assertEqual(list(table.selection), [])
+		table.remove_rows(0)
+		self.assertEqual(table.active_cell_y, 5)
+
+	def test_permute(self):
+		table = self.table
+		table.set_filter({"val": lambda x: x % 2 == 0})
+		table.selection_set(range(1, 3))
+		table.set_active_cell(0, 4)
+		table.sort("val", True)
+		self.assertEqual(table.view, [1, 3, 5, 7, 9])
+		self.assertEqual(self.shown_ids(table.selection), {2, 4})
+		self.assertEqual(self.shown_ids([table.active_cell_y]), {8})
+		table.columns["val"].data_update({0: 1})
+		table.sort("val", False)
+		self.assertEqual(self.shown_ids(table.selection), {2, 4})
+		self.assertEqual(self.shown_ids([table.active_cell_y]), {8})
+
+	def test_filter(self):
+		table = self.table
+		table.selection_set(4)
+		table.set_active_cell(None, 8)
+		table.set_filter({"val": lambda x: x < 5})
+		self.assertEqual(table.view, [0, 1, 2, 3, 4])
+		self.assertEqual(list(table.selection), [])
+		self.assertEqual(table.active_cell_y, 4)
+		with self.assertRaises(ValueError):
+			table.remove_column("val")
+		table.update_cells({"val": {7: 0, 3: 9}})
+		self.assertEqual(table.view, [0, 1, 2, 4, 7])
+		table.set_filter(None)
+		self.assertIsNone(table.view)
+		self.assertEqual(table.shown_length, 10)
+
+	def test_shown_changes(self):
+		table = self.table
+		table.set_filter({"val": lambda x: x % 3 != 0})
+		shown = []
+		table.subscribe(lambda change, *args: change == "shown" and shown.append(args[0]))
+		table.insert_rows([{"id": 10, "val": 1}, {"id": 11, "val": 3}], 3)
+		table.update_cells({"val": {0: 1, 1: 3, 2: 5}})
+		table.remove_rows(2, 4)
+		table.sort("id")
+		self.assertEqual(shown, [
+			([], [range(2, 3)], []),
+			([range(0, 1)], [range(0, 1)], [range(1, 2)]),
+			([range(1, 3)], [], []),
+			None,
+		])
+		self.assertEqual(self.shown_ids(range(table.shown_length)), {0, 4, 5, 7, 8})
+
+	def test_random(self):
+		rng = random.Random(1)
+		table = self.table
+		table.set_filter({"val": lambda x: x % 3 != 0})
+		def row(pos):
+			idx = table.to_source(pos)
+			return (table.get_cell("id", idx), table.get_cell("val", idx))
+		# The displayed rows as rebuilt from the reported changes
+		mirror = [row(pos) for pos in range(table.shown_length)]
+		def splice(change, *args):
+			if change != "shown":
+				return
+			removed, inserted, updated = args[0]
+			for r in reversed(removed):
+				del mirror[r.start:r.stop]
+			for r in inserted:
+				mirror[r.start:r.start] = map(row, r)
+			for r in updated:
+				mirror[r.start:r.stop] = map(row, r)
+		table.subscribe(splice)
+		next_id = 10
+		for _ in range(300):
+			if table.shown_length:
+				table.selection_set(
+					rng.sample(range(table.shown_length), rng.randint(0, table.shown_length))
+				)
+				table.set_active_cell(None, rng.randrange(table.shown_length))
+			selected = self.shown_ids(table.selection)
+			active = table.active_cell_y
+			active = None if active is None else self.shown_ids([active]).pop()
+			op = rng.randrange(3)
+			if op == 0:
+				rows = [{"id": next_id + i, "val": rng.randrange(9)} for i in range(rng.randint(1, 4))]
+				next_id += len(rows)
+				table.insert_rows(rows, rng.randint(0, table.length), clear_selection = False)
+				gone = set()
+			elif op == 1 and table.length:
+				what = rng.sample(range(table.length), rng.randint(1, min(4, table.length)))
+				gone = {table.get_cell("id", i) for i in what}
+				table.remove_rows(what, clear_selection = False)
+			else:
+				what = rng.sample(range(table.length), min(3, table.length))
+				table.update_cells(
+					{"val": {i: rng.randrange(9) for i in what}}, clear_selection = False
+				)
+				gone = set()
+			vals = table.columns["val"].data
+			self.assertEqual(table.view, [i for i in range(table.length) if vals[i] % 3 != 0])
+			self.assertEqual(mirror, [row(pos) for pos in range(table.shown_length)])
+			shown = self.shown_ids(range(table.shown_length))
+			self.assertEqual(self.shown_ids(table.selection), (selected & shown) - gone)
+			if active in shown:
+				self.assertEqual(self.shown_ids([table.active_cell_y]), {active})
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,73 @@
+import tkinter as tk
+import unittest
+
+from multiframe_list.multiframe_list import MultiframeList
+
+def setUpModule():
+	global root
+	try:
+		root = tk.Tk()
+	except tk.TclError as e:
+		raise unittest.SkipTest(f"No display available: {e}")
+	root.geometry("400x300")
+
+def tearDownModule():
+	root.destroy()
+
+
+class ScrollbarTest(unittest.TestCase):
+	def setUp(self):
+		self.mfl = MultiframeList(
+			root, inicolumns = [{"col_id": "a", "sort": True}, {"col_id": "b"}]
+		)
+		self.mfl.pack(expand = 1, fill = tk.BOTH)
+		self.mfl.set_data({"a": list(range(200)), "b": list(range(200))})
+		root.update()
+
+	def tearDown(self):
+		self.mfl.destroy()
+
+	def assert_scrollbar_matches(self):
+		root.update()
+		first, last = self.mfl.frames[0][1].yview()
+		sb_first, sb_last = self.mfl.scrollbar.get()
+		self.assertAlmostEqual(sb_first, first)
+		self.assertAlmostEqual(sb_last, last)
+		self.assertLess(sb_last, 1.0)
+
+	def test_thumb_after_sort(self):
+		self.mfl._scrollallbar("moveto", 0.5)
+		self.assert_scrollbar_matches()
+		self.mfl.sort(None, self.mfl.columns["a"])
+		self.assert_scrollbar_matches()
+		self.mfl.sort(None, self.mfl.columns["a"])
+		self.assert_scrollbar_matches()
+
+	def test_thumb_after_batch(self):
+		self.mfl._scrollallbar("moveto", 0.5)
+		with self.mfl.batch():
+			self.mfl.set_cell("b", 0, -1)
+		self.assert_scrollbar_matches()
+
+
+
+class ListboxMetricsTest(unittest.TestCase):
+	def setUp(self):
+		self.mfl = MultiframeList(root, inicolumns = [{"col_id": "a"}])
+		self.mfl.pack(expand = 1, fill = tk.BOTH)
+		root.update()
+
+	def tearDown(self):
+		self.mfl.destroy()
+
+	def test_reconfigure_invalidates(self):
+		lb = self.mfl.frames[0][1]
+		height = self.mfl._get_listbox_entry_height(lb)
+		self.mfl._configure_listbox(lb, selectborderwidth = 5)
+		self.assertEqual(self.mfl._get_listbox_entry_height(lb), height + 10)
+		self.mfl._configure_listbox(lb, width = 30)
+		self.assertIn(lb._w, self.mfl._listbox_metrics)
+
+
+if __name__ == "__main__":
+	unittest.main()